@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import sys
+from os import chdir, makedirs, symlink, path as ospath
+from logging import getLogger, WARNING
+from argparse import ArgumentParser
+from tempfile import mkdtemp
+
+ROOT = ospath.dirname(ospath.dirname(ospath.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fakes import patched, settings
+from benchmarks.harness import report, save, compare
+
+
+def parse_args():
+    parser = ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline benchmarks against fake aria2, qBittorrent, Mongo and "
+        "Telegram backends",
+    )
+    parser.add_argument("--tasks", type=int, default=30, help="synthetic tasks")
+    parser.add_argument("--size", type=int, default=64 * 1024**2, help="bytes per task")
+    parser.add_argument("--files", type=int, default=2000, help="files in make_tree")
+    parser.add_argument("--chats", type=int, default=5, help="status message chats")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per hot path")
+    parser.add_argument(
+        "--filter", default="", help="only hot_paths or pipeline benchmarks"
+    )
+    parser.add_argument(
+        "--mix",
+        default="leech,zip,unzip,split",
+        help="comma separated pipeline mix of leech, zip, unzip and split",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added to each fake API call"
+    )
+    parser.add_argument("--timeout", type=float, default=600, help="pipeline timeout")
+    parser.add_argument(
+        "--tg-limits",
+        action="store_true",
+        help="pace fake Telegram calls at the real per-chat and global limits",
+    )
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare p50 against a saved --json run")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="allowed p50 regression"
+    )
+    parser.add_argument("--verbose", action="store_true", help="keep bot logging")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    settings.api_latency = args.latency
+    workdir = mkdtemp(prefix="wzml-bench-")
+    makedirs(f"{workdir}/downloads", exist_ok=True)
+    # The bot resolves themes and config relative to its cwd, a scratch dir keeps
+    # a real config.env out of the run
+    symlink(f"{ROOT}/bot", f"{workdir}/bot")
+    chdir(workdir)
+
+    with patched(workdir):
+        import bot
+    if not args.verbose:
+        getLogger().setLevel(WARNING)
+
+    from bot.helper.ext_utils.loop_monitor import loop_monitor
+    from benchmarks import hot_paths, pipeline
+
+    async def run():
+        loop_monitor.start()
+        results = []
+        if args.filter in ["", "hot_paths"]:
+            results += await hot_paths.run(args)
+        if args.filter in ["", "pipeline"]:
+            results += await pipeline.run(args)
+        return results
+
+    results = bot.bot_loop.run_until_complete(run())
+    report(results)
+    if args.json:
+        save(results, args.json)
+    if args.baseline:
+        if regressions := compare(results, args.baseline, args.tolerance):
+            print(f"Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+main()
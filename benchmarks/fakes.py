@@ -0,0 +1,814 @@
+#!/usr/bin/env python3
+import subprocess
+from json import dumps, loads
+from time import time, sleep
+from os import environ, makedirs, path as ospath
+from threading import Thread, Lock
+from itertools import count
+from datetime import datetime
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qs, unquote
+from asyncio import (
+    Queue,
+    get_event_loop,
+    get_running_loop,
+    new_event_loop,
+    set_event_loop,
+    sleep as asleep,
+)
+from types import SimpleNamespace
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import aria2p
+import aiohttp
+import pymongo
+import pyrogram
+import qbittorrentapi
+import telegraph.aio
+import motor.motor_asyncio
+from pyrogram.enums import ChatType
+
+BOT_ID = 100000
+OWNER_ID = 1
+TICK = 0.1
+
+
+class Settings:
+    # Shared knobs of the fake backends, the benchmark tweaks them between runs
+    dl_speed = 200 * 1024**2
+    up_speed = 200 * 1024**2
+    api_latency = 0.0
+
+
+settings = Settings()
+
+
+class AttrDict(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+
+# ---------------------------------------------------------------- aria2 JSON-RPC
+
+
+def write_file(path, size):
+    # Archives get a real member so the extract stage has work to do
+    if path.endswith(".zip"):
+        with ZipFile(path, "w", ZIP_DEFLATED, compresslevel=1) as archive:
+            with archive.open(ospath.basename(path)[:-4], "w") as f:
+                chunk = bytes(1024**2)
+                for offset in range(0, size, len(chunk)):
+                    f.write(chunk[: size - offset])
+        return
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+class FakeAria2(aria2p.Client):
+    # Answers the JSON-RPC payloads aria2p builds in-process and "downloads" URLs
+    # carrying a size= query at settings.dl_speed, notifications are pushed to
+    # every open FakeAria2Socket from the ticker thread
+    current = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.downloads = {}
+        self.global_options = {
+            "dir": environ.get("DOWNLOAD_DIR", "/tmp"),
+            "max-concurrent-downloads": "1000",
+            "follow-torrent": "true",
+            "seed-time": "0",
+        }
+        self.calls = {}
+        self.sockets = []
+        self.__gids = count(1)
+        self.__lock = Lock()
+        self.__events = []
+        FakeAria2.current = self
+        Thread(target=self.__ticker, daemon=True).start()
+
+    def post(self, payload):
+        request = loads(payload)
+        if isinstance(request, list):
+            return [self.__respond(r) for r in request]
+        return self.__respond(request)
+
+    def __respond(self, request):
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            response["result"] = self.__dispatch(
+                request["method"], request.get("params", [])
+            )
+        except KeyError as e:
+            response["error"] = {"code": 1, "message": f"GID {e} is not found"}
+        return response
+
+    def __dispatch(self, method, params):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        params = [p for p in params if not str(p).startswith("token:")]
+        if method == self.MULTICALL:
+            results = []
+            for call in params[0]:
+                try:
+                    result = self.__dispatch(call["methodName"], call["params"])
+                    results.append([result])
+                except KeyError as e:
+                    results.append({"faultCode": 1, "faultString": f"{e}"})
+            return results
+        name = method.split(".", 1)[1]
+        with self.__lock:
+            if name == "addUri":
+                return self.__add(*params)
+            if name == "tellStatus":
+                return self.__status(self.downloads[params[0]], *params[1:])
+            if name == "tellActive":
+                return self.__tell(["active"], 0, 1000, *params)
+            if name == "tellWaiting":
+                return self.__tell(["waiting", "paused"], *params)
+            if name == "tellStopped":
+                return self.__tell(["complete", "removed", "error"], *params)
+            if name == "getFiles":
+                return self.downloads[params[0]]["files"]
+            if name == "getOption":
+                return self.downloads[params[0]]["_options"]
+            if name == "changeOption":
+                self.downloads[params[0]]["_options"].update(params[1])
+                return "OK"
+            if name == "getGlobalOption":
+                return dict(self.global_options)
+            if name == "changeGlobalOption":
+                self.global_options.update(params[0])
+                return "OK"
+            if name == "getVersion":
+                return {"version": "1.37.0", "enabledFeatures": []}
+            if name in ["remove", "forceRemove"]:
+                self.downloads[params[0]]["status"] = "removed"
+                self.__events.append(("aria2.onDownloadStop", params[0]))
+                return params[0]
+            if name in ["pause", "forcePause"]:
+                self.downloads[params[0]]["status"] = "paused"
+                return params[0]
+            if name == "unpause":
+                self.downloads[params[0]]["status"] = "active"
+                return params[0]
+            if name == "removeDownloadResult":
+                del self.downloads[params[0]]
+                return "OK"
+            if name == "purgeDownloadResult":
+                for gid, dl in list(self.downloads.items()):
+                    if dl["status"] in ["complete", "removed", "error"]:
+                        del self.downloads[gid]
+                return "OK"
+            if name in ["pauseAll", "forcePauseAll", "unpauseAll", "saveSession"]:
+                return "OK"
+            if name == "getGlobalStat":
+                return {
+                    "downloadSpeed": "0",
+                    "uploadSpeed": "0",
+                    "numActive": "0",
+                    "numWaiting": "0",
+                    "numStopped": "0",
+                    "numStoppedTotal": "0",
+                }
+        raise NotImplementedError(method)
+
+    def __add(self, uris, options=None, position=None):
+        options = options or {}
+        url = urlparse(uris[0])
+        size = int(parse_qs(url.query).get("size", ["0"])[0])
+        name = options.get("out") or unquote(ospath.basename(url.path)) or "index.html"
+        gid = f"{next(self.__gids):016x}"
+        dire = options.get("dir", self.global_options["dir"])
+        self.downloads[gid] = {
+            "gid": gid,
+            "status": "paused" if options.get("pause") == "true" else "active",
+            "totalLength": str(size),
+            "completedLength": "0",
+            "uploadLength": "0",
+            "downloadSpeed": "0",
+            "uploadSpeed": "0",
+            "connections": "1",
+            "numPieces": "1",
+            "pieceLength": "1048576",
+            "errorCode": "0",
+            "dir": dire,
+            "files": [
+                {
+                    "index": "1",
+                    "path": f"{dire}/{name}",
+                    "length": str(size),
+                    "completedLength": "0",
+                    "selected": "true",
+                    "uris": [{"uri": uris[0], "status": "used"}],
+                }
+            ],
+            "_options": {**options, "follow-torrent": "true"},
+            "_size": size,
+        }
+        self.__events.append(("aria2.onDownloadStart", gid))
+        return gid
+
+    @staticmethod
+    def __status(dl, keys=None):
+        struct = {k: v for k, v in dl.items() if not k.startswith("_")}
+        if keys:
+            struct = {k: v for k, v in struct.items() if k in keys}
+        return struct
+
+    def __tell(self, states, offset=0, num=1000, keys=None):
+        downloads = [
+            self.__status(dl, keys)
+            for dl in self.downloads.values()
+            if dl["status"] in states
+        ]
+        return downloads[offset : offset + num]
+
+    def __ticker(self):
+        while True:
+            sleep(TICK)
+            with self.__lock:
+                events, self.__events = self.__events, []
+                for gid, dl in self.downloads.items():
+                    if dl["status"] != "active" or not dl["_size"]:
+                        continue
+                    done = int(dl["completedLength"]) + settings.dl_speed * TICK
+                    done = min(dl["_size"], done)
+                    dl["completedLength"] = dl["files"][0]["completedLength"] = str(
+                        int(done)
+                    )
+                    dl["downloadSpeed"] = str(settings.dl_speed)
+                    if done == dl["_size"]:
+                        path = dl["files"][0]["path"]
+                        makedirs(ospath.dirname(path), exist_ok=True)
+                        write_file(path, dl["_size"])
+                        dl["status"] = "complete"
+                        dl["downloadSpeed"] = "0"
+                        events.append(("aria2.onDownloadComplete", gid))
+            for event, gid in events:
+                for socket in list(self.sockets):
+                    socket.push(
+                        {"jsonrpc": "2.0", "method": event, "params": [{"gid": gid}]}
+                    )
+
+
+class FakeAria2Socket:
+    # aria2's WebSocket endpoint, calls are answered by the current FakeAria2
+    # and its notifications arrive in between like they do from aria2
+    def __init__(self, url, **kwargs):
+        self.__queue = Queue()
+        self.__loop = None
+
+    async def __aenter__(self):
+        self.__loop = get_running_loop()
+        FakeAria2.current.sockets.append(self)
+        return self
+
+    async def __aexit__(self, *args):
+        FakeAria2.current.sockets.remove(self)
+
+    def push(self, data):
+        message = SimpleNamespace(type=aiohttp.WSMsgType.TEXT, json=lambda: data)
+        self.__loop.call_soon_threadsafe(self.__queue.put_nowait, message)
+
+    async def send_json(self, data):
+        if settings.api_latency:
+            await asleep(settings.api_latency)
+        self.push(FakeAria2.current.post(dumps(data)))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.__queue.get()
+
+
+# ---------------------------------------------------------------- qBittorrent
+
+
+class FakeQbit:
+    torrents = {}
+    preferences = AttrDict(listen_port=6881, dht=True, max_active_downloads=-1)
+
+    def __init__(self, *args, **kwargs):
+        self.app = AttrDict(version="v4.6.3")
+
+    def app_preferences(self):
+        return AttrDict(self.preferences)
+
+    def app_set_preferences(self, prefs=None, **kwargs):
+        self.preferences.update(prefs or {})
+
+    def auth_log_out(self):
+        pass
+
+    @classmethod
+    def add_torrent(cls, tag, name, files, state="downloading", progress=0.5):
+        size = sum(f.size for f in files)
+        cls.torrents[tag] = AttrDict(
+            hash=f"{abs(hash(tag)):040x}"[:40],
+            tags=tag,
+            name=name,
+            state=state,
+            size=size,
+            progress=progress,
+            downloaded=int(size * progress),
+            uploaded=0,
+            dlspeed=settings.dl_speed,
+            upspeed=0,
+            eta=600,
+            num_seeds=10,
+            num_leechs=3,
+            ratio=0.0,
+            seeding_time=0,
+            save_path=environ.get("DOWNLOAD_DIR", "/tmp"),
+            content_path="",
+            _files=files,
+        )
+        return cls.torrents[tag]
+
+    def torrents_info(self, tag=None, torrent_hashes=None, **kwargs):
+        torrents = list(self.torrents.values())
+        if tag is not None:
+            torrents = [t for t in torrents if t.tags == tag]
+        return torrents
+
+    def torrents_files(self, torrent_hash=None, **kwargs):
+        for tor in self.torrents.values():
+            if tor.hash == torrent_hash:
+                return tor._files
+        return []
+
+    def torrents_delete(self, torrent_hashes=None, delete_files=False, **kwargs):
+        for tag, tor in list(self.torrents.items()):
+            if torrent_hashes == "all" or tor.hash == torrent_hashes:
+                del self.torrents[tag]
+
+    def torrents_add(self, *args, **kwargs):
+        return "Ok."
+
+    def torrents_pause(self, *args, **kwargs):
+        pass
+
+    def torrents_resume(self, *args, **kwargs):
+        pass
+
+    def torrents_delete_tags(self, *args, **kwargs):
+        pass
+
+    def torrents_file_priority(self, *args, **kwargs):
+        pass
+
+
+# ---------------------------------------------------------------- Mongo
+
+
+class FakeCollection:
+    store = {}
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return type(self)(f"{self.name}.{name}")
+
+    def __getitem__(self, name):
+        return type(self)(f"{self.name}.{name}")
+
+    @property
+    def docs(self):
+        return self.store.setdefault(self.name, {})
+
+    @staticmethod
+    def __match(doc, query):
+        return all(doc.get(k) == v for k, v in (query or {}).items())
+
+    def _find(self, query=None):
+        return [dict(d) for d in self.docs.values() if self.__match(d, query)]
+
+    def _find_one(self, query=None):
+        return next(iter(self._find(query)), None)
+
+    def _update_one(self, query, update, upsert=False):
+        doc = next((d for d in self.docs.values() if self.__match(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return
+            doc = dict(query)
+            self.docs[doc.get("_id", len(self.docs))] = doc
+        for key, value in update.get("$set", {}).items():
+            doc[key] = value
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+        for key, value in update.get("$push", {}).items():
+            doc.setdefault(key, []).append(value)
+        for key, value in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + value
+
+    def _replace_one(self, query, doc, upsert=False):
+        self._delete_one(query)
+        self.docs[doc.get("_id", query.get("_id"))] = {**query, **doc}
+
+    def _insert_one(self, doc):
+        self.docs[doc.get("_id", len(self.docs))] = dict(doc)
+
+    def _delete_one(self, query):
+        for key, doc in list(self.docs.items()):
+            if self.__match(doc, query):
+                del self.docs[key]
+                return
+
+    def _delete_many(self, query=None):
+        for key, doc in list(self.docs.items()):
+            if self.__match(doc, query):
+                del self.docs[key]
+
+    def _drop(self):
+        for name in list(self.store):
+            if name == self.name or name.startswith(f"{self.name}."):
+                del self.store[name]
+
+
+class SyncCollection(FakeCollection):
+    def find(self, query=None, *args, **kwargs):
+        return iter(self._find(query))
+
+    def find_one(self, query=None, *args, **kwargs):
+        return self._find_one(query)
+
+    def update_one(self, query, update, upsert=False):
+        self._update_one(query, update, upsert)
+
+    def replace_one(self, query, doc, upsert=False):
+        self._replace_one(query, doc, upsert)
+
+    def insert_one(self, doc):
+        self._insert_one(doc)
+
+    def delete_one(self, query):
+        self._delete_one(query)
+
+    def delete_many(self, query=None):
+        self._delete_many(query)
+
+    def drop(self):
+        self._drop()
+
+
+class AsyncCursor:
+    def __init__(self, docs):
+        self.__docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.__docs)
+        except StopIteration as e:
+            raise StopAsyncIteration from e
+
+    async def to_list(self, length=None):
+        return list(self.__docs)
+
+
+class AsyncCollection(FakeCollection):
+    def find(self, query=None, *args, **kwargs):
+        return AsyncCursor(self._find(query))
+
+    async def find_one(self, query=None, *args, **kwargs):
+        await asleep(settings.api_latency)
+        return self._find_one(query)
+
+    async def update_one(self, query, update, upsert=False):
+        await asleep(settings.api_latency)
+        self._update_one(query, update, upsert)
+
+    async def replace_one(self, query, doc, upsert=False):
+        await asleep(settings.api_latency)
+        self._replace_one(query, doc, upsert)
+
+    async def insert_one(self, doc):
+        await asleep(settings.api_latency)
+        self._insert_one(doc)
+
+    async def delete_one(self, query):
+        await asleep(settings.api_latency)
+        self._delete_one(query)
+
+    async def delete_many(self, query=None):
+        await asleep(settings.api_latency)
+        self._delete_many(query)
+
+    async def drop(self):
+        self._drop()
+
+
+class FakeMongo:
+    collection = SyncCollection
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.collection(name)
+
+    def __getitem__(self, name):
+        return self.collection(name)
+
+    def close(self):
+        pass
+
+
+class FakeMotor(FakeMongo):
+    collection = AsyncCollection
+
+
+# ---------------------------------------------------------------- Telegram
+
+
+class Mention(str):
+    def __call__(self, name=None, style=None):
+        return self
+
+
+class FakeUser:
+    def __init__(self, id_, first_name="Bench", username=None, is_bot=False):
+        self.id = id_
+        self.first_name = first_name
+        self.last_name = None
+        self.username = username
+        self.is_bot = is_bot
+        self.is_premium = False
+        self.language_code = "en"
+
+    @property
+    def mention(self):
+        return Mention(f"<a href='tg://user?id={self.id}'>{self.first_name}</a>")
+
+
+class FakeChat:
+    def __init__(self, id_, type_=ChatType.SUPERGROUP, title="Bench"):
+        self.id = id_
+        self.type = type_
+        self.title = title
+        self.username = None
+        self.invite_link = None
+
+    async def get_member(self, user_id):
+        return SimpleNamespace(status=None)
+
+
+class FakeMessage:
+    def __init__(self, client, id_, chat, from_user, text=None, reply_to=None):
+        self._client = client
+        self.id = id_
+        self.chat = chat
+        self.from_user = from_user
+        self.sender_chat = None
+        self.text = text
+        self.caption = None
+        self.date = datetime.now()
+        self.reply_to_message = reply_to
+        self.reply_to_message_id = reply_to.id if reply_to else None
+        self.reply_markup = None
+        self.media = None
+        self.document = None
+        self.video = None
+        self.photo = None
+        self.empty = False
+        self.message_thread_id = None
+
+    @property
+    def link(self):
+        return f"https://t.me/c/{str(self.chat.id)[4:]}/{self.id}"
+
+    async def reply(self, text, **kwargs):
+        return await self._client.send_message(self.chat.id, text, **kwargs)
+
+    async def reply_text(self, text, **kwargs):
+        return await self.reply(text, **kwargs)
+
+    async def reply_photo(self, photo, caption=None, **kwargs):
+        return await self._client.send_photo(self.chat.id, photo, caption, **kwargs)
+
+    async def reply_document(self, document, caption=None, **kwargs):
+        return await self._client.send_document(
+            self.chat.id, document, caption=caption, **kwargs
+        )
+
+    async def reply_media_group(self, media, **kwargs):
+        return [await self._client.send_message(self.chat.id, m.caption) for m in media]
+
+    async def edit(self, text, **kwargs):
+        return await self._client.edit_message_text(self.chat.id, self.id, text)
+
+    async def edit_text(self, text, **kwargs):
+        return await self.edit(text, **kwargs)
+
+    async def edit_caption(self, caption, **kwargs):
+        return await self._client.edit_message_text(self.chat.id, self.id, caption)
+
+    async def edit_media(self, media, **kwargs):
+        return await self._client.edit_message_text(self.chat.id, self.id, "")
+
+    async def edit_reply_markup(self, reply_markup=None):
+        self.reply_markup = reply_markup
+        return await self._client.call("edit_message_reply_markup", self)
+
+    async def delete(self, revoke=True):
+        return await self._client.delete_messages(self.chat.id, self.id)
+
+
+class FakeTelegram:
+    # Stand-in for the Pyrogram client: every API call sleeps settings.api_latency
+    # and is counted, uploads report progress at settings.up_speed
+    def __init__(self, name, api_id=None, api_hash=None, **kwargs):
+        self.name = name
+        try:
+            self.loop = get_event_loop()
+        except RuntimeError:
+            self.loop = new_event_loop()
+            set_event_loop(self.loop)
+        self.me = FakeUser(BOT_ID, name, f"{name}_bench_bot", True)
+        self.handlers = []
+        self.calls = {}
+        self.messages = {}
+        self.__ids = count(1000000)
+
+    def start(self):
+        return self
+
+    def stop(self, *args):
+        return self
+
+    async def call(self, method, result=None):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if settings.api_latency:
+            await asleep(settings.api_latency)
+        return result
+
+    def new_message(self, chat_id, text=None, user=None, reply_to=None):
+        chat = FakeChat(chat_id, ChatType.SUPERGROUP if chat_id < 0 else ChatType.BOT)
+        msg = FakeMessage(self, next(self.__ids), chat, user or self.me, text, reply_to)
+        self.messages[(chat_id, msg.id)] = msg
+        return msg
+
+    def add_handler(self, handler, group=0):
+        self.handlers.append((handler, group))
+
+    def remove_handler(self, handler, group=0):
+        if (handler, group) in self.handlers:
+            self.handlers.remove((handler, group))
+
+    async def get_me(self):
+        return self.me
+
+    async def set_bot_commands(self, *args, **kwargs):
+        return await self.call("set_bot_commands", True)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        return await self.call("send_message", self.new_message(chat_id, text))
+
+    async def send_photo(self, chat_id, photo, caption=None, **kwargs):
+        msg = self.new_message(chat_id)
+        msg.caption, msg.media = caption, True
+        msg.photo = SimpleNamespace(file_id=photo)
+        return await self.call("send_photo", msg)
+
+    async def __send_file(self, method, kind, chat_id, path, progress, caption):
+        size = ospath.getsize(path) if ospath.exists(path) else 0
+        start, sent, chunk = time(), 0, max(1, int(settings.up_speed * TICK))
+        while sent < size:
+            sent = min(size, sent + chunk)
+            await asleep(max(0, start + sent / settings.up_speed - time()))
+            if progress is not None:
+                await progress(sent, size)
+        msg = self.new_message(chat_id)
+        msg.caption, msg.media = caption, True
+        setattr(msg, kind, SimpleNamespace(file_id=f"{kind}{msg.id}", file_size=size))
+        return await self.call(method, msg)
+
+    async def send_document(self, chat_id, document, progress=None, caption=None, **kw):
+        return await self.__send_file(
+            "send_document", "document", chat_id, document, progress, caption
+        )
+
+    async def send_video(self, chat_id, video, progress=None, caption=None, **kw):
+        return await self.__send_file(
+            "send_video", "video", chat_id, video, progress, caption
+        )
+
+    async def send_audio(self, chat_id, audio, progress=None, caption=None, **kw):
+        return await self.__send_file(
+            "send_audio", "audio", chat_id, audio, progress, caption
+        )
+
+    async def copy_message(self, chat_id, from_chat_id, message_id, **kwargs):
+        return await self.call("copy_message", self.new_message(chat_id))
+
+    async def copy_media_group(self, chat_id, from_chat_id, message_id, **kwargs):
+        return await self.call("copy_media_group", [self.new_message(chat_id)])
+
+    async def edit_message_text(self, chat_id, message_id, text, **kwargs):
+        if msg := self.messages.get((chat_id, message_id)):
+            msg.text = text
+        return await self.call("edit_message_text", msg)
+
+    async def delete_messages(self, chat_id, message_ids, revoke=True):
+        self.messages.pop((chat_id, message_ids), None)
+        return await self.call("delete_messages", True)
+
+    async def get_chat(self, chat_id):
+        return await self.call("get_chat", FakeChat(chat_id))
+
+    async def get_messages(self, chat_id, message_ids, **kwargs):
+        msg = self.messages.get((chat_id, message_ids))
+        if msg is None:
+            msg = self.new_message(chat_id)
+            msg.empty = True
+        return await self.call("get_messages", msg)
+
+    async def get_users(self, user_ids):
+        return await self.call("get_users", FakeUser(user_ids))
+
+    async def download_media(self, message, *args, **kwargs):
+        return await self.call("download_media", None)
+
+    def stop_transmission(self):
+        pass
+
+
+# ---------------------------------------------------------------- bootstrap
+
+
+class FakeTelegraph:
+    def __init__(self, *args, **kwargs):
+        self.__pages = count(1)
+
+    async def create_account(self, **kwargs):
+        return {"access_token": "benchmark"}
+
+    def get_access_token(self):
+        return "benchmark"
+
+    async def create_page(self, title, **kwargs):
+        path = f"Bench-{next(self.__pages)}"
+        return {"path": path, "url": f"https://graph.org/{path}", "title": title}
+
+    async def edit_page(self, path, title, **kwargs):
+        return {"path": path, "url": f"https://graph.org/{path}", "title": title}
+
+
+def _no_process(*args, **kwargs):
+    return subprocess.CompletedProcess(args, 0, b"", b"")
+
+
+class _NoPopen:
+    def __init__(self, *args, **kwargs):
+        self.returncode = 0
+
+    def wait(self, *args, **kwargs):
+        return 0
+
+
+@contextmanager
+def patched(workdir):
+    # bot/__init__ talks to every backend and spawns the engines at import time.
+    # The clients stay faked, subprocess only while the import runs so 7z/ffmpeg
+    # stages still get real processes
+    env = {
+        "BOT_TOKEN": f"{BOT_ID}:benchmark",
+        "OWNER_ID": str(OWNER_ID),
+        "TELEGRAM_API": "1",
+        "TELEGRAM_HASH": "benchmark",
+        "DATABASE_URL": "mongodb://benchmark",
+        "RESUME_TASKS": "True",
+        "DOWNLOAD_DIR": f"{workdir}/downloads/",
+        "STATUS_UPDATE_INTERVAL": "3",
+    }
+    for key, value in env.items():
+        environ.setdefault(key, value)
+    fakes = [
+        (pyrogram, "Client", FakeTelegram),
+        (aria2p, "Client", FakeAria2),
+        (aiohttp.ClientSession, "ws_connect", FakeAria2Socket),
+        (qbittorrentapi, "Client", FakeQbit),
+        (telegraph.aio, "Telegraph", FakeTelegraph),
+        (pymongo, "MongoClient", FakeMongo),
+        (motor.motor_asyncio, "AsyncIOMotorClient", FakeMotor),
+    ]
+    for mod, name, fake in fakes:
+        setattr(mod, name, fake)
+    real_run, real_popen = subprocess.run, subprocess.Popen
+    subprocess.run, subprocess.Popen = _no_process, _NoPopen
+    try:
+        yield
+    finally:
+        subprocess.run, subprocess.Popen = real_run, real_popen
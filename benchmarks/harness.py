@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+from json import dump, load
+from time import perf_counter
+from statistics import mean, median
+
+
+class Result:
+    def __init__(self, name, samples, unit="call", extra=None):
+        self.name = name
+        self.samples = sorted(samples)
+        self.unit = unit
+        self.extra = extra or {}
+
+    @property
+    def mean(self):
+        return mean(self.samples) if self.samples else 0
+
+    @property
+    def p50(self):
+        return median(self.samples) if self.samples else 0
+
+    @property
+    def p95(self):
+        if not self.samples:
+            return 0
+        return self.samples[min(len(self.samples) - 1, int(len(self.samples) * 0.95))]
+
+    @property
+    def rate(self):
+        return 1 / self.mean if self.mean else 0
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "unit": self.unit,
+            "runs": len(self.samples),
+            "mean": self.mean,
+            "p50": self.p50,
+            "p95": self.p95,
+            "rate": self.rate,
+            **self.extra,
+        }
+
+
+def bench(name, func, repeat, setup=None, warmup=3):
+    samples = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        func()
+        if i >= warmup:
+            samples.append(perf_counter() - start)
+    return Result(name, samples)
+
+
+async def abench(name, coro, repeat, setup=None, warmup=3):
+    samples = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        await coro()
+        if i >= warmup:
+            samples.append(perf_counter() - start)
+    return Result(name, samples)
+
+
+def report(results):
+    print(
+        f"{'benchmark':<42}{'runs':>6}{'mean':>12}{'p50':>12}{'p95':>12}{'ops/s':>12}"
+    )
+    for r in results:
+        print(
+            f"{r.name:<42}{len(r.samples):>6}{r.mean * 1000:>10.3f}ms"
+            f"{r.p50 * 1000:>10.3f}ms{r.p95 * 1000:>10.3f}ms{r.rate:>12.1f}"
+        )
+        for key, value in r.extra.items():
+            print(f"    {key}: {value}")
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        dump([r.as_dict() for r in results], f, indent=2)
+
+
+def compare(results, path, tolerance):
+    # A benchmark regresses when its p50 grew by more than tolerance over baseline
+    with open(path) as f:
+        baseline = {r["name"]: r for r in load(f)}
+    regressions = []
+    for r in results:
+        if (old := baseline.get(r.name)) is None or not old["p50"]:
+            continue
+        change = r.p50 / old["p50"] - 1
+        print(f"{r.name:<42}{change * 100:>+9.1f}%")
+        if change > tolerance:
+            regressions.append(r.name)
+    return regressions
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+from os import environ
+from asyncio import Event
+
+from bot import (
+    bot,
+    aria2,
+    config_dict,
+    download_dict,
+    queued_dl,
+    non_queued_dl,
+    status_reply_dict,
+    Interval,
+    user_data,
+    QbTorrents,
+)
+from bot.helper.ext_utils.bot_utils import (
+    get_readable_message,
+    arg_parser,
+    getDownloadByGid,
+    get_user_tasks,
+)
+from bot.helper.ext_utils.leech_utils import format_filename
+from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.telegram_helper.message_utils import update_all_messages
+from web.nodes import make_tree
+from benchmarks.fakes import FakeQbit
+from benchmarks.harness import bench, abench
+from benchmarks.workload import new_user, fill_status, torrent_files, CHAT_ID
+
+LEECH_ARGS = (
+    "https://bench.invalid/file.mkv -n Some Show S01E01 1080p.mkv -z -up gd "
+    "-rcf --buffer-size:8M|--drive-chunk-size:64M -ss 4 -t https://bench.invalid/t.jpg "
+    "-h User-Agent: bench, Referer: https://bench.invalid"
+).split(" ")
+ARG_BASE = {
+    "link": "",
+    "-i": "0",
+    "-m": "",
+    "-sd": "",
+    "-samedir": "",
+    "-d": False,
+    "-seed": False,
+    "-j": False,
+    "-join": False,
+    "-s": False,
+    "-select": False,
+    "-b": False,
+    "-bulk": False,
+    "-n": "",
+    "-name": "",
+    "-e": False,
+    "-extract": False,
+    "-uz": False,
+    "-unzip": False,
+    "-z": False,
+    "-zip": False,
+    "-up": "",
+    "-upload": "",
+    "-rcf": "",
+    "-u": "",
+    "-user": "",
+    "-p": "",
+    "-pass": "",
+    "-id": "",
+    "-index": "",
+    "-c": "",
+    "-category": "",
+    "-ud": "",
+    "-dump": "",
+    "-h": "",
+    "-headers": "",
+    "-ss": "0",
+    "-screenshots": "",
+    "-t": "",
+    "-thumb": "",
+}
+
+
+class NoInterval:
+    def cancel(self):
+        pass
+
+
+def aria2_files(n, folders=10):
+    root = f"{environ['DOWNLOAD_DIR']}1/"
+    return [
+        {
+            "index": str(i + 1),
+            "path": f"{root}Show/Season {i % folders}/Episode {i}.mkv",
+            "length": str(350 * 1024**2),
+            "completedLength": str(i * 1024**2),
+            "selected": "true" if i % 4 else "false",
+        }
+        for i in range(n)
+    ]
+
+
+def bench_sync(args):
+    return [
+        bench(
+            "arg_parser",
+            lambda: arg_parser(LEECH_ARGS, dict(ARG_BASE)),
+            args.repeat * 100,
+        ),
+        bench(
+            f"make_tree[qbit {args.files} files]",
+            lambda files=torrent_files(args.files): make_tree(files),
+            args.repeat,
+        ),
+        bench(
+            f"make_tree[aria2 {args.files} files]",
+            lambda files=aria2_files(args.files): make_tree(files, True),
+            args.repeat,
+        ),
+    ]
+
+
+async def bench_async(args):
+    results = []
+    user = new_user(
+        lprefix="@Bench ",
+        lsuffix=" [Bench]",
+        lremname="www\\S+|\\[.*?\\]:|720p:1080p",
+    )
+    name = "www.site.com [Group] Some.Show.S01E01.720p.WEB-DL.x264.mkv"
+    results.append(
+        await abench(
+            "format_filename",
+            lambda: format_filename(name, user.id),
+            args.repeat * 20,
+        )
+    )
+
+    uids = fill_status(args.tasks)
+    await engine_snapshot.refresh()
+    results.append(
+        bench(
+            f"get_readable_message[{args.tasks} tasks]",
+            get_readable_message,
+            args.repeat,
+        )
+    )
+
+    last = download_dict[uids[-1]]
+    results.append(
+        await abench(
+            f"getDownloadByGid[{args.tasks} tasks]",
+            lambda: getDownloadByGid(last.gid()),
+            args.repeat * 20,
+        )
+    )
+    results.append(
+        await abench(
+            f"get_user_tasks[{args.tasks} tasks]",
+            lambda: get_user_tasks(last.message.from_user.id, args.tasks),
+            args.repeat * 20,
+        )
+    )
+
+    def fill_queue():
+        queued_dl.clear()
+        non_queued_dl.clear()
+        for uid in uids:
+            queued_dl[uid] = Event()
+
+    config_dict["QUEUE_DOWNLOAD"] = max(1, args.tasks // 2)
+    results.append(
+        await abench(
+            f"start_from_queued[{args.tasks} queued]",
+            start_from_queued,
+            args.repeat,
+            setup=fill_queue,
+        )
+    )
+    config_dict["QUEUE_DOWNLOAD"] = ""
+    queued_dl.clear()
+
+    Interval.append(NoInterval())
+    for i in range(args.chats):
+        msg = bot.new_message(CHAT_ID - i, "status")
+        status_reply_dict[msg.chat.id] = [msg, 0]
+    results.append(
+        await abench(
+            f"update_all_messages[{args.tasks} tasks, {args.chats} chats]",
+            lambda: update_all_messages(True),
+            args.repeat,
+        )
+    )
+    status_reply_dict.clear()
+    Interval.clear()
+    download_dict.clear()
+    aria2.remove_all(True)
+    FakeQbit.torrents.clear()
+    QbTorrents.clear()
+    user_data.pop(user.id, None)
+    return results
+
+
+async def run(args):
+    return bench_sync(args) + await bench_async(args)
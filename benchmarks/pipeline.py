@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+from time import time
+from shutil import which
+from asyncio import Event, TimeoutError, wait_for
+
+from bot import bot, user_data
+from bot.helper.ext_utils.metrics import metrics
+from bot.helper.ext_utils.executors import executors
+from bot.helper.ext_utils.loop_monitor import loop_monitor
+from bot.helper.listeners.tasks_listener import MirrorLeechListener
+from bot.helper.listeners.aria2_listener import start_aria2_listener
+from bot.helper.telegram_helper.send_queue import send_queue, TokenBucket
+from bot.helper.mirror_utils.download_utils.aria2_download import add_aria2c_download
+from benchmarks.fakes import FakeAria2
+from benchmarks.harness import Result
+from benchmarks.workload import new_user, new_message, new_listener
+
+MIXES = {
+    "leech": {"isLeech": True},
+    "zip": {"isLeech": True, "compress": True},
+    "unzip": {"isLeech": True, "extract": True},
+    "split": {"isLeech": True},
+}
+TOOLS = {"zip": "7z", "unzip": "7z", "split": "split"}
+
+
+class BenchListener(MirrorLeechListener):
+    started = {}
+    finished = {}
+    failed = {}
+    done = Event()
+    total = 0
+
+    def __record(self, results):
+        results[self.uid] = time() - self.started[self.uid]
+        if len(self.finished) + len(self.failed) >= self.total:
+            self.done.set()
+
+    async def onUploadComplete(self, *args, **kwargs):
+        await super().onUploadComplete(*args, **kwargs)
+        self.__record(self.finished)
+
+    async def onUploadError(self, error):
+        await super().onUploadError(error)
+        self.__record(self.failed)
+
+    async def onDownloadError(self, error, button=None):
+        await super().onDownloadError(error, button)
+        self.__record(self.failed)
+
+
+def reset(total):
+    BenchListener.started.clear()
+    BenchListener.finished.clear()
+    BenchListener.failed.clear()
+    BenchListener.done = Event()
+    BenchListener.total = total
+    metrics.histograms.clear()
+    for pool in executors.pools.values():
+        pool.completed = pool.wait_time = pool.max_wait = 0
+    bot.calls.clear()
+    FakeAria2.current.calls.clear()
+    loop_monitor.max_loop_lag = 0
+
+
+async def start_task(i, mix, size):
+    if mix == "split":
+        user = new_user(split_size=max(size // 4, 1024**2))
+    else:
+        user = new_user()
+    name = f"file{i}.zip" if mix == "unzip" else f"file{i}.bin"
+    link = f"https://bench.invalid/{i}/{name}?size={size}"
+    message = new_message(f"/leech {link}", user)
+    listener = new_listener(message, BenchListener, link, **MIXES[mix])
+    BenchListener.started[listener.uid] = time()
+    await add_aria2c_download(link, listener.dir, listener, None, None, None, None)
+    return user
+
+
+async def run(args):
+    mixes = []
+    for mix in args.mix.split(","):
+        if (tool := TOOLS.get(mix)) and not which(tool):
+            # A missing binary fails the task inside new_thread, where nobody sees it
+            print(f"Skipping {mix} tasks, {tool} is not installed")
+        else:
+            mixes.append(mix)
+    if not mixes:
+        return []
+    if not args.tg_limits:
+        # The fake never floods, unpaced sends measure the bot rather than
+        # Telegram's 20 messages a minute per group
+        send_queue.private_limit = send_queue.group_limit = (1e6, 1e6)
+        send_queue.bucket = TokenBucket(1e6, 1e6)
+    start_aria2_listener()
+    reset(args.tasks)
+    start = time()
+    users = [
+        await start_task(i, mixes[i % len(mixes)], args.size) for i in range(args.tasks)
+    ]
+    try:
+        await wait_for(BenchListener.done.wait(), args.timeout)
+    except TimeoutError:
+        pass
+    elapsed = time() - start
+    for user in users:
+        user_data.pop(user.id, None)
+
+    stages = {
+        stage: f"{hist['sum'] / hist['count']:.3f}s over {hist['count']}"
+        for stage, hist in metrics.histograms.items()
+        if hist["count"]
+    }
+    finished, failed = len(BenchListener.finished), len(BenchListener.failed)
+    extra = {
+        "finished": finished,
+        "failed": failed,
+        "timed out": args.tasks - finished - failed,
+        "throughput": f"{finished * args.size / elapsed / 1024**2:.1f} MiB/s",
+        "stages": stages,
+        "telegram calls": sum(bot.calls.values()),
+        "aria2 calls": sum(FakeAria2.current.calls.values()),
+        "max loop lag": f"{loop_monitor.max_loop_lag * 1000:.1f}ms",
+        "pool waits": {
+            name: f"{pool.wait_time:.3f}s over {pool.completed}, "
+            f"max {pool.max_wait * 1000:.1f}ms"
+            for name, pool in executors.pools.items()
+            if pool.completed
+        },
+    }
+    return [
+        Result(
+            f"pipeline[{args.tasks} x {','.join(mixes)}]",
+            list(BenchListener.finished.values()),
+            "task",
+            extra,
+        )
+    ]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+from itertools import count
+
+from bot import bot, aria2, download_dict, user_data, QbTorrents
+from bot.helper.listeners.tasks_listener import MirrorLeechListener
+from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
+from bot.helper.mirror_utils.status_utils.qbit_status import QbittorrentStatus
+from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
+from benchmarks.fakes import FakeUser, FakeQbit, AttrDict
+
+CHAT_ID = -1001234567890
+FOREVER = 1024**5
+users = count(10)
+
+
+def new_user(**settings):
+    user = FakeUser(next(users))
+    if settings:
+        user_data[user.id] = settings
+    return user
+
+
+def new_message(text, user=None):
+    return bot.new_message(CHAT_ID, text, user or new_user())
+
+
+def new_listener(message, cls=MirrorLeechListener, link=None, **kwargs):
+    leech_utils = {"screenshots": 0, "thumb": ""}
+    return cls(message, source_url=link, leech_utils=leech_utils, **kwargs)
+
+
+def torrent_files(n, folders=10):
+    return [
+        AttrDict(
+            id=i,
+            index=i,
+            name=f"Show/Season {i % folders}/Episode {i}.mkv",
+            size=350 * 1024**2,
+            priority=1,
+            progress=(i % 100) / 100,
+        )
+        for i in range(n)
+    ]
+
+
+def fill_status(n):
+    # A third each of aria2, qBittorrent and queued tasks, the mix a busy
+    # status message renders. Aria2 downloads are too big to ever finish.
+    download_dict.clear()
+    QbTorrents.clear()
+    for i in range(n):
+        link = f"https://bench.invalid/task{i}/file{i}.bin?size={FOREVER}"
+        message = new_message(f"/leech {link}")
+        listener = new_listener(message, link=link, isLeech=True, isQbit=i % 3 == 1)
+        if i % 3 == 0:
+            gid = aria2.add_uris([link]).gid
+            status = Aria2Status(gid, listener)
+        elif i % 3 == 1:
+            FakeQbit.add_torrent(f"{listener.uid}", f"Torrent {i}", torrent_files(20))
+            # Registered like qbit_listener does, so the engine snapshot covers it
+            QbTorrents[f"{listener.uid}"] = {"seeding": False}
+            status = QbittorrentStatus(listener)
+        else:
+            status = QueueStatus(f"Queued {i}", 1024**3, f"{i:012x}", listener, "dl")
+        download_dict[listener.uid] = status
+    return list(download_dict)
@@ -19,6 +19,7 @@ from dotenv import load_dotenv, dotenv_values
 from threading import Thread
 from time import sleep, time
 from subprocess import Popen, run as srun
+from concurrent.futures import ThreadPoolExecutor
 from os import remove as osremove, path as ospath, environ, getcwd
 from aria2p import API as ariaAPI, Client as ariaClient
 from qbittorrentapi import Client as qbClient
@@ -26,11 +27,7 @@ from socket import setdefaulttimeout
 from logging import (
     getLogger,
     Formatter,
-    FileHandler,
-    StreamHandler,
-    INFO,
     ERROR,
-    basicConfig,
     error as log_error,
     info as log_info,
     warning as log_warning,
@@ -44,16 +41,16 @@ install()
 install()
 setdefaulttimeout(600)
 
+from bot.helper.ext_utils.startup import BootTimer, wait_ready
+from bot.helper.ext_utils.log_pipeline import log_pipeline
+from bot.helper.ext_utils.task_registry import TaskRegistry
+
 pyroutils.MIN_CHAT_ID = -999999999999
 pyroutils.MIN_CHANNEL_ID = -100999999999999
 botStartTime = time()
+boot_timer = BootTimer()
 
-basicConfig(
-    format="[%(asctime)s] [%(levelname)s] - %(message)s",  #  [%(filename)s:%(lineno)d]
-    datefmt="%d-%b-%y %I:%M:%S %p",
-    handlers=[FileHandler("log.txt"), StreamHandler()],
-    level=INFO,
-)
+log_pipeline.start()
 
 getLogger("pyrogram").setLevel(ERROR)
 getLogger("aiohttp").setLevel(ERROR)
@@ -94,7 +91,7 @@ status_reply_dict_lock = Lock()
 queue_dict_lock = Lock()
 qb_listener_lock = Lock()
 status_reply_dict = {}
-download_dict = {}
+download_dict = TaskRegistry()
 rss_dict = {}
 
 BOT_TOKEN = environ.get("BOT_TOKEN", "")
@@ -147,6 +144,39 @@ if DATABASE_URL:
 else:
     config_dict = {}
 
+boot_timer.mark("config")
+
+# Both daemons come up while the rest of the config loads and Telegram logs in
+if not ospath.exists(".netrc"):
+    with open(".netrc", "w"):
+        pass
+srun(["chmod", "600", ".netrc"])
+srun(["cp", ".netrc", "/root/.netrc"])
+srun(["chmod", "+x", "aria.sh"])
+Popen(["qbittorrent-nox", "-d", f"--profile={getcwd()}"])
+Popen("./aria.sh", shell=True)
+
+aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
+
+
+def get_client():
+    return qbClient(
+        host="localhost",
+        port=8090,
+        VERIFY_WEBUI_CERTIFICATE=False,
+        REQUESTS_ARGS={"timeout": (30, 60)},
+    )
+
+
+startup_pool = ThreadPoolExecutor(2, thread_name_prefix="startup")
+aria2_ready = startup_pool.submit(
+    boot_timer.timed, "aria2", wait_ready, aria2.client.get_version
+)
+qbit_ready = startup_pool.submit(
+    boot_timer.timed, "qbittorrent", wait_ready, lambda: get_client().app.version
+)
+boot_timer.mark("daemons")
+
 OWNER_ID = environ.get("OWNER_ID", "")
 if len(OWNER_ID) == 0:
     log_error("OWNER_ID variable is missing! Exiting now")
@@ -172,7 +202,8 @@ if len(TIMEZONE) == 0:
 
 
 def changetz(*args):
-    return datetime.now(timezone(TIMEZONE)).timetuple()
+    # Records are formatted on the log thread, stamp them with their own time
+    return datetime.fromtimestamp(args[-1], timezone(TIMEZONE)).timetuple()
 
 
 Formatter.converter = changetz
@@ -397,9 +428,45 @@ QUEUE_DOWNLOAD = "" if len(QUEUE_DOWNLOAD) == 0 else int(QUEUE_DOWNLOAD)
 QUEUE_UPLOAD = environ.get("QUEUE_UPLOAD", "")
 QUEUE_UPLOAD = "" if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+QUEUE_SCHEDULER = environ.get("QUEUE_SCHEDULER", "").lower()
+if QUEUE_SCHEDULER not in ["fair", "fifo"]:
+    QUEUE_SCHEDULER = "fair"
+
+ADMISSION_MAX_LOAD = environ.get("ADMISSION_MAX_LOAD", "")
+ADMISSION_MAX_LOAD = "" if len(ADMISSION_MAX_LOAD) == 0 else float(ADMISSION_MAX_LOAD)
+
+ADMISSION_MAX_DL = environ.get("ADMISSION_MAX_DL", "")
+ADMISSION_MAX_DL = "" if len(ADMISSION_MAX_DL) == 0 else int(ADMISSION_MAX_DL)
+
+ADMISSION_MAX_UP = environ.get("ADMISSION_MAX_UP", "")
+ADMISSION_MAX_UP = "" if len(ADMISSION_MAX_UP) == 0 else int(ADMISSION_MAX_UP)
+
+POSTPROCESS_SLOTS = environ.get("POSTPROCESS_SLOTS", "")
+POSTPROCESS_SLOTS = "" if len(POSTPROCESS_SLOTS) == 0 else int(POSTPROCESS_SLOTS)
+
+POSTPROCESS_NICE = environ.get("POSTPROCESS_NICE", "")
+
+LOOP_LAG_THRESHOLD = environ.get("LOOP_LAG_THRESHOLD", "")
+LOOP_LAG_THRESHOLD = "" if len(LOOP_LAG_THRESHOLD) == 0 else float(LOOP_LAG_THRESHOLD)
+
+THREAD_POOLS = environ.get("THREAD_POOLS", "")
+
+LOG_MAX_SIZE = environ.get("LOG_MAX_SIZE", "")
+LOG_MAX_SIZE = 20 if len(LOG_MAX_SIZE) == 0 else int(LOG_MAX_SIZE)
+
+LOG_JSON = environ.get("LOG_JSON", "")
+LOG_JSON = LOG_JSON.lower() == "true"
+log_pipeline.configure(LOG_MAX_SIZE, LOG_JSON)
+
+DIRECT_CONCURRENCY = environ.get("DIRECT_CONCURRENCY", "")
+DIRECT_CONCURRENCY = 5 if len(DIRECT_CONCURRENCY) == 0 else int(DIRECT_CONCURRENCY)
+
 INCOMPLETE_TASK_NOTIFIER = environ.get("INCOMPLETE_TASK_NOTIFIER", "")
 INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == "true"
 
+RESUME_TASKS = environ.get("RESUME_TASKS", "")
+RESUME_TASKS = RESUME_TASKS.lower() == "true"
+
 STOP_DUPLICATE = environ.get("STOP_DUPLICATE", "")
 STOP_DUPLICATE = STOP_DUPLICATE.lower() == "true"
 
@@ -436,6 +503,9 @@ DELETE_LINKS = DELETE_LINKS.lower() == "true"
 EQUAL_SPLITS = environ.get("EQUAL_SPLITS", "")
 EQUAL_SPLITS = EQUAL_SPLITS.lower() == "true"
 
+PIPELINE_UPLOAD = environ.get("PIPELINE_UPLOAD", "")
+PIPELINE_UPLOAD = PIPELINE_UPLOAD.lower() == "true"
+
 MEDIA_GROUP = environ.get("MEDIA_GROUP", "")
 MEDIA_GROUP = MEDIA_GROUP.lower() == "true"
 
@@ -700,9 +770,11 @@ config_dict = {
     "GDTOT_CRYPT": GDTOT_CRYPT,
     "JIODRIVE_TOKEN": JIODRIVE_TOKEN,
     "EQUAL_SPLITS": EQUAL_SPLITS,
+    "PIPELINE_UPLOAD": PIPELINE_UPLOAD,
     "EXTENSION_FILTER": EXTENSION_FILTER,
     "GDRIVE_ID": GDRIVE_ID,
     "INCOMPLETE_TASK_NOTIFIER": INCOMPLETE_TASK_NOTIFIER,
+    "RESUME_TASKS": RESUME_TASKS,
     "INDEX_URL": INDEX_URL,
     "IS_TEAM_DRIVE": IS_TEAM_DRIVE,
     "LEECH_FILENAME_PREFIX": LEECH_FILENAME_PREFIX,
@@ -724,6 +796,17 @@ config_dict = {
     "QUEUE_ALL": QUEUE_ALL,
     "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
     "QUEUE_UPLOAD": QUEUE_UPLOAD,
+    "QUEUE_SCHEDULER": QUEUE_SCHEDULER,
+    "ADMISSION_MAX_LOAD": ADMISSION_MAX_LOAD,
+    "ADMISSION_MAX_DL": ADMISSION_MAX_DL,
+    "ADMISSION_MAX_UP": ADMISSION_MAX_UP,
+    "POSTPROCESS_SLOTS": POSTPROCESS_SLOTS,
+    "POSTPROCESS_NICE": POSTPROCESS_NICE,
+    "LOOP_LAG_THRESHOLD": LOOP_LAG_THRESHOLD,
+    "THREAD_POOLS": THREAD_POOLS,
+    "LOG_MAX_SIZE": LOG_MAX_SIZE,
+    "LOG_JSON": LOG_JSON,
+    "DIRECT_CONCURRENCY": DIRECT_CONCURRENCY,
     "RCLONE_FLAGS": RCLONE_FLAGS,
     "RCLONE_PATH": RCLONE_PATH,
     "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
@@ -813,14 +896,6 @@ if BASE_URL:
         shell=True,
     )
 
-srun(["qbittorrent-nox", "-d", f"--profile={getcwd()}"])
-if not ospath.exists(".netrc"):
-    with open(".netrc", "w"):
-        pass
-srun(["chmod", "600", ".netrc"])
-srun(["cp", ".netrc", "/root/.netrc"])
-srun(["chmod", "+x", "aria.sh"])
-srun("./aria.sh", shell=True)
 if ospath.exists("accounts.zip"):
     if ospath.exists("accounts"):
         srun(["rm", "-rf", "accounts"])
@@ -829,18 +904,20 @@ if ospath.exists("accounts.zip"):
     osremove("accounts.zip")
 if not ospath.exists("accounts"):
     config_dict["USE_SERVICE_ACCOUNTS"] = False
-sleep(0.5)
+boot_timer.mark("env")
 
-aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
-
-
-def get_client():
-    return qbClient(
-        host="localhost",
-        port=8090,
-        VERIFY_WEBUI_CERTIFICATE=False,
-        REQUESTS_ARGS={"timeout": (30, 60)},
-    )
+log_info("Creating client from BOT_TOKEN")
+bot = wztgClient(
+    "bot",
+    TELEGRAM_API,
+    TELEGRAM_HASH,
+    bot_token=BOT_TOKEN,
+    workers=1000,
+    parse_mode=enums.ParseMode.HTML,
+).start()
+bot_loop = bot.loop
+bot_name = bot.me.username
+boot_timer.mark("telegram")
 
 
 def aria2c_init():
@@ -857,8 +934,8 @@ def aria2c_init():
         log_error(f"Aria2c initializing error: {e}")
 
 
+aria2_ready.result()
 Thread(target=aria2c_init).start()
-sleep(1.5)
 
 aria2c_global = [
     "bt-max-open-files",
@@ -882,6 +959,9 @@ else:
     a2c_glo = {op: aria2_options[op] for op in aria2c_global if op in aria2_options}
     aria2.set_global_options(a2c_glo)
 
+qbit_ready.result()
+startup_pool.shutdown()
+
 qb_client = get_client()
 if not qbit_options:
     qbit_options = dict(qb_client.app_preferences())
@@ -895,16 +975,6 @@ else:
         if v in ["", "*"]:
             del qb_opt[k]
     qb_client.app_set_preferences(qb_opt)
+boot_timer.mark("engines")
 
-log_info("Creating client from BOT_TOKEN")
-bot = wztgClient(
-    "bot",
-    TELEGRAM_API,
-    TELEGRAM_HASH,
-    bot_token=BOT_TOKEN,
-    workers=1000,
-    parse_mode=enums.ParseMode.HTML,
-).start()
-bot_loop = bot.loop
-bot_name = bot.me.username
 scheduler = AsyncIOScheduler(timezone=str(get_localzone()), event_loop=bot_loop)
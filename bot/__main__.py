@@ -32,6 +32,7 @@ from bot import (
     QbInterval,
     INCOMPLETE_TASK_NOTIFIER,
     scheduler,
+    boot_timer,
 )
 from bot.version import get_version
 from .helper.ext_utils.fs_utils import start_cleanup, clean_all, exit_clean_up
@@ -45,6 +46,14 @@ from .helper.ext_utils.bot_utils import (
     get_stats,
 )
 from .helper.ext_utils.db_handler import DbManger
+from .helper.ext_utils.engine_snapshot import engine_snapshot
+from .helper.ext_utils.admission import admission
+from .helper.ext_utils.upload_pipeline import upload_pipeline
+from .helper.ext_utils.metrics import metrics
+from .helper.ext_utils.log_pipeline import log_pipeline
+from .helper.ext_utils.loop_monitor import loop_monitor
+from .helper.ext_utils.lazy_modules import lazy_modules
+from .helper.ext_utils.task_manager import start_from_queued
 from .helper.telegram_helper.bot_commands import BotCommands
 from .helper.telegram_helper.message_utils import (
     sendMessage,
@@ -67,7 +76,6 @@ from .modules import (
     cancel_mirror,
     mirror_leech,
     status,
-    torrent_search,
     torrent_select,
     ytdlp,
     rss,
@@ -78,16 +86,17 @@ from .modules import (
     speedtest,
     save_msg,
     images,
-    imdb,
-    anilist,
     mediainfo,
-    mydramalist,
-    gen_pyro_sess,
     gd_clean,
     broadcast,
     category_select,
+    profile,
 )
 
+for lazy_module in lazy_modules.values():
+    lazy_module.register()
+boot_timer.mark("modules")
+
 
 async def stats(client, message):
     msg, btns = await get_stats(message)
@@ -174,7 +183,7 @@ async def restart(client, message):
     for interval in [QbInterval, Interval]:
         if interval:
             interval[0].cancel()
-    await sync_to_async(clean_all)
+    await sync_to_async(clean_all, pool="fs")
     proc1 = await create_subprocess_exec(
         "pkill", "-9", "-f", "gunicorn|aria2c|qbittorrent-nox|ffmpeg|rclone"
     )
@@ -182,6 +191,7 @@ async def restart(client, message):
     await gather(proc1.wait(), proc2.wait())
     async with aiopen(".restartmsg", "w") as f:
         await f.write(f"{restart_message.chat.id}\n{restart_message.id}\n")
+    log_pipeline.stop()
     osexecl(executable, executable, "-m", "bot")
 
 
@@ -200,7 +210,11 @@ async def log(_, message):
         BotTheme("LOG_DISPLAY_BT"), f"wzmlx {message.from_user.id} logdisplay"
     )
     buttons.ibutton(BotTheme("WEB_PASTE_BT"), f"wzmlx {message.from_user.id} webpaste")
-    await sendFile(message, "log.txt", buttons=buttons.build_menu(1))
+    # log.txt alone can be nearly empty right after a rotation
+    *previous, current = log_pipeline.files()[-2:]
+    for path in previous:
+        await sendFile(message, path)
+    await sendFile(message, current, buttons=buttons.build_menu(1))
 
 
 async def search_images():
@@ -377,13 +391,18 @@ async def log_check():
 async def main():
     await gather(
         start_cleanup(),
-        torrent_search.initiate_search_tools(),
         restart_notification(),
         search_images(),
         set_commands(bot),
         log_check(),
     )
-    await sync_to_async(start_aria2_listener, wait=False)
+    start_aria2_listener()
+    engine_snapshot.start()
+    admission.start(start_from_queued)
+    upload_pipeline.start()
+    metrics.start()
+    loop_monitor.start()
+    await mirror_leech.resume_tasks()
 
     bot.add_handler(
         MessageHandler(start, filters=command(BotCommands.StartCommand) & private)
@@ -430,6 +449,8 @@ async def main():
     if user:
         LOGGER.info(f"WZ's User [@{user.me.username}] Ready!")
     signal(SIGINT, exit_clean_up)
+    boot_timer.mark("startup")
+    LOGGER.info(boot_timer.summary())
 
 
 async def stop_signals():
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+from time import time
+from asyncio import sleep
+from os import cpu_count
+from psutil import net_io_counters, disk_usage, getloadavg
+
+from bot import (
+    DOWNLOAD_DIR,
+    config_dict,
+    queued_dl,
+    queued_up,
+    non_queued_dl,
+    non_queued_up,
+    bot_loop,
+    LOGGER,
+)
+from bot.helper.ext_utils.executors import executors
+from bot.helper.ext_utils.storage_ledger import reserved_storage
+
+SAMPLE_INTERVAL = 5
+
+
+class AdmissionControl:
+    def __init__(self):
+        self.dl_speed = 0
+        self.up_speed = 0
+        self.free = None
+        self.load = 0
+        self.__last = None
+        self.__task = None
+
+    def sample(self):
+        rx, tx = 0, 0
+        for nic, counters in net_io_counters(pernic=True).items():
+            if nic != "lo":
+                rx += counters.bytes_recv
+                tx += counters.bytes_sent
+        now = time()
+        if self.__last is not None and now > self.__last[0]:
+            self.dl_speed = (rx - self.__last[1]) / (now - self.__last[0])
+            self.up_speed = (tx - self.__last[2]) / (now - self.__last[0])
+        self.__last = (now, rx, tx)
+        self.free = disk_usage(DOWNLOAD_DIR).free - reserved_storage()
+        self.load = getloadavg()[0] / (cpu_count() or 1)
+
+    def reason(self, key):
+        if (
+            key == "dl"
+            and (STORAGE_THRESHOLD := config_dict["STORAGE_THRESHOLD"])
+            and self.free is not None
+            and self.free < STORAGE_THRESHOLD * 1024**3
+        ):
+            return f"Unreserved disk {round(self.free / 1024**3, 2)}GB is below {STORAGE_THRESHOLD}GB"
+        # Never hold back the only task of a kind, nothing else would wake the queue
+        if not (non_queued_dl if key == "dl" else non_queued_up):
+            return ""
+        if (MAX_LOAD := config_dict["ADMISSION_MAX_LOAD"]) and self.load >= MAX_LOAD:
+            return f"Load average {round(self.load, 2)} per core is above {MAX_LOAD}"
+        if key == "dl":
+            if (MAX_DL := config_dict["ADMISSION_MAX_DL"]) and (
+                self.dl_speed >= MAX_DL * 1024**2
+            ):
+                return f"Download link busy at {round(self.dl_speed / 1024**2, 2)}MB/s"
+        elif (MAX_UP := config_dict["ADMISSION_MAX_UP"]) and (
+            self.up_speed >= MAX_UP * 1024**2
+        ):
+            return f"Upload link busy at {round(self.up_speed / 1024**2, 2)}MB/s"
+        return ""
+
+    def admit(self, key):
+        return not self.reason(key)
+
+    def throttled(self, key):
+        return bool(
+            config_dict["ADMISSION_MAX_LOAD"]
+            or config_dict["ADMISSION_MAX_DL" if key == "dl" else "ADMISSION_MAX_UP"]
+        )
+
+    def why_queued(self, uid):
+        return (
+            self.reason("dl" if uid in queued_dl else "up") or "Waiting for a free slot"
+        )
+
+    async def __poller(self, on_headroom):
+        while True:
+            try:
+                # Not sync_to_async, bot_utils imports this module
+                await bot_loop.run_in_executor(executors.get("fs"), self.sample)
+            except Exception as e:
+                LOGGER.error(f"{e}: while sampling resources for admission")
+            if (queued_dl and self.admit("dl")) or (queued_up and self.admit("up")):
+                await on_headroom()
+            await sleep(SAMPLE_INTERVAL)
+
+    def start(self, on_headroom):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__poller(on_headroom))
+
+
+admission = AdmissionControl()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+from itertools import count
+from asyncio import Event, sleep, wait_for
+from aiohttp import ClientSession, WSMsgType
+from aria2p import Download, Options
+
+from bot import aria2, bot_loop, LOGGER
+from bot.helper.ext_utils.exceptions import Aria2RPCError
+
+ARIA2_WS = "ws://localhost:6800/jsonrpc"
+CALL_TIMEOUT = 30
+RECONNECT_DELAY = 3
+
+EVENTS = {
+    "aria2.onDownloadStart": "start",
+    "aria2.onDownloadPause": "pause",
+    "aria2.onDownloadStop": "stop",
+    "aria2.onDownloadComplete": "complete",
+    "aria2.onDownloadError": "error",
+    "aria2.onBtDownloadComplete": "bt_complete",
+}
+# Events after which aria2 is done with a gid, and the status each leaves
+FINAL = {"complete": "complete", "error": "error", "removed": "stop"}
+
+
+class Aria2RPC:
+    # Calls and aria2's own notifications share one WebSocket, a task waiting on
+    # a download is woken by the event aria2 pushes instead of polling it
+    def __init__(self):
+        self.__ids = count()
+        self.__calls = {}
+        self.__waiters = {}
+        self.__handlers = {}
+        self.__connected = Event()
+        self.__ws = None
+        self.__task = None
+
+    def start(self):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__run())
+
+    def subscribe(self, event, callback):
+        self.__handlers.setdefault(event, []).append(callback)
+
+    async def __run(self):
+        while True:
+            try:
+                async with ClientSession() as session:
+                    async with session.ws_connect(
+                        ARIA2_WS, heartbeat=30, max_msg_size=0
+                    ) as ws:
+                        self.__ws = ws
+                        self.__connected.set()
+                        if self.__waiters:
+                            bot_loop.create_task(self.__resync())
+                        async for msg in ws:
+                            if msg.type != WSMsgType.TEXT:
+                                break
+                            self.__dispatch(msg.json())
+            except Exception as e:
+                LOGGER.error(f"{e}: Aria2c, WebSocket connection")
+            self.__connected.clear()
+            self.__ws = None
+            for future in self.__calls.values():
+                if not future.done():
+                    future.set_exception(Aria2RPCError("Aria2c connection lost"))
+            self.__calls.clear()
+            await sleep(RECONNECT_DELAY)
+
+    def __dispatch(self, data):
+        if "method" not in data:
+            if (future := self.__calls.pop(data.get("id"), None)) is None:
+                return
+            if not future.done():
+                if error := data.get("error"):
+                    future.set_exception(Aria2RPCError(error["message"]))
+                else:
+                    future.set_result(data["result"])
+            return
+        if (event := EVENTS.get(data["method"])) is None:
+            return
+        for param in data["params"]:
+            gid = param["gid"]
+            if event in FINAL.values():
+                self.__settle(gid, event)
+            for callback in self.__handlers.get(event, []):
+                callback(gid)
+
+    def __settle(self, gid, event):
+        for future in self.__waiters.pop(gid, []):
+            if not future.done():
+                future.set_result(event)
+
+    async def __resync(self):
+        # Events sent while the socket was down are lost, ask for the gids
+        # still waited on instead
+        gids = list(self.__waiters)
+        try:
+            results = await self.multicall(
+                [("aria2.tellStatus", [gid, ["status"]]) for gid in gids]
+            )
+        except Exception as e:
+            LOGGER.error(f"{e}: Aria2c, while resyncing downloads")
+            return
+        for gid, result in zip(gids, results):
+            if isinstance(result, dict):
+                self.__settle(gid, "stop")
+            elif event := FINAL.get(result[0]["status"]):
+                self.__settle(gid, event)
+
+    async def call(self, method, *params):
+        self.start()
+        await wait_for(self.__connected.wait(), CALL_TIMEOUT)
+        id_ = str(next(self.__ids))
+        future = self.__calls[id_] = bot_loop.create_future()
+        try:
+            await self.__ws.send_json(
+                {"jsonrpc": "2.0", "id": id_, "method": method, "params": params}
+            )
+            return await wait_for(future, CALL_TIMEOUT)
+        finally:
+            self.__calls.pop(id_, None)
+
+    async def multicall(self, calls):
+        # One round trip for all of them, each result is [value] or a fault dict
+        return await self.call(
+            "system.multicall",
+            [{"methodName": method, "params": params} for method, params in calls],
+        )
+
+    async def get_download(self, gid):
+        # Status and options in one round trip, aria2p would fetch the options
+        # with a blocking call the first time they are read
+        status, options = await self.multicall(
+            [("aria2.tellStatus", [gid]), ("aria2.getOption", [gid])]
+        )
+        if isinstance(status, dict):
+            raise Aria2RPCError(status["faultString"])
+        download = Download(aria2, status[0])
+        if isinstance(options, list):
+            download._options = Options(aria2, options[0], download)
+        return download
+
+    async def wait(self, gid):
+        # Resolves with "complete", "error" or "stop" once aria2 is done with gid
+        future = bot_loop.create_future()
+        self.__waiters.setdefault(gid, []).append(future)
+        try:
+            # The event may have come before the waiter was registered
+            status = await self.call("aria2.tellStatus", gid, ["status"])
+            if event := FINAL.get(status["status"]):
+                self.__settle(gid, event)
+            return await future
+        finally:
+            if future in (waiters := self.__waiters.get(gid, [])):
+                waiters.remove(future)
+                if not waiters:
+                    del self.__waiters[gid]
+
+
+aria2_rpc = Aria2RPC()
@@ -6,10 +6,11 @@ from os import path as ospath
 from pkg_resources import get_distribution, DistributionNotFound
 from aiofiles import open as aiopen
 from aiofiles.os import remove as aioremove, path as aiopath, mkdir
-from re import match as re_match
+from re import match as re_match, findall as re_findall
 from time import time
 from html import escape
 from uuid import uuid4
+from weakref import WeakKeyDictionary
 from subprocess import run as srun
 from psutil import (
     disk_usage,
@@ -32,7 +33,6 @@ from asyncio import (
 )
 from asyncio.subprocess import PIPE
 from functools import partial, wraps
-from concurrent.futures import ThreadPoolExecutor
 
 from aiohttp import ClientSession as aioClientSession
 from psutil import virtual_memory, cpu_percent, disk_usage
@@ -61,19 +61,25 @@ from bot import (
     bot_loop,
     extra_buttons,
     user,
+    queued_dl,
+    queued_up,
 )
+from bot.helper.ext_utils.task_scheduler import queue_positions
+from bot.helper.ext_utils.admission import admission
+from bot.helper.ext_utils.executors import executors
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.chat_cache import chat_cache
 from bot.helper.ext_utils.telegraph_helper import telegraph
 from bot.helper.ext_utils.shortners import short_url
 
-THREADPOOL = ThreadPoolExecutor(max_workers=1000)
 MAGNET_REGEX = r"magnet:\?xt=urn:(btih|btmh):[a-zA-Z0-9]*\s*"
 URL_REGEX = r"^(?!\/)(rtmps?:\/\/|mms:\/\/|rtsp:\/\/|https?:\/\/|ftp:\/\/)?([^\/:]+:[^\/@]+@)?(www\.)?(?=[^\/:\s]+\.[^\/:\s]+)([^\/:\s]+\.[^\/:\s]+)(:\d+)?(\/[^#\s]*[\s\S]*)?(\?[^#\s]*)?(#.*)?$"
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB", "EB"]
 STATUS_START = 0
 PAGES = 1
 PAGE_NO = 1
+STATUS_FRAGMENTS = WeakKeyDictionary()
 
 
 class MirrorStatus:
@@ -82,6 +88,7 @@ class MirrorStatus:
     STATUS_CLONING = "Clone"
     STATUS_QUEUEDL = "QueueDL"
     STATUS_QUEUEUP = "QueueUp"
+    STATUS_QUEUEPP = "QueuePP"
     STATUS_PAUSED = "Pause"
     STATUS_ARCHIVING = "Archive"
     STATUS_EXTRACTING = "Extract"
@@ -120,15 +127,14 @@ def get_readable_file_size(size_in_bytes):
 
 async def getDownloadByGid(gid):
     async with download_dict_lock:
-        return next((dl for dl in download_dict.values() if dl.gid() == gid), None)
+        return download_dict.by_gid(gid)
 
 
 async def getAllDownload(req_status, user_id=None):
     dls = []
     async with download_dict_lock:
-        for dl in list(download_dict.values()):
-            if user_id and user_id != dl.message.from_user.id:
-                continue
+        tasks = download_dict.by_user(user_id) if user_id else download_dict.values()
+        for dl in list(tasks):
             status = dl.status()
             if req_status in ["all", status]:
                 dls.append(dl)
@@ -136,8 +142,8 @@ async def getAllDownload(req_status, user_id=None):
 
 
 async def get_user_tasks(user_id, maxtask):
-    if tasks := await getAllDownload("all", user_id):
-        return len(tasks) >= maxtask
+    async with download_dict_lock:
+        return len(download_dict.by_user(user_id)) >= maxtask
 
 
 def bt_selection_buttons(id_):
@@ -254,12 +260,38 @@ class EngineStatus:
         self.STATUS_RCLONE = f"RClone {version_cache['rclone']}"
 
 
+def owner_status_lines(download, engine, gid):
+    lines = [
+        ("USER", {"User": download.message.from_user.mention(style="html")}),
+        ("ID", {"Id": download.message.from_user.id}),
+    ]
+    if engine.startswith("qBit"):
+        lines.append(("BTSEL", {"Btsel": f"/{BotCommands.BtSelectCommand}_{gid}"}))
+    lines.append(("CANCEL", {"Cancel": f"/{BotCommands.CancelMirror}_{gid}"}))
+    return lines
+
+
+def render_status_lines(lines):
+    return "".join(BotTheme(var_name, **values) for var_name, values in lines)
+
+
+def render_owner_lines(download, engine, gid):
+    # The owner lines only change with the gid, so each status object keeps
+    # its rendered text until then. Progress lines change on every tick
+    key = (config_dict["BOT_THEME"], engine.startswith("qBit"), gid)
+    if (cached := STATUS_FRAGMENTS.get(download)) is None or cached[0] != key:
+        text = render_status_lines(owner_status_lines(download, engine, gid))
+        cached = STATUS_FRAGMENTS[download] = (key, text)
+    return cached[1]
+
+
 def get_readable_message():
     msg = ""
     button = None
     STATUS_LIMIT = config_dict["STATUS_LIMIT"]
     tasks = len(download_dict)
     globals()["PAGES"] = (tasks + STATUS_LIMIT - 1) // STATUS_LIMIT
+    positions = queue_positions()
     if PAGE_NO > PAGES and PAGES != 0:
         globals()["STATUS_START"] = STATUS_LIMIT * (PAGES - 1)
         globals()["PAGE_NO"] = PAGES
@@ -273,97 +305,106 @@ def get_readable_message():
             else ""
         )
         elapsed = time() - download.message.date.timestamp()
-        msg += BotTheme(
-            "STATUS_NAME",
-            Name=(
-                "Task is being Processed!"
-                if config_dict["SAFE_MODE"]
-                and elapsed >= config_dict["STATUS_UPDATE_INTERVAL"]
-                else escape(f"{download.name()}")
-            ),
-        )
-        if download.status() not in [
+        status = download.status()
+        engine = download.eng()
+        gid = download.gid()
+        lines = [
+            (
+                "STATUS_NAME",
+                {
+                    "Name": (
+                        "Task is being Processed!"
+                        if config_dict["SAFE_MODE"]
+                        and elapsed >= config_dict["STATUS_UPDATE_INTERVAL"]
+                        else escape(f"{download.name()}")
+                    )
+                },
+            )
+        ]
+        if status not in [
             MirrorStatus.STATUS_SPLITTING,
             MirrorStatus.STATUS_SEEDING,
             MirrorStatus.STATUS_METADATA,
         ]:
-            msg += BotTheme(
-                "BAR",
-                Bar=f"{get_progress_bar_string(download.progress())} {download.progress()}",
-            )
-            msg += BotTheme(
-                "PROCESSED",
-                Processed=f"{download.processed_bytes()} of {download.size()}",
-            )
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("ETA", Eta=download.eta())
-            msg += BotTheme("SPEED", Speed=download.speed())
-            msg += BotTheme("ELAPSED", Elapsed=get_readable_time(elapsed))
-            msg += BotTheme("ENGINE", Engine=download.eng())
-            msg += BotTheme("STA_MODE", Mode=download.upload_details["mode"])
+            progress = download.progress()
+            lines += [
+                ("BAR", {"Bar": f"{get_progress_bar_string(progress)} {progress}"}),
+                (
+                    "PROCESSED",
+                    {"Processed": f"{download.processed_bytes()} of {download.size()}"},
+                ),
+                ("STATUS", {"Status": status, "Url": msg_link}),
+                ("ETA", {"Eta": download.eta()}),
+                ("SPEED", {"Speed": download.speed()}),
+                ("ELAPSED", {"Elapsed": get_readable_time(elapsed)}),
+                ("ENGINE", {"Engine": engine}),
+                ("STA_MODE", {"Mode": download.upload_details["mode"]}),
+            ]
+            if status in [
+                MirrorStatus.STATUS_QUEUEDL,
+                MirrorStatus.STATUS_QUEUEUP,
+            ] and (position := positions.get(download.message.id)):
+                lines += [
+                    (
+                        "QUEUE_POS",
+                        {
+                            "Pos": position[0],
+                            "Total": position[1],
+                            "Policy": config_dict["QUEUE_SCHEDULER"],
+                        },
+                    ),
+                    (
+                        "QUEUE_REASON",
+                        {"Reason": admission.why_queued(download.message.id)},
+                    ),
+                ]
+            elif status == MirrorStatus.STATUS_QUEUEPP:
+                lines.append(
+                    (
+                        "QUEUE_REASON",
+                        {"Reason": "Waiting for a free post-processing slot"},
+                    )
+                )
             if hasattr(download, "seeders_num"):
                 try:
-                    msg += BotTheme("SEEDERS", Seeders=download.seeders_num())
-                    msg += BotTheme("LEECHERS", Leechers=download.leechers_num())
+                    lines += [
+                        ("SEEDERS", {"Seeders": download.seeders_num()}),
+                        ("LEECHERS", {"Leechers": download.leechers_num()}),
+                    ]
                 except Exception:
                     pass
-        elif download.status() == MirrorStatus.STATUS_SEEDING:
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("SEED_SIZE", Size=download.size())
-            msg += BotTheme("SEED_SPEED", Speed=download.upload_speed())
-            msg += BotTheme("UPLOADED", Upload=download.uploaded_bytes())
-            msg += BotTheme("RATIO", Ratio=download.ratio())
-            msg += BotTheme("TIME", Time=download.seeding_time())
-            msg += BotTheme("SEED_ENGINE", Engine=download.eng())
+        elif status == MirrorStatus.STATUS_SEEDING:
+            lines += [
+                ("STATUS", {"Status": status, "Url": msg_link}),
+                ("SEED_SIZE", {"Size": download.size()}),
+                ("SEED_SPEED", {"Speed": download.upload_speed()}),
+                ("UPLOADED", {"Upload": download.uploaded_bytes()}),
+                ("RATIO", {"Ratio": download.ratio()}),
+                ("TIME", {"Time": download.seeding_time()}),
+                ("SEED_ENGINE", {"Engine": engine}),
+            ]
         else:
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("STATUS_SIZE", Size=download.size())
-            msg += BotTheme("NON_ENGINE", Engine=download.eng())
-
-        msg += BotTheme("USER", User=download.message.from_user.mention(style="html"))
-        msg += BotTheme("ID", Id=download.message.from_user.id)
-        if (download.eng()).startswith("qBit"):
-            msg += BotTheme(
-                "BTSEL", Btsel=f"/{BotCommands.BtSelectCommand}_{download.gid()}"
-            )
-        msg += BotTheme(
-            "CANCEL", Cancel=f"/{BotCommands.CancelMirror}_{download.gid()}"
-        )
+            lines += [
+                ("STATUS", {"Status": status, "Url": msg_link}),
+                ("STATUS_SIZE", {"Size": download.size()}),
+                ("NON_ENGINE", {"Engine": engine}),
+            ]
+        msg += render_status_lines(lines)
+        msg += render_owner_lines(download, engine, gid)
 
     if len(msg) == 0:
         return None, None
 
-    dl_speed = 0
-
-    def convert_speed_to_bytes_per_second(spd):
-        if "K" in spd:
-            return float(spd.split("K")[0]) * 1024
-        elif "M" in spd:
-            return float(spd.split("M")[0]) * 1048576
-        elif "G" in spd:
-            return float(spd.split("G")[0]) * 1073741824
-        elif "T" in spd:
-            return float(spd.split("T")[0]) * 1099511627776
-        else:
-            return 0
-
     dl_speed = 0
     up_speed = 0
     for download in download_dict.values():
         tstatus = download.status()
-        spd = (
-            download.speed()
-            if tstatus != MirrorStatus.STATUS_SEEDING
-            else download.upload_speed()
-        )
-        speed_in_bytes_per_second = convert_speed_to_bytes_per_second(spd)
         if tstatus == MirrorStatus.STATUS_DOWNLOADING:
-            dl_speed += speed_in_bytes_per_second
-        elif tstatus in [
-            MirrorStatus.STATUS_UPLOADING,
-            MirrorStatus.STATUS_SEEDING,
-        ]:
-            up_speed += speed_in_bytes_per_second
+            dl_speed += download.speed_raw()
+        elif tstatus == MirrorStatus.STATUS_UPLOADING:
+            up_speed += download.speed_raw()
+        elif tstatus == MirrorStatus.STATUS_SEEDING:
+            up_speed += download.upload_speed_raw()
 
     msg += BotTheme("FOOTER")
     buttons = ButtonMaker()
@@ -391,6 +432,8 @@ def get_readable_message():
     )
     msg += BotTheme("Ram", ram=virtual_memory().percent)
     msg += BotTheme("uptime", uptime=get_readable_time(time() - botStartTime))
+    if queued_dl or queued_up:
+        msg += BotTheme("QUEUED", Qdl=len(queued_dl), Qup=len(queued_up))
     msg += BotTheme("DL", DL=get_readable_file_size(dl_speed))
     msg += BotTheme("UL", UL=get_readable_file_size(up_speed))
     return msg, button
@@ -426,6 +469,22 @@ def get_readable_time(seconds):
     return result
 
 
+def get_size_bytes(size):
+    # Sizes and speeds as tools print them: "1.5 GiB", "10.2MiB/s", "512 B"
+    if match := re_match(r"\s*([\d.]+)\s*([kKMGTP]?)", size):
+        value, unit = match.groups()
+        return float(value) * 1024 ** " KMGTP".index(unit.upper() or " ")
+    return 0
+
+
+def get_time_seconds(eta):
+    # Inverse of get_readable_time, also takes weeks ("1w2d3h4m5s")
+    periods = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+    if parts := re_findall(r"(\d+)([wdhms])", eta):
+        return sum(int(value) * periods[period] for value, period in parts)
+    return None
+
+
 def is_magnet(url):
     return bool(re_match(MAGNET_REGEX, url))
 
@@ -548,6 +607,8 @@ def update_user_ldata(id_, key=None, value=None):
         return
     user_data.setdefault(id_, {})
     user_data[id_][key] = value
+    if key == "is_auth":
+        chat_cache.auth_changed()
 
 
 async def download_image_url(url):
@@ -587,9 +648,9 @@ def new_task(func):
     return wrapper
 
 
-async def sync_to_async(func, *args, wait=True, **kwargs):
+async def sync_to_async(func, *args, wait=True, pool="default", **kwargs):
     pfunc = partial(func, *args, **kwargs)
-    future = bot_loop.run_in_executor(THREADPOOL, pfunc)
+    future = bot_loop.run_in_executor(executors.get(pool), pfunc)
     return await future if wait else future
 
 
@@ -241,6 +241,37 @@ class DbManger:
         self.__conn.close
         return notifier_dict  # return a dict ==> {cid: {tag: [{_id: source}, {_id, source}, ...]}}
 
+    async def update_journal(self, uid, data):
+        if self.__err:
+            return
+        await self.__db.journal[bot_id].update_one(
+            {"_id": uid}, {"$set": data}, upsert=True
+        )
+        self.__conn.close
+
+    async def add_journal_upload(self, uid, path, link, name):
+        if self.__err:
+            return
+        await self.__db.journal[bot_id].update_one(
+            {"_id": uid},
+            {"$push": {"uploaded": {"path": path, "link": link, "name": name}}},
+        )
+        self.__conn.close
+
+    async def rm_journal(self, uid):
+        if self.__err:
+            return
+        await self.__db.journal[bot_id].delete_one({"_id": uid})
+        self.__conn.close
+
+    async def get_journals(self):
+        if self.__err:
+            return []
+        # return a list ==> [{_id, cid, stage, name, dl_path, up_path, newDir, opts, uploaded}, ...]
+        journals = [row async for row in self.__db.journal[bot_id].find({})]
+        self.__conn.close
+        return journals
+
     async def trunc_table(self, name):
         if self.__err:
             return
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+from time import time
+from asyncio import sleep
+
+from aria2p import Download
+
+from bot import aria2, get_client, download_dict, QbTorrents, LOGGER, bot_loop
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.aria2_rpc import aria2_rpc
+
+SNAPSHOT_INTERVAL = 2
+SNAPSHOT_TTL = 10
+
+
+class EngineSnapshot:
+    # Refresh builds new dicts and swaps the references, readers never take a lock
+    def __init__(self):
+        self.aria2 = {}
+        self.qbit = {}
+        self.aria2_time = 0
+        self.qbit_time = 0
+        self.__client = None
+        self.__task = None
+
+    async def __refresh_aria2(self):
+        results = await aria2_rpc.multicall(
+            [
+                ("aria2.tellActive", []),
+                ("aria2.tellWaiting", [0, 1000]),
+                ("aria2.tellStopped", [0, 1000]),
+            ]
+        )
+        downloads = {}
+        for result in results:
+            for struct in result[0]:
+                downloads[struct["gid"]] = Download(aria2, struct)
+        self.aria2 = downloads
+        self.aria2_time = time()
+
+    def __refresh_qbit(self):
+        if self.__client is None:
+            self.__client = get_client()
+        self.qbit = {tor.tags: tor for tor in self.__client.torrents_info()}
+        self.qbit_time = time()
+
+    async def refresh(self):
+        try:
+            await self.__refresh_aria2()
+        except Exception as e:
+            LOGGER.error(f"{e}: Aria2c, while taking engine snapshot")
+        if QbTorrents:
+            try:
+                await sync_to_async(self.__refresh_qbit, pool="rpc")
+            except Exception as e:
+                LOGGER.error(f"{e}: Qbittorrent, while taking engine snapshot")
+                self.__client = None
+
+    def aria2_fresh(self):
+        return time() - self.aria2_time <= SNAPSHOT_TTL
+
+    def get_aria2(self, gid):
+        if not self.aria2_fresh():
+            return None
+        return self.aria2.get(gid)
+
+    def get_qbit(self, tag):
+        if time() - self.qbit_time > SNAPSHOT_TTL:
+            return None
+        return self.qbit.get(tag)
+
+    async def __poller(self):
+        while True:
+            if download_dict:
+                await self.refresh()
+            await sleep(SNAPSHOT_INTERVAL)
+
+    def start(self):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__poller())
+
+
+engine_snapshot = EngineSnapshot()
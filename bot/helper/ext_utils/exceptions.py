@@ -20,3 +20,9 @@ class TgLinkException(Exception):
     """No Access granted for this chat"""
 
     pass
+
+
+class Aria2RPCError(Exception):
+    """Aria2c answered a call with an error or the connection was lost"""
+
+    pass
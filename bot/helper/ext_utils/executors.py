@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+from time import time
+from functools import partial
+from threading import Lock
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from bot import config_dict, LOGGER
+
+DEFAULT_POOLS = {
+    "rpc": 32,
+    "drive": 16,
+    "scrape": 16,
+    "fs": 8,
+    "render": 2,
+    "download": 100,
+    "upload": 100,
+    "default": 16,
+}
+
+
+class BoundedExecutor(Executor):
+    # Counts what ThreadPoolExecutor keeps to itself: how many calls wait for a
+    # worker and for how long
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.wait_time = 0
+        self.max_wait = 0
+        self.__lock = Lock()
+        self.__pool = ThreadPoolExecutor(workers, thread_name_prefix=name)
+        self.__old_pools = []
+
+    def __run(self, fn, submitted):
+        waited = time() - submitted
+        with self.__lock:
+            self.queued -= 1
+            self.active += 1
+            self.wait_time += waited
+            self.max_wait = max(self.max_wait, waited)
+        try:
+            return fn()
+        finally:
+            with self.__lock:
+                self.active -= 1
+                self.completed += 1
+
+    def submit(self, fn, *args, **kwargs):
+        if args or kwargs:
+            fn = partial(fn, *args, **kwargs)
+        with self.__lock:
+            self.queued += 1
+        return self.__pool.submit(self.__run, fn, time())
+
+    def resize(self, workers):
+        if workers == self.workers:
+            return
+        # Workers of the old pool finish what they already picked up and exit
+        old, self.__pool = self.__pool, ThreadPoolExecutor(
+            workers, thread_name_prefix=self.name
+        )
+        self.workers = workers
+        old.shutdown(wait=False)
+        self.__old_pools.append(old)
+
+    def threads(self):
+        threads = list(self.__pool._threads)
+        self.__old_pools = [
+            pool
+            for pool in self.__old_pools
+            if any(thread.is_alive() for thread in list(pool._threads))
+        ]
+        for pool in self.__old_pools:
+            threads.extend(t for t in list(pool._threads) if t.is_alive())
+        return threads
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.__pool.shutdown(wait, cancel_futures=cancel_futures)
+
+
+class Executors:
+    def __init__(self):
+        self.pools = {
+            name: BoundedExecutor(name, workers)
+            for name, workers in self.sizes().items()
+        }
+
+    @staticmethod
+    def sizes():
+        sizes = dict(DEFAULT_POOLS)
+        for item in config_dict["THREAD_POOLS"].split("|"):
+            name, _, value = item.strip().partition(":")
+            if not name:
+                continue
+            if name not in sizes or not value.isdigit() or int(value) < 1:
+                LOGGER.error(f"Invalid THREAD_POOLS value: {item}")
+                continue
+            sizes[name] = int(value)
+        return sizes
+
+    def configure(self):
+        for name, workers in self.sizes().items():
+            self.pools[name].resize(workers)
+
+    def get(self, name):
+        return self.pools[name]
+
+
+executors = Executors()
@@ -2,7 +2,6 @@
 from os import walk, path as ospath
 from aiofiles.os import remove as aioremove, path as aiopath, listdir, rmdir, makedirs
 from aioshutil import rmtree as aiormtree, move
-from asyncio import create_subprocess_exec
 from asyncio.subprocess import PIPE
 from shutil import rmtree, disk_usage
 from magic import Magic
@@ -12,8 +11,19 @@ from sys import exit as sexit
 from bot import bot_cache
 
 from .exceptions import NotSupportedExtractionArchive
-from bot import aria2, LOGGER, DOWNLOAD_DIR, get_client, GLOBAL_EXTENSION_FILTER
+from bot import (
+    aria2,
+    LOGGER,
+    DOWNLOAD_DIR,
+    DATABASE_URL,
+    config_dict,
+    get_client,
+    GLOBAL_EXTENSION_FILTER,
+)
 from bot.helper.ext_utils.bot_utils import sync_to_async, cmd_exec
+from bot.helper.ext_utils.postprocess import postprocess
+from bot.helper.ext_utils.db_handler import DbManger
+from bot.helper.ext_utils.storage_ledger import reserved_storage
 
 ARCH_EXT = [
     ".tar.bz2",
@@ -98,14 +108,28 @@ async def clean_download(path):
 
 async def start_cleanup():
     get_client().torrents_delete(torrent_hashes="all")
-    try:
-        await aiormtree(DOWNLOAD_DIR)
-    except Exception:
-        pass
+    if config_dict["RESUME_TASKS"] and DATABASE_URL:
+        keep = []
+        for journal in await DbManger().get_journals():
+            keep.extend([f"{journal['_id']}", f"{journal['_id']}10000"])
+        if await aiopath.isdir(DOWNLOAD_DIR):
+            for item in await listdir(DOWNLOAD_DIR):
+                if item not in keep:
+                    await clean_target(f"{DOWNLOAD_DIR}{item}")
+    else:
+        try:
+            await aiormtree(DOWNLOAD_DIR)
+        except Exception:
+            pass
     await makedirs(DOWNLOAD_DIR, exist_ok=True)
 
 
 def clean_all():
+    bot_cache["stopping"] = True
+    if config_dict["RESUME_TASKS"] and DATABASE_URL:
+        aria2.remove(aria2.get_downloads(), force=True, clean=False)
+        get_client().torrents_delete(torrent_hashes="all")
+        return
     aria2.remove_all(True)
     get_client().torrents_delete(torrent_hashes="all")
     try:
@@ -127,7 +151,7 @@ def exit_clean_up(signal, frame):
 
 async def clean_unwanted(path):
     LOGGER.info(f"Cleaning unwanted files/folders: {path}")
-    for dirpath, _, files in await sync_to_async(walk, path, topdown=False):
+    for dirpath, _, files in await sync_to_async(walk, path, topdown=False, pool="fs"):
         for filee in files:
             if (
                 filee.endswith(".!qB")
@@ -137,7 +161,7 @@ async def clean_unwanted(path):
                 await aioremove(ospath.join(dirpath, filee))
         if dirpath.endswith((".unwanted", "splited_files_mltb", "copied_mltb")):
             await aiormtree(dirpath)
-    for dirpath, _, files in await sync_to_async(walk, path, topdown=False):
+    for dirpath, _, files in await sync_to_async(walk, path, topdown=False, pool="fs"):
         if not await listdir(dirpath):
             await rmdir(dirpath)
 
@@ -146,7 +170,7 @@ async def get_path_size(path):
     if await aiopath.isfile(path):
         return await aiopath.getsize(path)
     total_size = 0
-    for root, dirs, files in await sync_to_async(walk, path):
+    for root, dirs, files in await sync_to_async(walk, path, pool="fs"):
         for f in files:
             abs_path = ospath.join(root, f)
             total_size += await aiopath.getsize(abs_path)
@@ -156,7 +180,7 @@ async def get_path_size(path):
 async def count_files_and_folders(path):
     total_files = 0
     total_folders = 0
-    for _, dirs, files in await sync_to_async(walk, path):
+    for _, dirs, files in await sync_to_async(walk, path, pool="fs"):
         total_files += len(files)
         for f in files:
             if f.endswith(tuple(GLOBAL_EXTENSION_FILTER)):
@@ -181,7 +205,7 @@ def get_mime_type(file_path):
 
 
 def check_storage_threshold(size, threshold, arch=False, alloc=False):
-    free = disk_usage(DOWNLOAD_DIR).free
+    free = disk_usage(DOWNLOAD_DIR).free - reserved_storage()
     if not alloc:
         if (
             not arch
@@ -204,7 +228,7 @@ async def join_files(path):
     for file_ in files:
         if (
             re_search(r"\.0+2$", file_)
-            and await sync_to_async(get_mime_type, f"{path}/{file_}")
+            and await sync_to_async(get_mime_type, f"{path}/{file_}", pool="fs")
             == "application/octet-stream"
         ):
             final_name = file_.rsplit(".", 1)[0]
@@ -283,8 +307,11 @@ async def edit_metadata(
         "-y",
     ]
 
-    listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-    code = await listener.suproc.wait()
+    async with postprocess.slot("metadata", listener):
+        if listener.suproc == "cancelled":
+            return
+        listener.suproc = await postprocess.spawn("metadata", *cmd, stderr=PIPE)
+        code = await listener.suproc.wait()
 
     if code == 0:
         listener.seed = False
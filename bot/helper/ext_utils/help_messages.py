@@ -393,7 +393,8 @@ help_string = [
 <b>Maintainance:</b>
 ┠ /{BotCommands.RestartCommand[0]} or /{BotCommands.RestartCommand[1]}: Restart and Update the Bot (Only Owner & Sudo).
 ┠ /{BotCommands.RestartCommand[2]}: Restart and Update all Bots (Only Owner & Sudo).
-┖ /{BotCommands.LogCommand}: Get a log file of the bot. Handy for getting crash reports (Only Owner & Sudo).
+┠ /{BotCommands.LogCommand}: Get a log file of the bot. Handy for getting crash reports (Only Owner & Sudo).
+┖ /{BotCommands.ProfileCommand} [seconds]: Sample the bot for a while and get a flamegraph file (Only Owner & Sudo).
 
 <b>Executors:</b>
 ┠ /{BotCommands.ShellCommand}: Run shell commands (Only Owner).
@@ -444,7 +445,7 @@ default_desp = {
     "BASE_URL_PORT": "Which is the BASE_URL Port. Default is 80. Int",
     "BLACKLIST_USERS": "Restrict User from Using the Bot. It will Display a BlackListed Msg. USER_ID separated by space. Str",
     "BOT_MAX_TASKS": "Maximum number of Task Bot will Run parallel. (Queue Tasks Included). Int",
-    "STORAGE_THRESHOLD": "To leave specific storage free and any download will lead to leave free storage less than this value will be cancelled the default unit is GB. Int",
+    "STORAGE_THRESHOLD": "To leave specific storage free and any download will lead to leave free storage less than this value will be cancelled the default unit is GB. Queued downloads also wait until free storage is above it. Int",
     "LEECH_LIMIT": "To limit the Torrent/Direct/ytdlp leech size. the default unit is GB. Int",
     "CLONE_LIMIT": "To limit the size of Google Drive folder/file which you can clone. the default unit is GB. Int",
     "MEGA_LIMIT": "To limit the size of Mega download. the default unit is GB. Int",
@@ -486,9 +487,11 @@ default_desp = {
     "LEECH_LOG_ID": "Chat ID to where leeched files would be uploaded. Int. NOTE: Only available for superGroup/channel. Add -100 before channel/superGroup id. In short don't add bot id or your id!",
     "MIRROR_LOG_ID": "Chat ID to where Mirror files would be Send. Int. NOTE: Only available for superGroup/channel. Add -100 before channel/superGroup id. In short don't add bot id or your id!. For Multiple id Separate them by space.",
     "EQUAL_SPLITS": "Split files larger than LEECH_SPLIT_SIZE into equal parts size (Not working with zip cmd). Default is False.",
+    "PIPELINE_UPLOAD": "Leech files of a torrent or direct folder as soon as each one is downloaded instead of waiting for the whole task. Only for leech without zip, extract, join or metadata. Default is False.",
     "EXTENSION_FILTER": "File extensions that won't upload/clone. Separate them by space.",
     "GDRIVE_ID": "This is the Folder/TeamDrive ID of the Google Drive OR root to which you want to upload all the mirrors using google-api-python-client.",
     "INCOMPLETE_TASK_NOTIFIER": "Get incomplete task messages after restart. Require database and superGroup. Default is False",
+    "RESUME_TASKS": "Journal task stages in database and resume them from the last finished stage after restart. Require database. Default is False",
     "INDEX_URL": "Refer to https://gitlab.com/ParveenBhadooOfficial/Google-Drive-Index.",
     "IS_TEAM_DRIVE": "Set True if uploading to TeamDrive using google-api-python-client. Default is False",
     "SHOW_MEDIAINFO": "Add Button to Show MediaInfo in Leeched file. Bool",
@@ -510,6 +513,17 @@ default_desp = {
     "QUEUE_ALL": "Number of parallel tasks of downloads and uploads. For example if 20 task added and QUEUE_ALL is 8, then the summation of uploading and downloading tasks are 8 and the rest in queue. Int. NOTE: if you want to fill QUEUE_DOWNLOAD or QUEUE_UPLOAD, then QUEUE_ALL value must be greater than or equal to the greatest one and less than or equal to summation of QUEUE_UPLOAD and QUEUE_DOWNLOAD",
     "QUEUE_DOWNLOAD": "Number of all parallel downloading tasks. Int",
     "QUEUE_UPLOAD": "Number of all parallel uploading tasks. Int",
+    "QUEUE_SCHEDULER": "Order in which queued tasks are started. fair: sudo/owner first, then round the users with smaller tasks first. fifo: order of adding. Default is fair",
+    "ADMISSION_MAX_LOAD": "Don't start queued tasks while the 1 minute load average per CPU core is above this. Float",
+    "ADMISSION_MAX_DL": "Don't start queued downloads while the server is already receiving this many MB/s. Int",
+    "ADMISSION_MAX_UP": "Don't start queued uploads while the server is already sending this many MB/s. Int",
+    "POSTPROCESS_SLOTS": "Number of extract, zip, metadata, split and screenshot processes that can run at the same time, the rest wait in queue. Int",
+    "LOOP_LAG_THRESHOLD": "Log the stack of whatever blocks the bot for longer than this many seconds. Float",
+    "THREAD_POOLS": "Worker threads of each pool blocking calls run in. Format pool:threads separated by |, pools are rpc (aria2/qbittorrent/mega), drive, scrape (direct links/yt-dlp info), fs, render (status message), download, upload and default. A download waits for its upload, keep both pools large enough. Ex: rpc:64|download:200. Str",
+    "LOG_MAX_SIZE": "Size in MB at which log.txt is rotated, the last 3 rotated logs are kept. Default is 20. Int",
+    "LOG_JSON": "Write log.txt as JSON lines tagged with the task uid and gid. Default is False. Bool",
+    "DIRECT_CONCURRENCY": "Files of a direct link folder (gofile, index, mediafire and terabox folders) downloaded at the same time in each task. Default is 5. Int",
+    "POSTPROCESS_NICE": "CPU nice and IO priority for each post-processing job. Format kind:nice or kind:nice:ionice separated by |, kinds are extract, zip, metadata, split and screenshot. Ex: extract:10|split:15:7. Str",
     "RCLONE_FLAGS": "key:value|key|key|key:value . Check here all RcloneFlags.",
     "RCLONE_PATH": "Default rclone path to which you want to upload all the mirrors using rclone.",
     "RCLONE_SERVE_URL": "Valid URL where the bot is deployed to use rclone serve. Format of URL should be http://myip, where myip is the IP/Domain(public) of your bot or if you have chosen port other than 80 so write it in this format http://myip:port (http and not https)",
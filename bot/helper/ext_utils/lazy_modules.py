@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+from asyncio import Lock
+from inspect import iscoroutine
+from importlib import import_module
+from pyrogram.types import Message
+from pyrogram.filters import command, regex
+from pyrogram.handlers import MessageHandler, CallbackQueryHandler
+
+from bot import bot, LOGGER
+from bot.helper.telegram_helper.bot_commands import BotCommands
+
+
+class LazyModule:
+    # Stands in for a rarely used module until its first command or callback
+    def __init__(self, name, commands, callbacks=None, init=None):
+        self.name = name
+        self.module = None
+        self.__init = init
+        self.__lock = Lock()
+        self.__handlers = []
+        self.__stubs = [MessageHandler(self.__dispatch, filters=command(commands))]
+        if callbacks:
+            self.__stubs.append(
+                CallbackQueryHandler(self.__dispatch, filters=regex(callbacks))
+            )
+
+    def register(self):
+        for stub in self.__stubs:
+            bot.add_handler(stub)
+
+    def __collect(self, add_handler):
+        def collect(handler, group=0):
+            self.__handlers.append(handler)
+            return add_handler(handler, group)
+
+        return collect
+
+    async def load(self):
+        async with self.__lock:
+            if self.module is not None:
+                return self.module
+            # The import stays on the loop thread so no other coroutine can add
+            # a handler while the module's own ones are collected
+            add_handler = bot.add_handler
+            bot.add_handler = self.__collect(add_handler)
+            try:
+                module = import_module(f"bot.modules.{self.name}")
+            finally:
+                bot.add_handler = add_handler
+            for stub in self.__stubs:
+                bot.remove_handler(stub)
+            self.module = module
+            LOGGER.info(f"Loaded {self.name} module on first use")
+            if self.__init:
+                try:
+                    await getattr(module, self.__init)()
+                except Exception as e:
+                    LOGGER.error(f"{self.name}.{self.__init}: {e}")
+            return module
+
+    async def __dispatch(self, client, update):
+        await self.load()
+        # Handlers added now only apply from the next update, this one is
+        # routed by hand
+        kind = MessageHandler if isinstance(update, Message) else CallbackQueryHandler
+        for handler in self.__handlers:
+            if isinstance(handler, kind) and await handler.check(client, update):
+                result = handler.callback(client, update)
+                if iscoroutine(result):
+                    await result
+                return
+
+
+lazy_modules = {
+    module.name: module
+    for module in [
+        LazyModule(
+            "anilist",
+            [
+                BotCommands.AniListCommand,
+                "character",
+                "manga",
+                BotCommands.AnimeHelpCommand,
+            ],
+            r"^(anime|cha)",
+        ),
+        LazyModule("imdb", BotCommands.IMDBCommand, r"^imdb"),
+        LazyModule("mydramalist", BotCommands.MyDramaListCommand, r"^mdl"),
+        LazyModule(
+            "torrent_search",
+            BotCommands.SearchCommand,
+            r"^torser",
+            init="initiate_search_tools",
+        ),
+        LazyModule("gen_pyro_sess", "exportsession"),
+    ]
+}
@@ -21,6 +21,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
 )
 from bot.helper.ext_utils.fs_utils import ARCH_EXT, get_mime_type
+from bot.helper.ext_utils.postprocess import postprocess
 from bot.helper.ext_utils.telegraph_helper import telegraph
 import re
 
@@ -208,7 +209,7 @@ async def get_document_type(path):
         r".+(\.|_)(rar|7z|zip|bin)(\.0*\d+)?$", path
     ):
         return is_video, is_audio, is_image
-    mime_type = await sync_to_async(get_mime_type, path)
+    mime_type = await sync_to_async(get_mime_type, path, pool="fs")
     if mime_type.startswith("audio"):
         return False, True, False
     if mime_type.startswith("image"):
@@ -301,8 +302,9 @@ async def take_ss(video_file, duration=None, total=1, gen_ss=False):
                 "%H:%M:%S", gmtime(float(cmd[5]))
             )
             cmd[-1] = ospath.join(des_dir, f"wz_thumb_{eq_thumb}.jpg")
-            task = await create_subprocess_exec(*cmd, stderr=PIPE)
-            return (task, await task.wait(), eq_thumb)
+            async with postprocess.slot("screenshot"):
+                task = await postprocess.spawn("screenshot", *cmd, stderr=PIPE)
+                return (task, await task.wait(), eq_thumb)
 
     tasks = [extract_ss(eq_thumb) for eq_thumb in range(1, total + 1)]
     status = await gather(*tasks)
@@ -385,14 +387,17 @@ async def split_file(
             if not multi_streams:
                 del cmd[10]
                 del cmd[10]
-            if (
-                listener.suproc == "cancelled"
-                or listener.suproc is not None
-                and listener.suproc.returncode == -9
-            ):
-                return False
-            listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-            code = await listener.suproc.wait()
+            async with postprocess.slot("split", listener):
+                if (
+                    listener.suproc == "cancelled"
+                    or listener.suproc is not None
+                    and listener.suproc.returncode == -9
+                ):
+                    return False
+                listener.suproc = await postprocess.spawn(
+                    "split", *cmd, stderr=PIPE
+                )
+                code = await listener.suproc.wait()
             if code == -9:
                 return False
             elif code != 0:
@@ -456,16 +461,20 @@ async def split_file(
             i += 1
     else:
         out_path = ospath.join(dirpath, f"{file_}.")
-        listener.suproc = await create_subprocess_exec(
-            "split",
-            "--numeric-suffixes=1",
-            "--suffix-length=3",
-            f"--bytes={split_size}",
-            path,
-            out_path,
-            stderr=PIPE,
-        )
-        code = await listener.suproc.wait()
+        async with postprocess.slot("split", listener):
+            if listener.suproc == "cancelled":
+                return False
+            listener.suproc = await postprocess.spawn(
+                "split",
+                "split",
+                "--numeric-suffixes=1",
+                "--suffix-length=3",
+                f"--bytes={split_size}",
+                path,
+                out_path,
+                stderr=PIPE,
+            )
+            code = await listener.suproc.wait()
         if code == -9:
             return False
         elif code != 0:
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+from json import dumps
+from queue import SimpleQueue
+from time import monotonic
+from atexit import register as atexit_register
+from contextvars import ContextVar
+from os import path as ospath
+from aiofiles import open as aiopen
+from logging import Filter, Formatter, StreamHandler, INFO, WARNING, getLogger
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FILE = "log.txt"
+LOG_BACKUPS = 3
+LOG_FORMAT = "[%(asctime)s] [%(levelname)s] - %(message)s"
+LOG_DATEFMT = "%d-%b-%y %I:%M:%S %p"
+REPEAT_WINDOW = 60
+REPEAT_BURST = 5
+
+task_context = ContextVar("task_context", default=None)
+
+
+def log_context(**fields):
+    # Tags every record logged from the current task and the ones it spawns
+    task_context.set({**(task_context.get() or {}), **fields})
+
+
+class TaskContext(Filter):
+    def filter(self, record):
+        record.task = task_context.get()
+        return True
+
+
+class RepeatLimiter(Filter):
+    # A warning logged every tick or every file only goes through REPEAT_BURST
+    # times a window, the next one after it says how many were dropped
+    def __init__(self):
+        super().__init__()
+        self.__sites = {}
+
+    def filter(self, record):
+        if record.levelno != WARNING:
+            return True
+        site = (record.pathname, record.lineno)
+        now = monotonic()
+        start, count, dropped = self.__sites.get(site, (now, 0, 0))
+        if now - start > REPEAT_WINDOW:
+            if dropped:
+                record.msg = f"{record.msg} ({dropped} similar warnings suppressed)"
+            start, count, dropped = now, 0, 0
+        if count >= REPEAT_BURST:
+            self.__sites[site] = (start, count, dropped + 1)
+            return False
+        self.__sites[site] = (start, count + 1, dropped)
+        return True
+
+
+class JsonFormatter(Formatter):
+    def format(self, record):
+        line = {
+            "time": self.formatTime(record, LOG_DATEFMT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if task := getattr(record, "task", None):
+            line.update(task)
+        return dumps(line, ensure_ascii=False)
+
+
+class LogPipeline:
+    # Records are queued by whichever thread logs them and written to disk by
+    # one listener thread, a slow disk never stalls the event loop
+    def __init__(self):
+        self.file_handler = None
+        self.__listener = None
+
+    def start(self, max_size=20):
+        self.file_handler = RotatingFileHandler(
+            LOG_FILE, maxBytes=max_size * 1024**2, backupCount=LOG_BACKUPS
+        )
+        self.file_handler.setFormatter(Formatter(LOG_FORMAT, LOG_DATEFMT))
+        console = StreamHandler()
+        console.setFormatter(Formatter(LOG_FORMAT, LOG_DATEFMT))
+        queue = SimpleQueue()
+        handler = QueueHandler(queue)
+        handler.addFilter(TaskContext())
+        handler.addFilter(RepeatLimiter())
+        root = getLogger()
+        root.handlers.clear()
+        root.addHandler(handler)
+        root.setLevel(INFO)
+        self.__listener = QueueListener(
+            queue, self.file_handler, console, respect_handler_level=True
+        )
+        self.__listener.start()
+        atexit_register(self.stop)
+
+    def configure(self, max_size, json):
+        self.file_handler.maxBytes = max_size * 1024**2
+        self.file_handler.setFormatter(
+            JsonFormatter() if json else Formatter(LOG_FORMAT, LOG_DATEFMT)
+        )
+
+    def stop(self):
+        if self.__listener is not None:
+            self.__listener.stop()
+            self.__listener = None
+
+    @staticmethod
+    def files():
+        # Oldest first, the rotated copies are log.txt.1 (newest) and up
+        rotated = [f"{LOG_FILE}.{i}" for i in range(LOG_BACKUPS, 0, -1)]
+        return [path for path in [*rotated, LOG_FILE] if ospath.exists(path)]
+
+    async def read(self, limit=None):
+        # The tail of the log across rotations, at least limit characters
+        # when that much was written
+        text = ""
+        for path in reversed(self.files()):
+            async with aiopen(path, "r") as f:
+                text = await f.read() + text
+            if limit is not None and len(text) >= limit:
+                break
+        return text
+
+
+log_pipeline = LogPipeline()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+from sys import _current_frames
+from time import monotonic, sleep as tsleep
+from os import path as ospath
+from threading import Thread, get_ident
+from traceback import format_stack
+from asyncio import sleep, current_task
+
+from bot import config_dict, bot_loop, LOGGER
+from bot.helper.ext_utils.executors import executors
+from bot.helper.ext_utils.bot_utils import sync_to_async
+
+BEAT_INTERVAL = 0.1
+WATCH_INTERVAL = 0.05
+PROFILE_INTERVAL = 0.01
+IDLE_FRAMES = {("selectors.py", "select"), ("thread.py", "_worker")}
+
+
+class LoopMonitor:
+    # A heartbeat coroutine ticks on bot_loop and a plain thread watches it, so
+    # the stack of whatever blocks the loop can be read while it is still blocking
+    def __init__(self):
+        self.loop_lag = 0
+        self.max_loop_lag = 0
+        self.profiling = False
+        self.__beat = monotonic()
+        self.__loop_thread = None
+        self.__task = None
+
+    async def __heartbeat(self):
+        self.__loop_thread = get_ident()
+        while True:
+            start = monotonic()
+            self.__beat = start
+            await sleep(BEAT_INTERVAL)
+            self.loop_lag = max(0, monotonic() - start - BEAT_INTERVAL)
+            self.max_loop_lag = max(self.max_loop_lag, self.loop_lag)
+
+    def __loop_stack(self):
+        if (frame := _current_frames().get(self.__loop_thread)) is None:
+            return ""
+        return "".join(format_stack(frame))
+
+    def __blocker(self):
+        try:
+            task = current_task(bot_loop)
+        except RuntimeError:
+            task = None
+        return f"task {task.get_name()}" if task is not None else "a callback"
+
+    def __watchdog(self):
+        while True:
+            tsleep(WATCH_INTERVAL)
+            if not (threshold := config_dict["LOOP_LAG_THRESHOLD"]):
+                continue
+            beat = self.__beat
+            if monotonic() - beat - BEAT_INTERVAL < threshold:
+                continue
+            blocker, stacks = self.__blocker(), {}
+            first = self.__loop_stack()
+            LOGGER.warning(
+                f"Event loop blocked for over {threshold}s by {blocker}:\n{first}"
+            )
+            while self.__beat == beat:
+                if stack := self.__loop_stack():
+                    stacks[stack] = stacks.get(stack, 0) + 1
+                tsleep(WATCH_INTERVAL)
+            blocked = round(self.__beat - beat - BEAT_INTERVAL, 2)
+            stack, count = max(stacks.items(), key=lambda x: x[1], default=(first, 0))
+            if stack == first:
+                LOGGER.warning(f"Event loop was blocked for {blocked}s by {blocker}")
+            else:
+                share = round(count * 100 / sum(stacks.values()))
+                LOGGER.warning(
+                    f"Event loop was blocked for {blocked}s by {blocker}, "
+                    f"{share}% of samples in:\n{stack}"
+                )
+
+    @staticmethod
+    def __fold(frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            name = ospath.basename(code.co_filename)
+            stack.append(f"{code.co_name} ({name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return stack
+
+    def sample(self, seconds):
+        # Collapsed stacks ("root;frame;frame count"), the input format of
+        # flamegraph.pl, speedscope and inferno
+        threads = {self.__loop_thread: "bot_loop"}
+        samples, stacks = 0, {}
+        end = monotonic() + seconds
+        while monotonic() < end:
+            for name, pool in executors.pools.items():
+                for thread in pool.threads():
+                    threads.setdefault(thread.ident, f"pool:{name}")
+            for ident, frame in _current_frames().items():
+                if (root := threads.get(ident)) is None:
+                    continue
+                code = frame.f_code
+                if (ospath.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = self.__fold(frame)
+                stack.append(root)
+                key = ";".join(reversed(stack))
+                stacks[key] = stacks.get(key, 0) + 1
+            samples += 1
+            tsleep(PROFILE_INTERVAL)
+        return samples, "\n".join(
+            f"{stack} {count}"
+            for stack, count in sorted(stacks.items(), key=lambda x: -x[1])
+        )
+
+    async def profile(self, seconds):
+        self.profiling = True
+        try:
+            return await sync_to_async(self.sample, seconds)
+        finally:
+            self.profiling = False
+
+    def start(self):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__heartbeat())
+            Thread(target=self.__watchdog, name="loop_watchdog", daemon=True).start()
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+from json import dump
+from os import replace
+from time import time
+from asyncio import sleep
+
+from bot import config_dict, download_dict, queued_dl, queued_up, bot_loop, LOGGER
+from bot.helper.ext_utils.admission import admission
+from bot.helper.ext_utils.loop_monitor import loop_monitor
+from bot.helper.ext_utils.executors import executors
+from bot.helper.ext_utils.bot_utils import MirrorStatus, sync_to_async
+
+METRICS_FILE = "metrics.json"
+METRICS_INTERVAL = 5
+STAGE_BUCKETS = [10, 30, 60, 300, 600, 1800, 3600, 7200, 21600, 86400]
+
+
+class Metrics:
+    # The bot only updates plain dicts here and dumps them to METRICS_FILE, the
+    # web server renders that file for Prometheus so scraping never reaches the bot
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.__processed = {}
+        self.__task = None
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, stage, seconds):
+        if (hist := self.histograms.get(stage)) is None:
+            hist = {"buckets": [0] * len(STAGE_BUCKETS), "sum": 0, "count": 0}
+            self.histograms[stage] = hist
+        for i, bound in enumerate(STAGE_BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+    def flood_wait(self, seconds):
+        self.inc("telegram_floodwait_total")
+        self.inc("telegram_floodwait_seconds_total", seconds)
+
+    @staticmethod
+    def __task_gauges():
+        tasks, speeds = {}, {}
+        for download in list(download_dict.values()):
+            try:
+                key = (download.eng().split()[0], download.status())
+                if key[1] == MirrorStatus.STATUS_SEEDING:
+                    speed = download.upload_speed_raw()
+                else:
+                    speed = download.speed_raw()
+            except Exception:
+                continue
+            tasks[key] = tasks.get(key, 0) + 1
+            speeds[key] = speeds.get(key, 0) + speed
+        return [
+            ["tasks", {"engine": engine, "stage": stage}, count]
+            for (engine, stage), count in tasks.items()
+        ] + [
+            ["task_bytes_per_second", {"engine": engine, "stage": stage}, speed]
+            for (engine, stage), speed in speeds.items()
+        ]
+
+    @staticmethod
+    def __pool_samples():
+        gauges, counters = [], []
+        for name, pool in executors.pools.items():
+            labels = {"pool": name}
+            gauges += [
+                ["thread_pool_workers", labels, pool.workers],
+                ["thread_pool_active", labels, pool.active],
+                ["thread_pool_queued", labels, pool.queued],
+                ["thread_pool_wait_max_seconds", labels, pool.max_wait],
+            ]
+            pool.max_wait = 0
+            counters += [
+                ["thread_pool_tasks_total", labels, pool.completed],
+                ["thread_pool_wait_seconds_total", labels, pool.wait_time],
+            ]
+        return gauges, counters
+
+    def __count_transfers(self):
+        # Bytes each downloading or uploading task moved since the last sample,
+        # so rate() over the counter follows the engines' actual throughput
+        processed = {}
+        for download in list(download_dict.values()):
+            try:
+                status = download.status()
+                if status == MirrorStatus.STATUS_DOWNLOADING:
+                    direction = "in"
+                elif status in [
+                    MirrorStatus.STATUS_UPLOADING,
+                    MirrorStatus.STATUS_CLONING,
+                ]:
+                    direction = "out"
+                else:
+                    continue
+                done = download.processed_raw() or 0
+                engine = download.eng().split()[0]
+            except Exception:
+                continue
+            processed[download] = done
+            if (delta := done - self.__processed.get(download, 0)) > 0:
+                self.inc(
+                    "transferred_bytes_total", delta, engine=engine, direction=direction
+                )
+        self.__processed = processed
+
+    def write(self):
+        self.__count_transfers()
+        pool_gauges, pool_counters = self.__pool_samples()
+        gauges = self.__task_gauges() + [
+            ["queued_tasks", {"queue": "download"}, len(queued_dl)],
+            ["queued_tasks", {"queue": "upload"}, len(queued_up)],
+            ["network_bytes_per_second", {"direction": "in"}, admission.dl_speed],
+            ["network_bytes_per_second", {"direction": "out"}, admission.up_speed],
+            ["event_loop_lag_seconds", {}, loop_monitor.loop_lag],
+            ["event_loop_lag_max_seconds", {}, loop_monitor.max_loop_lag],
+        ]
+        gauges += pool_gauges
+        loop_monitor.max_loop_lag = 0
+        data = {
+            "time": time(),
+            "counters": [
+                [name, dict(labels), value]
+                for (name, labels), value in list(self.counters.items())
+            ]
+            + pool_counters,
+            "gauges": gauges,
+            "buckets": STAGE_BUCKETS,
+            "histograms": {
+                stage: dict(hist) for stage, hist in list(self.histograms.items())
+            },
+        }
+        with open(f"{METRICS_FILE}.tmp", "w") as f:
+            dump(data, f)
+        replace(f"{METRICS_FILE}.tmp", METRICS_FILE)
+
+    async def __writer(self):
+        while True:
+            await sleep(METRICS_INTERVAL)
+            if not config_dict["BASE_URL"]:
+                continue
+            try:
+                await sync_to_async(self.write, pool="fs")
+            except Exception as e:
+                LOGGER.error(f"{e}: while writing metrics")
+
+    def start(self):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__writer())
+
+
+metrics = Metrics()
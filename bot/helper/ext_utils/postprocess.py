@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+from asyncio import Event, create_subprocess_exec
+from contextlib import asynccontextmanager
+from psutil import Process, IOPRIO_CLASS_BE
+
+from bot import config_dict, download_dict, download_dict_lock, LOGGER
+from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
+
+DEFAULT_NICE = {
+    "extract": 10,
+    "zip": 10,
+    "metadata": 10,
+    "split": 10,
+    "screenshot": 15,
+}
+
+
+class PostProcessPool:
+    # Caps how many 7z/ffmpeg/split processes run at once, jobs get a slot in
+    # the order they asked for one
+    def __init__(self):
+        self.__running = 0
+        self.__waiting = []
+
+    def __has_slot(self):
+        slots = config_dict["POSTPROCESS_SLOTS"]
+        return not slots or self.__running < slots
+
+    def wake(self):
+        while self.__waiting and self.__has_slot():
+            self.__running += 1
+            self.__waiting.pop(0).set()
+
+    @staticmethod
+    def priority(kind):
+        niceness, io_level = DEFAULT_NICE.get(kind, 0), None
+        for item in config_dict["POSTPROCESS_NICE"].split("|"):
+            key, _, value = item.strip().partition(":")
+            if key != kind or not value:
+                continue
+            try:
+                values = [int(x) for x in value.split(":")]
+            except ValueError:
+                LOGGER.error(f"Invalid POSTPROCESS_NICE value: {item}")
+                continue
+            niceness = values[0]
+            io_level = values[1] if len(values) > 1 else None
+        if io_level is None:
+            # Same best-effort level the kernel derives from the CPU nice value
+            io_level = (niceness + 20) // 5
+        return max(-20, min(niceness, 19)), max(0, min(io_level, 7))
+
+    async def spawn(self, kind, *cmd, **kwargs):
+        # Set from here once the child exists, code run between fork and exec
+        # can deadlock on a lock another thread held at fork time
+        proc = await create_subprocess_exec(*cmd, **kwargs)
+        niceness, io_level = self.priority(kind)
+        try:
+            child = Process(proc.pid)
+            child.nice(niceness)
+            child.ionice(IOPRIO_CLASS_BE, io_level)
+        except Exception as e:
+            LOGGER.error(f"{e}: while setting priority of {kind} process")
+        return proc
+
+    @asynccontextmanager
+    async def slot(self, kind, listener=None):
+        if self.__waiting or not self.__has_slot():
+            event = Event()
+            self.__waiting.append(event)
+            status = queue_status = None
+            try:
+                if listener is not None:
+                    async with download_dict_lock:
+                        if (status := download_dict.get(listener.uid)) is not None:
+                            queue_status = QueueStatus(
+                                status.name(),
+                                status.size_raw(),
+                                status.gid(),
+                                listener,
+                                "pp",
+                            )
+                            download_dict[listener.uid] = queue_status
+                            LOGGER.info(f"Added to Queue/{kind}: {status.name()}")
+                await event.wait()
+            except BaseException:
+                # A slot already handed to a cancelled waiter goes to the next
+                if event in self.__waiting:
+                    self.__waiting.remove(event)
+                else:
+                    self.__running -= 1
+                    self.wake()
+                raise
+            finally:
+                if queue_status is not None:
+                    async with download_dict_lock:
+                        if download_dict.get(listener.uid) is queue_status:
+                            download_dict[listener.uid] = status
+            if queue_status is not None:
+                LOGGER.info(f"Start from Queued/{kind}: {status.name()}")
+        else:
+            self.__running += 1
+        try:
+            yield
+        finally:
+            self.__running -= 1
+            self.wake()
+
+
+postprocess = PostProcessPool()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+from time import monotonic, sleep
+
+
+class BootTimer:
+    def __init__(self):
+        self.start = self.__last = monotonic()
+        self.phases = {}
+        self.background = {}
+
+    def mark(self, name):
+        # Phases on the boot thread, each one runs from the previous mark
+        now = monotonic()
+        self.phases[name] = now - self.__last
+        self.__last = now
+
+    def timed(self, name, func, *args):
+        start = monotonic()
+        try:
+            return func(*args)
+        finally:
+            self.background[name] = monotonic() - start
+
+    def summary(self):
+        msg = f"Boot finished in {monotonic() - self.start:.2f}s: "
+        msg += ", ".join(f"{name} {took:.2f}s" for name, took in self.phases.items())
+        if self.background:
+            msg += " | concurrent: "
+            msg += ", ".join(
+                f"{name} {took:.2f}s" for name, took in self.background.items()
+            )
+        return msg
+
+
+def wait_ready(probe, timeout=60, interval=0.1):
+    # Polls until the daemon answers instead of sleeping a fixed time
+    deadline = monotonic() + timeout
+    while True:
+        try:
+            return probe()
+        except Exception as e:
+            if monotonic() > deadline:
+                raise TimeoutError(f"Not ready after {timeout}s: {e}") from e
+            sleep(interval)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+from bot import download_dict, queued_dl
+
+storage_ledger = {}
+
+
+def reserve_storage(uid, size, copies=0, keep=False, present=0):
+    # Stages run one after another and drop their input unless seeding,
+    # so without seeding the peak is a single extra copy of the payload.
+    # present is what the task already has on disk, the payload itself
+    # once its download is done
+    peak = size * (1 + copies) if keep else size * (2 if copies else 1)
+    storage_ledger[uid] = (peak, present)
+
+
+def release_storage(uid):
+    storage_ledger.pop(uid, None)
+
+
+def reserved_storage():
+    # No disk walk, a downloading task has what its status reports and
+    # a later stage is re-reserved at every boundary
+    reserved = 0
+    for uid, (peak, present) in list(storage_ledger.items()):
+        if uid in queued_dl:
+            continue
+        if not present and (task := download_dict.get(uid)) is not None:
+            try:
+                present = task.processed_raw() or 0
+            except Exception:
+                present = 0
+        reserved += max(0, peak - present)
+    return reserved
@@ -16,6 +16,9 @@ from bot import (
 )
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.ext_utils.fs_utils import get_base_name, check_storage_threshold
+from bot.helper.ext_utils.task_scheduler import get_scheduler
+from bot.helper.ext_utils.admission import admission
+from bot.helper.ext_utils.storage_ledger import reserve_storage
 from bot.helper.ext_utils.bot_utils import (
     get_user_tasks,
     getdailytasks,
@@ -48,7 +51,7 @@ async def stop_duplicate_check(name, listener):
             name = None
     if name is not None:
         telegraph_content, contents_no = await sync_to_async(
-            GoogleDriveHelper().drive_list, name, stopDup=True
+            GoogleDriveHelper().drive_list, name, stopDup=True, pool="drive"
         )
         if telegraph_content:
             msg = BotTheme("STOP_DUPLICATE", content=contents_no)
@@ -72,29 +75,44 @@ async def is_queued(uid):
     dl_limit = config_dict["QUEUE_DOWNLOAD"]
     event = None
     added_to_queue = False
-    if all_limit or dl_limit:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (
-                all_limit and dl + up >= all_limit and (not dl_limit or dl >= dl_limit)
-            ) or (dl_limit and dl >= dl_limit):
-                added_to_queue = True
-                event = Event()
-                queued_dl[uid] = event
+    async with queue_dict_lock:
+        dl = len(non_queued_dl)
+        up = len(non_queued_up)
+        if (
+            (all_limit and dl + up >= all_limit and (not dl_limit or dl >= dl_limit))
+            or (dl_limit and dl >= dl_limit)
+            or not admission.admit("dl")
+        ):
+            added_to_queue = True
+            event = Event()
+            queued_dl[uid] = event
+            get_scheduler().refresh(queued_dl, "dl")
     return added_to_queue, event
 
 
 def start_dl_from_queued(uid):
+    get_scheduler().started(uid, "dl")
     queued_dl[uid].set()
     del queued_dl[uid]
 
 
 def start_up_from_queued(uid):
+    get_scheduler().started(uid, "up")
     queued_up[uid].set()
     del queued_up[uid]
 
 
+def queued_order(key):
+    queue = queued_dl if key == "dl" else queued_up
+    scheduler = get_scheduler()
+    scheduler.refresh(queue, key)
+    if not admission.admit(key):
+        return []
+    order = scheduler.order(queue, key)
+    # Start one at a time while throttling so the next sample sees its load
+    return order[:1] if admission.throttled(key) else order
+
+
 async def start_from_queued():
     if all_limit := config_dict["QUEUE_ALL"]:
         dl_limit = config_dict["QUEUE_DOWNLOAD"]
@@ -106,14 +124,14 @@ async def start_from_queued():
             if all_ < all_limit:
                 f_tasks = all_limit - all_
                 if queued_up and (not up_limit or up < up_limit):
-                    for index, uid in enumerate(list(queued_up.keys()), start=1):
+                    for index, uid in enumerate(queued_order("up"), start=1):
                         f_tasks = all_limit - all_
                         start_up_from_queued(uid)
                         f_tasks -= 1
                         if f_tasks == 0 or (up_limit and index >= up_limit - up):
                             break
                 if queued_dl and (not dl_limit or dl < dl_limit) and f_tasks != 0:
-                    for index, uid in enumerate(list(queued_dl.keys()), start=1):
+                    for index, uid in enumerate(queued_order("dl"), start=1):
                         start_dl_from_queued(uid)
                         if (dl_limit and index >= dl_limit - dl) or index == f_tasks:
                             break
@@ -124,14 +142,14 @@ async def start_from_queued():
             up = len(non_queued_up)
             if queued_up and up < up_limit:
                 f_tasks = up_limit - up
-                for index, uid in enumerate(list(queued_up.keys()), start=1):
+                for index, uid in enumerate(queued_order("up"), start=1):
                     start_up_from_queued(uid)
                     if index == f_tasks:
                         break
     else:
         async with queue_dict_lock:
             if queued_up:
-                for uid in list(queued_up.keys()):
+                for uid in queued_order("up"):
                     start_up_from_queued(uid)
 
     if dl_limit := config_dict["QUEUE_DOWNLOAD"]:
@@ -139,14 +157,14 @@ async def start_from_queued():
             dl = len(non_queued_dl)
             if queued_dl and dl < dl_limit:
                 f_tasks = dl_limit - dl
-                for index, uid in enumerate(list(queued_dl.keys()), start=1):
+                for index, uid in enumerate(queued_order("dl"), start=1):
                     start_dl_from_queued(uid)
                     if index == f_tasks:
                         break
     else:
         async with queue_dict_lock:
             if queued_dl:
-                for uid in list(queued_dl.keys()):
+                for uid in queued_order("dl"):
                     start_dl_from_queued(uid)
 
 
@@ -162,6 +180,10 @@ async def limit_checker(
     LOGGER.info("Checking Size Limit of link/file/folder/tasks...")
     user_id = listener.message.from_user.id
     if await CustomFilters.sudo("", listener.message):
+        if not listener.isClone:
+            reserve_storage(
+                listener.uid, size, listener.storage_copies(), listener.seed
+            )
         return
     limit_exceeded = ""
     if listener.isClone:
@@ -210,7 +232,9 @@ async def limit_checker(
         ) and not listener.isClone:
             arch = any([listener.compress, listener.extract])
             limit = STORAGE_THRESHOLD * 1024**3
-            acpt = await sync_to_async(check_storage_threshold, size, limit, arch)
+            acpt = await sync_to_async(
+                check_storage_threshold, size, limit, arch, pool="fs"
+            )
             if not acpt:
                 limit_exceeded = (
                     f"You must leave {get_readable_file_size(limit)} free storage."
@@ -247,6 +271,8 @@ async def limit_checker(
                 LOGGER.info(
                     f"User : {user_id} | Daily Leech Size : {get_readable_file_size(lsize)}"
                 )
+    if not limit_exceeded and not listener.isClone:
+        reserve_storage(listener.uid, size, listener.storage_copies(), listener.seed)
     if limit_exceeded:
         if size:
             return f"{limit_exceeded}.\nYour List/File/Folder size is {get_readable_file_size(size)}."
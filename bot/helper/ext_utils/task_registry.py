@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+
+class TaskRegistry(dict):
+    # download_dict keyed by uid, with indexes that follow every assignment so
+    # a task moving to ExtractStatus, SplitStatus or TelegramStatus is indexed
+    # again by the same `download_dict[uid] = ...`
+    def __init__(self):
+        super().__init__()
+        self.__keys = {}
+        self.__gids = {}
+        self.__users = {}
+        self.__chats = {}
+        self.__types = {}
+
+    @staticmethod
+    def __gid(task):
+        try:
+            return task.gid()
+        except Exception:
+            return None
+
+    def __index(self, uid, task, gid):
+        message = task.message
+        user_id = message.from_user.id if message.from_user else None
+        keys = (gid, user_id, message.chat.id, type(task))
+        self.__keys[uid] = keys
+        for index, key in zip(self.__indexes(), keys):
+            if key is not None:
+                index.setdefault(key, {})[uid] = None
+
+    def __unindex(self, uid):
+        if (keys := self.__keys.pop(uid, None)) is None:
+            return
+        for index, key in zip(self.__indexes(), keys):
+            if (uids := index.get(key)) is not None:
+                uids.pop(uid, None)
+                if not uids:
+                    del index[key]
+
+    def __indexes(self):
+        return self.__gids, self.__users, self.__chats, self.__types
+
+    def __setitem__(self, uid, task):
+        self.__unindex(uid)
+        super().__setitem__(uid, task)
+        self.__index(uid, task, self.__gid(task))
+
+    def __delitem__(self, uid):
+        super().__delitem__(uid)
+        self.__unindex(uid)
+
+    def pop(self, uid, *default):
+        self.__unindex(uid)
+        return super().pop(uid, *default)
+
+    def clear(self):
+        super().clear()
+        for index in [self.__keys, *self.__indexes()]:
+            index.clear()
+
+    def __tasks(self, index, key):
+        tasks = (self.get(uid) for uid in list(index.get(key, {})))
+        return [task for task in tasks if task is not None]
+
+    def by_gid(self, gid):
+        # A gid can change under a task (aria2 following a torrent, a qBit hash
+        # showing up after metadata), so a stale or missing entry falls back to
+        # asking every task once and reindexing
+        for task in self.__tasks(self.__gids, gid):
+            if self.__gid(task) == gid:
+                return task
+        for uid, task in list(self.items()):
+            if (current := self.__gid(task)) != self.__keys[uid][0]:
+                self.__unindex(uid)
+                self.__index(uid, task, current)
+            if current == gid:
+                return task
+        return None
+
+    def by_user(self, user_id):
+        return self.__tasks(self.__users, user_id)
+
+    def by_chat(self, chat_id):
+        return self.__tasks(self.__chats, chat_id)
+
+    def by_type(self, *types):
+        tasks = []
+        for type_ in types:
+            tasks.extend(self.__tasks(self.__types, type_))
+        return tasks
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+from math import log2
+from time import time
+
+from bot import OWNER_ID, config_dict, download_dict, user_data, queued_dl, queued_up
+
+AGING_TIME = 3600
+
+
+class FifoScheduler:
+    def refresh(self, queue, key):
+        pass
+
+    def order(self, queue, key):
+        return list(queue)
+
+    def started(self, uid, key):
+        pass
+
+
+class FairScheduler:
+    # Start-time fair queueing between users: each user has a virtual finish tag
+    # that grows by the cost of every task started for that user, lowest tag goes
+    # next. Sudo/owner tasks always go first, a user's own tasks go smallest first.
+    def __init__(self):
+        self.__vtime = {"dl": 0, "up": 0}
+        self.__finish = {"dl": {}, "up": {}}
+        self.__since = {"dl": {}, "up": {}}
+
+    @staticmethod
+    def __task_info(uid):
+        user_id, size = 0, 0
+        if (task := download_dict.get(uid)) is not None:
+            user_id = task.message.from_user.id
+            try:
+                size = task.size_raw() or 0
+            except Exception:
+                size = 0
+        priority = (
+            0
+            if user_id == OWNER_ID or user_data.get(user_id, {}).get("is_sudo")
+            else 1
+        )
+        return priority, user_id, size
+
+    @staticmethod
+    def __cost(size):
+        return 1 + log2(1 + size / 1024**3)
+
+    def refresh(self, queue, key):
+        now = time()
+        since = self.__since[key]
+        self.__since[key] = {uid: since.get(uid, now) for uid in list(queue)}
+
+    def order(self, queue, key):
+        now = time()
+        since = self.__since[key]
+        vtime = self.__vtime[key]
+        finish = dict(self.__finish[key])
+        pending = {}
+        for uid in list(queue):
+            priority, user_id, size = self.__task_info(uid)
+            # Halve the weight of size for every AGING_TIME waited so big tasks can't starve
+            waited = now - since.get(uid, now)
+            pending.setdefault((priority, user_id), []).append(
+                (size / 2 ** (waited / AGING_TIME), uid, size)
+            )
+        for tasks in pending.values():
+            tasks.sort()
+        order = []
+        while pending:
+            flow = min(pending, key=lambda k: (k[0], max(vtime, finish.get(k[1], 0))))
+            _, uid, size = pending[flow].pop(0)
+            if not pending[flow]:
+                del pending[flow]
+            vtime = max(vtime, finish.get(flow[1], 0))
+            finish[flow[1]] = vtime + self.__cost(size)
+            order.append(uid)
+        return order
+
+    def started(self, uid, key):
+        _, user_id, size = self.__task_info(uid)
+        finish = self.__finish[key]
+        vtime = max(self.__vtime[key], finish.get(user_id, 0))
+        finish[user_id] = vtime + self.__cost(size)
+        self.__vtime[key] = vtime
+        self.__finish[key] = {u: f for u, f in finish.items() if f > vtime}
+
+
+SCHEDULERS = {"fair": FairScheduler(), "fifo": FifoScheduler()}
+
+
+def get_scheduler():
+    return SCHEDULERS.get(config_dict["QUEUE_SCHEDULER"], SCHEDULERS["fair"])
+
+
+def queue_positions():
+    # Position and queue length of every queued uid, one ordering per queue
+    # for a whole status page
+    positions = {}
+    for key, queue in [("dl", queued_dl), ("up", queued_up)]:
+        if queue:
+            order = get_scheduler().order(queue, key)
+            for index, uid in enumerate(order, start=1):
+                positions[uid] = (index, len(order))
+    return positions
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+from os import path as ospath
+from asyncio import sleep
+
+from bot import download_dict, bot_loop, LOGGER
+from bot.helper.ext_utils.bot_utils import MirrorStatus, sync_to_async
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
+from bot.helper.mirror_utils.status_utils.qbit_status import QbittorrentStatus
+
+PIPELINE_INTERVAL = 5
+
+
+class UploadPipeline:
+    # Hands files that aria2/qBittorrent already finished to the task listener
+    # while the rest of the torrent keeps downloading
+    def __init__(self):
+        self.__task = None
+        self.__progress = {}
+
+    @staticmethod
+    def __aria2_files(dl):
+        files = [f for f in dl.files if f.selected]
+        if len(files) < 2:
+            return []
+        return [
+            str(f.path) for f in files if f.length and f.completed_length == f.length
+        ]
+
+    async def __qbit_files(self, download, tor):
+        # The file list is only worth asking for when more of it finished
+        if self.__progress.get(tor.hash) == tor.progress:
+            return []
+        files = [
+            f
+            for f in await sync_to_async(
+                download.client().torrents_files, torrent_hash=tor.hash, pool="rpc"
+            )
+            if f.priority
+        ]
+        self.__progress[tor.hash] = tor.progress
+        if len(files) < 2:
+            return []
+        return [ospath.join(tor.save_path, f.name) for f in files if f.progress == 1]
+
+    async def scan(self):
+        # Only tasks with a fresh snapshot, their status is then read from
+        # memory instead of asking the engine from the event loop
+        ready, hashes = [], set()
+        for download in download_dict.by_type(Aria2Status, QbittorrentStatus):
+            listener = download.listener()
+            if not listener.pipeline:
+                continue
+            try:
+                if isinstance(download, Aria2Status):
+                    if not engine_snapshot.aria2_fresh() or (
+                        (dl := engine_snapshot.get_aria2(download.gid())) is None
+                    ):
+                        continue
+                elif (tor := engine_snapshot.get_qbit(f"{listener.uid}")) is None:
+                    continue
+                if download.status() != MirrorStatus.STATUS_DOWNLOADING:
+                    continue
+                if isinstance(download, Aria2Status):
+                    files = self.__aria2_files(dl)
+                else:
+                    hashes.add(tor.hash)
+                    files = await self.__qbit_files(download, tor)
+            except Exception as e:
+                LOGGER.error(f"{e}: while checking finished files of {listener.uid}")
+                continue
+            ready.extend((listener, path) for path in files)
+        self.__progress = {h: p for h, p in self.__progress.items() if h in hashes}
+        return ready
+
+    async def __poller(self):
+        while True:
+            if download_dict:
+                for listener, path in await self.scan():
+                    await listener.pipeline_file(path)
+            await sleep(PIPELINE_INTERVAL)
+
+    def start(self):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__poller())
+
+
+upload_pipeline = UploadPipeline()
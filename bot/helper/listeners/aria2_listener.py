@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from asyncio import sleep
+from functools import partial
 from time import time
 from aiofiles.os import remove as aioremove, path as aiopath
 
@@ -8,9 +9,11 @@ from bot.helper.ext_utils.task_manager import limit_checker
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
 from bot.helper.ext_utils.fs_utils import get_base_name, clean_unwanted
+from bot.helper.ext_utils.log_pipeline import log_context
+from bot.helper.ext_utils.aria2_rpc import aria2_rpc
 from bot.helper.ext_utils.bot_utils import (
     getDownloadByGid,
-    new_thread,
+    new_task,
     bt_selection_buttons,
     sync_to_async,
     get_telegraph_list,
@@ -22,10 +25,26 @@ from bot.helper.telegram_helper.message_utils import (
 )
 from bot.helper.themes import BotTheme
 
+SIZE_POLLS = 12
+SIZE_POLL_INTERVAL = 0.25
 
-@new_thread
+
+async def __sized_download(gid):
+    # HTTP downloads learn their size from the first response, asked for a few
+    # times over the socket instead of one long blind wait
+    download = await aria2_rpc.get_download(gid)
+    for _ in range(SIZE_POLLS):
+        if download.is_torrent or download.total_length or not download.is_active:
+            break
+        await sleep(SIZE_POLL_INTERVAL)
+        download = await aria2_rpc.get_download(gid)
+    return download
+
+
+@new_task
 async def __onDownloadStarted(api, gid):
-    download = await sync_to_async(api.get_download, gid)
+    log_context(gid=gid)
+    download = await aria2_rpc.get_download(gid)
     if download.options.follow_torrent == "false":
         return
     if download.is_metadata:
@@ -41,7 +60,7 @@ async def __onDownloadStarted(api, gid):
                     if download.is_removed or download.followed_by_ids:
                         await deleteMessage(meta)
                         break
-                    download = download.live
+                    download = await aria2_rpc.get_download(gid)
         return
     else:
         LOGGER.info(f"onDownloadStarted: {download.name} - Gid: {gid}")
@@ -67,15 +86,14 @@ async def __onDownloadStarted(api, gid):
                 )
                 return
             listener = dl.listener()
-            download = await sync_to_async(api.get_download, gid)
-            if not download.is_torrent:
-                await sleep(3)
-                download = download.live
+            download = await __sized_download(gid)
             size = download.total_length
             LOGGER.info(f"listener size : {size}")
             if limit_exceeded := await limit_checker(size, listener):
                 await listener.onDownloadError(limit_exceeded)
-                await sync_to_async(api.remove, [download], force=True, files=True)
+                await sync_to_async(
+                    api.remove, [download], force=True, files=True, pool="rpc"
+                )
     if config_dict["STOP_DUPLICATE"]:
         await sleep(1)
         if dl is None:
@@ -88,10 +106,7 @@ async def __onDownloadStarted(api, gid):
                 return
             listener = dl.listener()
             if not listener.isLeech and not listener.select and listener.upPath == "gd":
-                download = await sync_to_async(api.get_download, gid)
-                if not download.is_torrent:
-                    await sleep(3)
-                    download = download.live
+                download = await __sized_download(gid)
                 LOGGER.info("Checking File/Folder if already in Drive...")
                 name = download.name
                 if listener.compress:
@@ -103,22 +118,23 @@ async def __onDownloadStarted(api, gid):
                         name = None
                 if name is not None:
                     telegraph_content, contents_no = await sync_to_async(
-                        GoogleDriveHelper().drive_list, name, True
+                        GoogleDriveHelper().drive_list, name, True, pool="drive"
                     )
                     if telegraph_content:
                         msg = BotTheme("STOP_DUPLICATE", content=contents_no)
                         button = await get_telegraph_list(telegraph_content)
                         await listener.onDownloadError(msg, button)
                         await sync_to_async(
-                            api.remove, [download], force=True, files=True
+                            api.remove, [download], force=True, files=True, pool="rpc"
                         )
                         return
 
 
-@new_thread
+@new_task
 async def __onDownloadComplete(api, gid):
+    log_context(gid=gid)
     try:
-        download = await sync_to_async(api.get_download, gid)
+        download = await aria2_rpc.get_download(gid)
     except Exception:
         return
     if download.options.follow_torrent == "false":
@@ -130,7 +146,7 @@ async def __onDownloadComplete(api, gid):
             listener = dl.listener()
             if config_dict["BASE_URL"] and listener.select:
                 if not dl.queued:
-                    await sync_to_async(api.client.force_pause, new_gid)
+                    await sync_to_async(api.client.force_pause, new_gid, pool="rpc")
                 SBUTTONS = bt_selection_buttons(new_gid)
                 msg = "Your download paused. Choose files then press Done Selecting button to start downloading."
                 await sendMessage(listener.message, msg, SBUTTONS)
@@ -142,20 +158,25 @@ async def __onDownloadComplete(api, gid):
                 await listener.onUploadError(
                     f"Seeding stopped with Ratio: {dl.ratio()} and Time: {dl.seeding_time()}"
                 )
-                await sync_to_async(api.remove, [download], force=True, files=True)
+                await sync_to_async(
+                    api.remove, [download], force=True, files=True, pool="rpc"
+                )
     else:
         LOGGER.info(f"onDownloadComplete: {download.name} - Gid: {gid}")
         if dl := await getDownloadByGid(gid):
             listener = dl.listener()
             await listener.onDownloadComplete()
-            await sync_to_async(api.remove, [download], force=True, files=True)
+            await sync_to_async(
+                api.remove, [download], force=True, files=True, pool="rpc"
+            )
 
 
-@new_thread
+@new_task
 async def __onBtDownloadComplete(api, gid):
+    log_context(gid=gid)
     seed_start_time = time()
     await sleep(1)
-    download = await sync_to_async(api.get_download, gid)
+    download = await aria2_rpc.get_download(gid)
     if download.options.follow_torrent == "false":
         return
     LOGGER.info(f"onBtDownloadComplete: {download.name} - Gid: {gid}")
@@ -174,7 +195,7 @@ async def __onBtDownloadComplete(api, gid):
         if listener.seed:
             try:
                 await sync_to_async(
-                    api.set_options, {"max-upload-limit": "0"}, [download]
+                    api.set_options, {"max-upload-limit": "0"}, [download], pool="rpc"
                 )
             except Exception as e:
                 LOGGER.error(
@@ -182,11 +203,11 @@ async def __onBtDownloadComplete(api, gid):
                 )
         else:
             try:
-                await sync_to_async(api.client.force_pause, gid)
+                await sync_to_async(api.client.force_pause, gid, pool="rpc")
             except Exception as e:
                 LOGGER.error(f"{e} GID: {gid}")
         await listener.onDownloadComplete()
-        download = download.live
+        download = await aria2_rpc.get_download(gid)
         if listener.seed:
             if download.is_complete:
                 if dl := await getDownloadByGid(gid):
@@ -194,12 +215,14 @@ async def __onBtDownloadComplete(api, gid):
                     await listener.onUploadError(
                         f"Seeding stopped with Ratio: {dl.ratio()} and Time: {dl.seeding_time()}"
                     )
-                    await sync_to_async(api.remove, [download], force=True, files=True)
+                    await sync_to_async(
+                        api.remove, [download], force=True, files=True, pool="rpc"
+                    )
             else:
                 async with download_dict_lock:
                     if listener.uid not in download_dict:
                         await sync_to_async(
-                            api.remove, [download], force=True, files=True
+                            api.remove, [download], force=True, files=True, pool="rpc"
                         )
                         return
                     download_dict[listener.uid] = Aria2Status(gid, listener, True)
@@ -207,23 +230,27 @@ async def __onBtDownloadComplete(api, gid):
                 LOGGER.info(f"Seeding started: {download.name} - Gid: {gid}")
                 await update_all_messages()
         else:
-            await sync_to_async(api.remove, [download], force=True, files=True)
+            await sync_to_async(
+                api.remove, [download], force=True, files=True, pool="rpc"
+            )
 
 
-@new_thread
+@new_task
 async def __onDownloadStopped(api, gid):
+    log_context(gid=gid)
     await sleep(6)
     if dl := await getDownloadByGid(gid):
         listener = dl.listener()
         await listener.onDownloadError("Dead torrent!")
 
 
-@new_thread
+@new_task
 async def __onDownloadError(api, gid):
+    log_context(gid=gid)
     LOGGER.info(f"onDownloadError: {gid}")
     error = "None"
     try:
-        download = await sync_to_async(api.get_download, gid)
+        download = await aria2_rpc.get_download(gid)
         if download.options.follow_torrent == "false":
             return
         error = download.error_message
@@ -236,12 +263,12 @@ async def __onDownloadError(api, gid):
 
 
 def start_aria2_listener():
-    aria2.listen_to_notifications(
-        threaded=False,
-        on_download_start=__onDownloadStarted,
-        on_download_error=__onDownloadError,
-        on_download_stop=__onDownloadStopped,
-        on_download_complete=__onDownloadComplete,
-        on_bt_download_complete=__onBtDownloadComplete,
-        timeout=60,
-    )
+    for event, handler in [
+        ("start", __onDownloadStarted),
+        ("error", __onDownloadError),
+        ("stop", __onDownloadStopped),
+        ("complete", __onDownloadComplete),
+        ("bt_complete", __onBtDownloadComplete),
+    ]:
+        aria2_rpc.subscribe(event, partial(handler, aria2))
+    aria2_rpc.start()
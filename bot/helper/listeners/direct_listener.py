@@ -1,7 +1,9 @@
-from time import sleep
+from asyncio import Queue, gather
 
-from bot import LOGGER, aria2
-from bot.helper.ext_utils.bot_utils import async_to_sync, sync_to_async
+from bot import LOGGER, config_dict
+from bot.helper.ext_utils.aria2_rpc import aria2_rpc
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
+from bot.helper.ext_utils.fs_utils import clean_target
 
 
 class DirectListener:
@@ -12,69 +14,119 @@ class DirectListener:
         self.__a2c_opt = a2c_opt
         self.__proc_bytes = 0
         self.__failed = 0
-        self.task = None
+        self.__count = 0
+        self.__gids = set()
+        self.__crawler = None
+        self.__total_size = total_size
         self.name = foldername
-        self.total_size = total_size
+
+    @property
+    def total_size(self):
+        # A crawled index keeps growing while it downloads
+        if self.__crawler is not None:
+            return self.__crawler.total_size
+        return self.__total_size
+
+    def __tasks(self):
+        return [
+            task
+            for gid in list(self.__gids)
+            if (task := engine_snapshot.get_aria2(gid)) is not None
+        ]
 
     @property
     def processed_bytes(self):
-        if self.task:
-            return self.__proc_bytes + self.task.completed_length
-        return self.__proc_bytes
+        return self.__proc_bytes + sum(task.completed_length for task in self.__tasks())
 
     @property
     def speed(self):
-        return self.task.download_speed if self.task else 0
+        return sum(task.download_speed for task in self.__tasks())
 
-    def download(self, contents):
+    @property
+    def is_waiting(self):
+        return bool(tasks := self.__tasks()) and all(task.is_waiting for task in tasks)
+
+    async def download(self, contents):
         self.is_downloading = True
-        for content in contents:
+        # Workers share one queue, each takes the next file once its own is
+        # done and None marks the end of it
+        if isinstance(contents, list):
+            pending = Queue()
+            for content in contents:
+                pending.put_nowait(content)
+            pending.put_nowait(None)
+        else:
+            self.__crawler = contents
+            pending = contents.start()
+        workers = max(1, config_dict["DIRECT_CONCURRENCY"])
+        await gather(*(self.__worker(pending) for _ in range(workers)))
+        if self.__is_cancelled:
+            return
+        if self.__failed == self.__count:
+            await self.__listener.onDownloadError("All files are failed to download!")
+            return
+        await self.__listener.onDownloadComplete()
+
+    async def __worker(self, pending):
+        while (content := await pending.get()) is not None:
             if self.__is_cancelled:
                 break
-            if content["path"]:
-                self.__a2c_opt["dir"] = f"{self.__path}/{content['path']}"
-            else:
-                self.__a2c_opt["dir"] = self.__path
-            filename = content["filename"]
-            self.__a2c_opt["out"] = filename
-            try:
-                self.task = aria2.add_uris([content["url"]], self.__a2c_opt, position=0)
-            except Exception as e:
-                self.__failed += 1
-                LOGGER.error(f"Unable to download {filename} due to: {e}")
-                continue
-            self.task = self.task.live
-            while True:
-                if self.__is_cancelled:
-                    if self.task:
-                        self.task.remove(True, True)
-                    break
-                self.task = self.task.live
-                if error_message := self.task.error_message:
-                    self.__failed += 1
-                    LOGGER.error(
-                        f"Unable to download {self.task.name} due to: {error_message}"
-                    )
-                    self.task.remove(True, True)
-                    break
-                elif self.task.is_complete:
-                    self.__proc_bytes += self.task.total_length
-                    self.task.remove(True)
-                    break
-                sleep(1)
-            self.task = None
+            self.__count += 1
+            await self.__download_file(content)
+        pending.put_nowait(None)
+
+    async def __download_file(self, content):
+        if content["path"]:
+            dire = f"{self.__path}/{content['path']}"
+        else:
+            dire = self.__path
+        filename = content["filename"]
+        a2c_opt = {**self.__a2c_opt, "dir": dire, "out": filename}
+        try:
+            gid = await aria2_rpc.call("aria2.addUri", [content["url"]], a2c_opt)
+        except Exception as e:
+            self.__failed += 1
+            LOGGER.error(f"Unable to download {filename} due to: {e}")
+            return
+        self.__gids.add(gid)
         if self.__is_cancelled:
+            await self.__remove(gid)
+        try:
+            event = await aria2_rpc.wait(gid)
+            task = await aria2_rpc.get_download(gid)
+        except Exception as e:
+            self.__failed += 1
+            LOGGER.error(f"Unable to download {filename} due to: {e}")
             return
-        if self.__failed == len(contents):
-            async_to_sync(
-                self.__listener.onDownloadError, "All files are failed to download!"
-            )
+        finally:
+            self.__gids.discard(gid)
+        try:
+            await aria2_rpc.call("aria2.removeDownloadResult", gid)
+        except Exception:
+            pass
+        if self.__is_cancelled:
             return
-        async_to_sync(self.__listener.onDownloadComplete)
+        file_path = f"{dire}/{filename}"
+        if event == "complete":
+            self.__proc_bytes += task.total_length
+            if self.__listener.pipeline:
+                await self.__listener.pipeline_file(file_path)
+        else:
+            self.__failed += 1
+            LOGGER.error(f"Unable to download {task.name} due to: {task.error_message}")
+            await clean_target(file_path)
+            await clean_target(f"{file_path}.aria2")
+
+    async def __remove(self, gid):
+        try:
+            await aria2_rpc.call("aria2.forceRemove", gid)
+        except Exception as e:
+            LOGGER.error(f"{e}: Aria2c, while cancelling {gid}")
 
     async def cancel_download(self):
         self.__is_cancelled = True
         LOGGER.info(f"Cancelling Download: {self.name}")
         await self.__listener.onDownloadError("Download Cancelled by User!")
-        if self.task:
-            await sync_to_async(self.task.remove, force=True, files=True)
+        if self.__crawler is not None:
+            self.__crawler.cancel()
+        await gather(*(self.__remove(gid) for gid in list(self.__gids)))
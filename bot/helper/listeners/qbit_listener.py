@@ -26,11 +26,13 @@ from bot.helper.ext_utils.task_manager import limit_checker, stop_duplicate_chec
 
 
 async def __remove_torrent(client, hash_, tag):
-    await sync_to_async(client.torrents_delete, torrent_hashes=hash_, delete_files=True)
+    await sync_to_async(
+        client.torrents_delete, torrent_hashes=hash_, delete_files=True, pool="rpc"
+    )
     async with qb_listener_lock:
         if tag in QbTorrents:
             del QbTorrents[tag]
-    await sync_to_async(client.torrents_delete_tags, tags=tag)
+    await sync_to_async(client.torrents_delete_tags, tags=tag, pool="rpc")
 
 
 @new_task
@@ -43,7 +45,7 @@ async def __onDownloadError(err, tor, button=None):
     listener = download.listener()
     client = download.client()
     await listener.onDownloadError(err, button)
-    await sync_to_async(client.torrents_pause, torrent_hashes=ext_hash)
+    await sync_to_async(client.torrents_pause, torrent_hashes=ext_hash, pool="rpc")
     await sleep(0.3)
     await __remove_torrent(client, ext_hash, tor.tags)
 
@@ -95,11 +97,11 @@ async def __onDownloadComplete(tor):
     listener = download.listener()
     client = download.client()
     if not listener.seed:
-        await sync_to_async(client.torrents_pause, torrent_hashes=ext_hash)
+        await sync_to_async(client.torrents_pause, torrent_hashes=ext_hash, pool="rpc")
     if listener.select:
         await clean_unwanted(listener.dir)
     await listener.onDownloadComplete()
-    client = await sync_to_async(get_client)
+    client = await sync_to_async(get_client, pool="rpc")
     if listener.seed:
         async with download_dict_lock:
             if listener.uid in download_dict:
@@ -117,21 +119,21 @@ async def __onDownloadComplete(tor):
                 return
         await update_all_messages()
         LOGGER.info(f"Seeding started: {tor.name} - Hash: {ext_hash}")
-        await sync_to_async(client.auth_log_out)
+        await sync_to_async(client.auth_log_out, pool="rpc")
     else:
         await __remove_torrent(client, ext_hash, tag)
 
 
 async def __qb_listener():
-    client = await sync_to_async(get_client)
+    client = await sync_to_async(get_client, pool="rpc")
     while True:
         async with qb_listener_lock:
             try:
-                if len(await sync_to_async(client.torrents_info)) == 0:
+                if len(await sync_to_async(client.torrents_info, pool="rpc")) == 0:
                     QbInterval.clear()
-                    await sync_to_async(client.auth_log_out)
+                    await sync_to_async(client.auth_log_out, pool="rpc")
                     break
-                for tor_info in await sync_to_async(client.torrents_info):
+                for tor_info in await sync_to_async(client.torrents_info, pool="rpc"):
                     tag = tor_info.tags
                     if tag not in QbTorrents:
                         continue
@@ -146,7 +148,9 @@ async def __qb_listener():
                             __onDownloadError("Dead Torrent!", tor_info)
                         else:
                             await sync_to_async(
-                                client.torrents_reannounce, torrent_hashes=tor_info.hash
+                                client.torrents_reannounce,
+                                torrent_hashes=tor_info.hash,
+                                pool="rpc",
                             )
                     elif state == "downloading":
                         QbTorrents[tag]["stalled_time"] = time()
@@ -182,7 +186,9 @@ async def __qb_listener():
                             msg += f"Size: {tor_info.size} Total Size: {tor_info.total_size}"
                             LOGGER.warning(msg)
                             await sync_to_async(
-                                client.torrents_recheck, torrent_hashes=tor_info.hash
+                                client.torrents_recheck,
+                                torrent_hashes=tor_info.hash,
+                                pool="rpc",
                             )
                             QbTorrents[tag]["rechecked"] = True
                         elif (
@@ -193,11 +199,15 @@ async def __qb_listener():
                             __onDownloadError("Dead Torrent!", tor_info)
                         else:
                             await sync_to_async(
-                                client.torrents_reannounce, torrent_hashes=tor_info.hash
+                                client.torrents_reannounce,
+                                torrent_hashes=tor_info.hash,
+                                pool="rpc",
                             )
                     elif state == "missingFiles":
                         await sync_to_async(
-                            client.torrents_recheck, torrent_hashes=tor_info.hash
+                            client.torrents_recheck,
+                            torrent_hashes=tor_info.hash,
+                            pool="rpc",
                         )
                     elif state == "error":
                         __onDownloadError(
@@ -218,7 +228,7 @@ async def __qb_listener():
                         __onSeedFinish(tor_info)
             except Exception as e:
                 LOGGER.error(str(e))
-                client = await sync_to_async(get_client)
+                client = await sync_to_async(get_client, pool="rpc")
         await sleep(3)
 
 
@@ -10,7 +10,7 @@ from aiofiles.os import path as aiopath, remove as aioremove, listdir, makedirs
 from os import walk, path as ospath
 from html import escape
 from aioshutil import move
-from asyncio import create_subprocess_exec, sleep, Event
+from asyncio import sleep, Event, Queue
 from pyrogram.enums import ChatType
 
 from bot import (
@@ -34,6 +34,8 @@ from bot import (
     queue_dict_lock,
     bot,
     GLOBAL_EXTENSION_FILTER,
+    bot_cache,
+    bot_loop,
 )
 from bot.helper.ext_utils.bot_utils import (
     extra_btns,
@@ -61,6 +63,12 @@ from bot.helper.ext_utils.leech_utils import (
 )
 from bot.helper.ext_utils.exceptions import NotSupportedExtractionArchive
 from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.task_scheduler import get_scheduler
+from bot.helper.ext_utils.admission import admission
+from bot.helper.ext_utils.storage_ledger import reserve_storage, release_storage
+from bot.helper.ext_utils.postprocess import postprocess
+from bot.helper.ext_utils.metrics import metrics
+from bot.helper.ext_utils.log_pipeline import log_context
 from bot.helper.mirror_utils.status_utils.extract_status import ExtractStatus
 from bot.helper.mirror_utils.status_utils.zip_status import ZipStatus
 from bot.helper.mirror_utils.status_utils.split_status import SplitStatus
@@ -88,6 +96,8 @@ from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.themes import BotTheme
 
+JOURNAL_STAGES = ["download", "extract", "metadata", "zip", "split"]
+
 
 class MirrorLeechListener:
     def __init__(
@@ -111,6 +121,7 @@ class MirrorLeechListener:
         source_url=None,
         logMessage=None,
         leech_utils={},
+        journal=None,
     ):
         if sameDir is None:
             sameDir = {}
@@ -160,6 +171,22 @@ class MirrorLeechListener:
             )
         )
         self.source_msg = ""
+        self.journal = journal or {}
+        self.journaled = bool(
+            config_dict["RESUME_TASKS"] and DATABASE_URL and not isClone and not sameDir
+        )
+        self.pipeline = bool(
+            config_dict["PIPELINE_UPLOAD"]
+            and isLeech
+            and not (compress or extract or join or sameDir or isYtdlp)
+            and not (self.user_dict.get("lmeta") or config_dict["METADATA"])
+        )
+        self.__pipe_tg = None
+        self.__pipe_queue = None
+        self.__pipe_seen = set()
+        self.__pipe_task = None
+        self.__pipe_closed = False
+        self.__stage_time = time()
         self.__setModeEng()
         self.__parseSource()
 
@@ -169,7 +196,7 @@ class MirrorLeechListener:
                 if Interval:
                     Interval[0].cancel()
                     Interval.clear()
-            await sync_to_async(aria2.purge)
+            await sync_to_async(aria2.purge, pool="rpc")
             await delete_all_messages()
         except Exception:
             pass
@@ -212,7 +239,87 @@ class MirrorLeechListener:
         else:
             self.source_msg = f"<code>{self.source_url}</code>"
 
+    def __stage_done(self, stage):
+        if (done := self.journal.get("done")) is None:
+            return False
+        return JOURNAL_STAGES.index(done) >= JOURNAL_STAGES.index(stage)
+
+    def __stage_timed(self, stage):
+        metrics.observe(stage, time() - self.__stage_time)
+        self.__stage_time = time()
+
+    def storage_copies(self, after=None):
+        stages = []
+        if self.extract:
+            stages.append("extract")
+        if self.user_dict.get("lmeta") or config_dict["METADATA"]:
+            stages.append("metadata")
+        if self.compress:
+            stages.append("zip")
+        elif self.isLeech:
+            stages.append("split")
+        if after is not None:
+            stages = [
+                stage
+                for stage in stages
+                if JOURNAL_STAGES.index(stage) > JOURNAL_STAGES.index(after)
+            ]
+        return len(stages)
+
+    async def __journal_stage(self, stage, dl_path, up_path, **kwargs):
+        if not self.journaled or self.__stage_done(stage):
+            return
+        data = {
+            "done": stage,
+            "dl_path": dl_path,
+            "up_path": up_path,
+            "newDir": self.newDir,
+        }
+        data.update(kwargs)
+        self.journal.update(data)
+        await DbManger().update_journal(self.uid, data)
+
+    async def journal_upload(self, path, link, name):
+        if self.journaled:
+            await DbManger().add_journal_upload(self.uid, path, link, name)
+
+    async def pipeline_file(self, path):
+        # The poller reports every finished file on each pass
+        if not self.pipeline or self.__pipe_closed or path in self.__pipe_seen:
+            return
+        self.__pipe_seen.add(path)
+        if self.__pipe_queue is None:
+            self.__pipe_queue = Queue()
+            self.__pipe_tg = TgUploader(None, self.dir, self)
+            self.__pipe_task = bot_loop.create_task(self.__pipe_worker())
+        self.__pipe_queue.put_nowait(path)
+
+    async def __pipe_worker(self):
+        LEECH_SPLIT_SIZE = (
+            self.user_dict.get("split_size", False) or config_dict["LEECH_SPLIT_SIZE"]
+        )
+        while (path := await self.__pipe_queue.get()) is not None:
+            try:
+                # Files that need splitting are left for the final upload
+                if await aiopath.getsize(path) > LEECH_SPLIT_SIZE:
+                    continue
+                LOGGER.info(f"Pipelined Upload: {path}")
+                if not await self.__pipe_tg.upload_early(path):
+                    break
+            except Exception as e:
+                LOGGER.error(f"{e}: while uploading {path} before download completed")
+        self.__pipe_closed = True
+
+    def __close_pipeline(self, cancel=False):
+        self.__pipe_closed = True
+        if self.__pipe_queue is not None:
+            if cancel:
+                self.__pipe_tg.stop_early()
+            self.__pipe_queue.put_nowait(None)
+
     async def onDownloadStart(self):
+        log_context(uid=self.uid)
+        self.__stage_time = time()
         if config_dict["LINKS_LOG_ID"] and not self.excep_chat:
             dispTime = datetime.now(timezone(config_dict["TIMEZONE"])).strftime(
                 "%d/%m/%y, %I:%M:%S %p"
@@ -239,8 +346,32 @@ class MirrorLeechListener:
                 self.source_url,
                 self.message.text,
             )
+        if self.journaled:
+            await DbManger().update_journal(
+                self.uid,
+                {
+                    "cid": self.message.chat.id,
+                    "user_id": self.user_id,
+                    "opts": {
+                        "compress": self.compress,
+                        "extract": self.extract,
+                        "isQbit": self.isQbit,
+                        "isLeech": self.isLeech,
+                        "tag": self.tag,
+                        "rcFlags": self.rcFlags,
+                        "upPath": self.upPath,
+                        "join": self.join,
+                        "drive_id": self.drive_id,
+                        "index_link": self.index_link,
+                        "isYtdlp": self.isYtdlp,
+                        "source_url": self.source_url,
+                        "leech_utils": self.leech_utils,
+                    },
+                },
+            )
 
     async def onDownloadComplete(self):
+        log_context(uid=self.uid)
         multi_links = False
         while True:
             if self.sameDir:
@@ -276,10 +407,13 @@ class MirrorLeechListener:
             name = str(download.name()).replace("/", "")
             gid = download.gid()
         LOGGER.info(f"Download Completed: {name}")
+        self.__close_pipeline()
         if multi_links:
             await self.onUploadError("Downloaded! Starting other part of the Task...")
             return
-        if (
+        if self.journal:
+            name = self.journal["name"]
+        elif (
             name == "None"
             or self.isQbit
             or not await aiopath.exists(f"{self.dir}/{name}")
@@ -295,17 +429,33 @@ class MirrorLeechListener:
 
         dl_path = f"{self.dir}/{name}"
         up_path = ""
+        if self.__stage_done("download"):
+            dl_path = self.journal["dl_path"]
+            up_path = self.journal["up_path"]
+            self.newDir = self.journal["newDir"]
         size = await get_path_size(dl_path)
+        if not self.__stage_done("download"):
+            self.__stage_timed("download")
         async with queue_dict_lock:
             if self.uid in non_queued_dl:
                 non_queued_dl.remove(self.uid)
         await start_from_queued()
         user_dict = user_data.get(self.message.from_user.id, {})
 
-        if self.join and await aiopath.isdir(dl_path):
+        if (
+            self.join
+            and not self.__stage_done("download")
+            and await aiopath.isdir(dl_path)
+        ):
             await join_files(dl_path)
+        await self.__journal_stage(
+            "download", dl_path, up_path, name=name, size=size, gid=gid
+        )
+        reserve_storage(
+            self.uid, size, self.storage_copies("download"), self.seed, size
+        )
 
-        if self.extract:
+        if self.extract and not self.__stage_done("extract"):
             pswd = self.extract if isinstance(self.extract, str) else ""
             try:
                 if await aiopath.isfile(dl_path):
@@ -320,7 +470,7 @@ class MirrorLeechListener:
                     else:
                         up_path = dl_path
                     for dirpath, _, files in await sync_to_async(
-                        walk, dl_path, topdown=False
+                        walk, dl_path, topdown=False, pool="fs"
                     ):
                         for file_ in files:
                             if (
@@ -345,14 +495,17 @@ class MirrorLeechListener:
                                 ]
                                 if not pswd:
                                     del cmd[2]
-                                if (
-                                    self.suproc == "cancelled"
-                                    or self.suproc is not None
-                                    and self.suproc.returncode == -9
-                                ):
-                                    return
-                                self.suproc = await create_subprocess_exec(*cmd)
-                                code = await self.suproc.wait()
+                                async with postprocess.slot("extract", self):
+                                    if (
+                                        self.suproc == "cancelled"
+                                        or self.suproc is not None
+                                        and self.suproc.returncode == -9
+                                    ):
+                                        return
+                                    self.suproc = await postprocess.spawn(
+                                        "extract", *cmd
+                                    )
+                                    code = await self.suproc.wait()
                                 if code == -9:
                                     return
                                 elif code != 0:
@@ -384,10 +537,11 @@ class MirrorLeechListener:
                     ]
                     if not pswd:
                         del cmd[2]
-                    if self.suproc == "cancelled":
-                        return
-                    self.suproc = await create_subprocess_exec(*cmd)
-                    code = await self.suproc.wait()
+                    async with postprocess.slot("extract", self):
+                        if self.suproc == "cancelled":
+                            return
+                        self.suproc = await postprocess.spawn("extract", *cmd)
+                        code = await self.suproc.wait()
                     if code == -9:
                         return
                     elif code == 0:
@@ -405,8 +559,15 @@ class MirrorLeechListener:
                 LOGGER.info("Not any valid archive, uploading file as it is.")
                 self.newDir = ""
                 up_path = dl_path
+            await self.__journal_stage("extract", dl_path, up_path)
+            reserve_storage(
+                self.uid, size, self.storage_copies("extract"), self.seed, size
+            )
+            self.__stage_timed("extract")
 
-        if metadata := self.user_dict.get("lmeta") or config_dict["METADATA"]:
+        if not self.__stage_done("metadata") and (
+            metadata := self.user_dict.get("lmeta") or config_dict["METADATA"]
+        ):
             meta_path = up_path or dl_path
             self.newDir = f"{self.dir}10000"
             await makedirs(self.newDir, exist_ok=True)
@@ -422,7 +583,9 @@ class MirrorLeechListener:
                 if self.suproc == "cancelled":
                     return
             elif await aiopath.isdir(meta_path):
-                for dirpath, _, files in await sync_to_async(walk, meta_path):
+                for dirpath, _, files in await sync_to_async(
+                    walk, meta_path, pool="fs"
+                ):
                     for file in files:
                         if self.suproc == "cancelled":
                             return
@@ -432,8 +595,13 @@ class MirrorLeechListener:
                             await edit_metadata(
                                 self, dirpath, video_file, outfile, metadata
                             )
+            await self.__journal_stage("metadata", dl_path, up_path)
+            reserve_storage(
+                self.uid, size, self.storage_copies("metadata"), self.seed, size
+            )
+            self.__stage_timed("metadata")
 
-        if self.compress:
+        if self.compress and not self.__stage_done("zip"):
             pswd = self.compress if isinstance(self.compress, str) else ""
             if up_path:
                 dl_path = up_path
@@ -469,14 +637,20 @@ class MirrorLeechListener:
                 if not pswd:
                     del cmd[3]
                 LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
-            if self.suproc == "cancelled":
-                return
-            self.suproc = await create_subprocess_exec(*cmd)
-            code = await self.suproc.wait()
+            async with postprocess.slot("zip", self):
+                if self.suproc == "cancelled":
+                    return
+                self.suproc = await postprocess.spawn("zip", *cmd)
+                code = await self.suproc.wait()
             if code == -9:
                 return
             elif not self.seed:
                 await clean_target(dl_path)
+            await self.__journal_stage("zip", dl_path, up_path)
+            reserve_storage(
+                self.uid, size, self.storage_copies("zip"), self.seed, size
+            )
+            self.__stage_timed("zip")
 
         if not self.compress and not self.extract:
             up_path = dl_path
@@ -486,14 +660,14 @@ class MirrorLeechListener:
         if self.isLeech:
             m_size = []
             o_files = []
-            if not self.compress:
+            if not self.compress and not self.__stage_done("split"):
                 checked = False
                 LEECH_SPLIT_SIZE = (
                     user_dict.get("split_size", False)
                     or config_dict["LEECH_SPLIT_SIZE"]
                 )
                 for dirpath, _, files in await sync_to_async(
-                    walk, up_dir, topdown=False
+                    walk, up_dir, topdown=False, pool="fs"
                 ):
                     for file_ in files:
                         f_path = ospath.join(dirpath, file_)
@@ -526,7 +700,11 @@ class MirrorLeechListener:
                             else:
                                 m_size.append(f_size)
                                 o_files.append(file_)
+                await self.__journal_stage("split", dl_path, up_path)
+                if checked:
+                    self.__stage_timed("split")
 
+        release_storage(self.uid)
         up_limit = config_dict["QUEUE_UPLOAD"]
         all_limit = config_dict["QUEUE_ALL"]
         added_to_queue = False
@@ -534,12 +712,15 @@ class MirrorLeechListener:
             dl = len(non_queued_dl)
             up = len(non_queued_up)
             if (
-                all_limit and dl + up >= all_limit and (not up_limit or up >= up_limit)
-            ) or (up_limit and up >= up_limit):
+                (all_limit and dl + up >= all_limit and (not up_limit or up >= up_limit))
+                or (up_limit and up >= up_limit)
+                or not admission.admit("up")
+            ):
                 added_to_queue = True
                 LOGGER.info(f"Added to Queue/Upload: {name}")
                 event = Event()
                 queued_up[self.uid] = event
+                get_scheduler().refresh(queued_up, "up")
         if added_to_queue:
             async with download_dict_lock:
                 download_dict[self.uid] = QueueStatus(name, size, gid, self, "Up")
@@ -550,18 +731,25 @@ class MirrorLeechListener:
             LOGGER.info(f"Start from Queued/Upload: {name}")
         async with queue_dict_lock:
             non_queued_up.add(self.uid)
+        self.__stage_time = time()
         if self.isLeech:
             size = await get_path_size(up_dir)
             for s in m_size:
                 size = size - s
             LOGGER.info(f"Leech Name: {up_name}")
-            tg = TgUploader(up_name, up_dir, self)
+            if self.__pipe_tg is not None:
+                tg = self.__pipe_tg
+                tg.name = up_name
+            else:
+                tg = TgUploader(up_name, up_dir, self)
             tg_upload_status = TelegramStatus(
                 tg, size, self.message, gid, "up", self.upload_details
             )
             async with download_dict_lock:
                 download_dict[self.uid] = tg_upload_status
             await update_all_messages()
+            if self.__pipe_task is not None:
+                await self.__pipe_task
             await tg.upload(o_files, m_size, size)
         elif self.upPath == "gd":
             size = await get_path_size(up_path)
@@ -574,7 +762,9 @@ class MirrorLeechListener:
                 download_dict[self.uid] = upload_status
             await update_all_messages()
 
-            await sync_to_async(drive.upload, up_name, size, self.drive_id)
+            await sync_to_async(
+                drive.upload, up_name, size, self.drive_id, pool="upload"
+            )
         elif self.upPath == "ddl":
             size = await get_path_size(up_path)
             LOGGER.info(f"Upload Name: {up_name} via DDL")
@@ -600,6 +790,11 @@ class MirrorLeechListener:
     async def onUploadComplete(
         self, link, size, files, folders, mime_type, name, rclonePath="", private=False
     ):
+        log_context(uid=self.uid)
+        if self.journaled:
+            await DbManger().rm_journal(self.uid)
+        release_storage(self.uid)
+        self.__stage_timed("clone" if self.isClone else "upload")
         if (
             self.isSuperGroup
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
@@ -904,6 +1099,10 @@ class MirrorLeechListener:
         await delete_links(self.message)
 
     async def onDownloadError(self, error, button=None):
+        log_context(uid=self.uid)
+        self.__close_pipeline(True)
+        if self.journaled and bot_cache.get("stopping"):
+            return
         async with download_dict_lock:
             if self.uid in download_dict.keys():
                 del download_dict[self.uid]
@@ -929,6 +1128,9 @@ class MirrorLeechListener:
             and DATABASE_URL
         ):
             await DbManger().rm_complete_task(self.message.link)
+        if self.journaled:
+            await DbManger().rm_journal(self.uid)
+        release_storage(self.uid)
 
         async with queue_dict_lock:
             if self.uid in queued_dl:
@@ -949,6 +1151,10 @@ class MirrorLeechListener:
             await clean_download(self.newDir)
 
     async def onUploadError(self, error):
+        log_context(uid=self.uid)
+        self.__close_pipeline(True)
+        if self.journaled and bot_cache.get("stopping"):
+            return
         async with download_dict_lock:
             if self.uid in download_dict.keys():
                 del download_dict[self.uid]
@@ -971,6 +1177,9 @@ class MirrorLeechListener:
             and DATABASE_URL
         ):
             await DbManger().rm_complete_task(self.message.link)
+        if self.journaled:
+            await DbManger().rm_journal(self.uid)
+        release_storage(self.uid)
 
         async with queue_dict_lock:
             if self.uid in queued_dl:
@@ -39,7 +39,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
         else:
             a2c_opt["pause"] = "true"
     try:
-        download = (await sync_to_async(aria2.add, link, a2c_opt))[0]
+        download = (await sync_to_async(aria2.add, link, a2c_opt, pool="rpc"))[0]
     except Exception as e:
         LOGGER.info(f"Aria2c Download Error: {e}")
         await sendMessage(listener.message, f"{e}")
@@ -71,7 +71,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
         await sendStatusMessage(listener.message)
     elif listener.select and download.is_torrent and not download.is_metadata:
         if not added_to_queue:
-            await sync_to_async(aria2.client.force_pause, gid)
+            await sync_to_async(aria2.client.force_pause, gid, pool="rpc")
         SBUTTONS = bt_selection_buttons(gid)
         msg = "Your download paused. Choose files then press Done Selecting button to start downloading."
         await sendMessage(listener.message, msg, SBUTTONS)
@@ -86,7 +86,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
             download.queued = False
             new_gid = download.gid()
 
-        await sync_to_async(aria2.client.unpause, new_gid)
+        await sync_to_async(aria2.client.unpause, new_gid, pool="rpc")
         LOGGER.info(f"Start Queued Download from Aria2c: {name}. Gid: {gid}")
 
         async with queue_dict_lock:
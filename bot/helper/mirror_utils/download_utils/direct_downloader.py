@@ -10,8 +10,8 @@ from bot import (
     non_queued_dl,
     queue_dict_lock,
 )
-from bot.helper.ext_utils.bot_utils import sync_to_async
 from bot.helper.ext_utils.task_manager import is_queued, stop_duplicate_check
+from bot.helper.ext_utils.storage_ledger import reserve_storage
 from bot.helper.listeners.direct_listener import DirectListener
 from bot.helper.mirror_utils.status_utils.direct_status import DirectStatus
 from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
@@ -29,10 +29,14 @@ async def add_direct_download(details, path, listener, foldername):
     path = f"{path}/{foldername}"
     msg, button = await stop_duplicate_check(foldername, listener)
     if msg:
+        # An index still being listed has nothing to list it for anymore
+        if not isinstance(contents, list):
+            contents.cancel()
         await sendMessage(listener.message, msg, button)
         return
 
     gid = token_hex(5)
+    reserve_storage(listener.uid, size, listener.storage_copies(), listener.seed)
     added_to_queue, event = await is_queued(listener.uid)
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {foldername}")
@@ -45,6 +49,8 @@ async def add_direct_download(details, path, listener, foldername):
         await event.wait()
         async with download_dict_lock:
             if listener.uid not in download_dict:
+                if not isinstance(contents, list):
+                    contents.cancel()
                 return
         from_queue = True
     else:
@@ -72,4 +78,4 @@ async def add_direct_download(details, path, listener, foldername):
         await listener.onDownloadStart()
         await sendStatusMessage(listener.message)
 
-    await sync_to_async(directListener.download, contents)
+    await directListener.download(contents)
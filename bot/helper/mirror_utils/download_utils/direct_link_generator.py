@@ -6,28 +6,40 @@ from os import path
 from uuid import uuid4
 from hashlib import sha256
 from time import sleep
+from functools import partial
+from asyncio import Queue
 from re import findall, match, search
 
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from lxml.etree import HTML
-from requests import Session, session as req_session, post
+from requests import session as req_session, post
 from urllib.parse import parse_qs, quote, unquote, urlparse, urljoin
 from cloudscraper import create_scraper
 from lk21 import Bypass
 from http.cookiejar import MozillaCookieJar
 
-from bot import LOGGER, config_dict
+from bot import LOGGER, bot_loop, config_dict
 from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
     is_share_link,
     is_index_link,
     is_magnet,
+    sync_to_async,
 )
 from bot.helper.ext_utils.exceptions import DirectDownloadLinkException
 from bot.helper.ext_utils.help_messages import PASSWORD_ERROR_MESSAGE
+from bot.helper.mirror_utils.download_utils.direct_resolver import (
+    HostMap,
+    Resolver,
+    sessions,
+    resolve_cache,
+    resolvers,
+)
 
 _caches = {}
+
+INDEX_WORKERS = 4
 user_agent = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0"
 )
@@ -568,143 +580,52 @@ debrid_link_sites = [
 ]
 
 
-def direct_link_generator(link):
-    auth = None
-    if isinstance(link, tuple):
-        link, auth = link
-    if is_magnet(link):
-        return real_debrid(link, True)
+debrid_hosts = HostMap(debrid_sites)
+debrid_link_hosts = HostMap(debrid_link_sites)
+ytdl_hosts = HostMap(["youtube.com", "youtu.be"])
+resolvers.refuse("ERROR: R.I.P Anon Sites!", *anonfilesBaseSites)
+resolvers.refuse("ERROR: R.I.P Zippyshare", "zippyshare.com")
 
+
+def find_resolver(link):
+    # Where a link goes, a few dict lookups however many sites there are,
+    # None when nothing handles it
+    if is_magnet(link):
+        return MAGNET
     domain = urlparse(link).hostname
     if not domain:
         raise DirectDownloadLinkException("ERROR: Invalid URL")
-    if "youtube.com" in domain or "youtu.be" in domain:
+    if domain in ytdl_hosts:
         raise DirectDownloadLinkException("ERROR: Use ytdl cmds for Youtube links")
-    elif config_dict["DEBRID_LINK_API"] and any(x in domain for x in debrid_link_sites):
-        return debrid_link(link)
-    elif config_dict["REAL_DEBRID_API"] and any(x in domain for x in debrid_sites):
-        return real_debrid(link)
-    elif any(
-        x in domain
-        for x in ["filelions.com", "filelions.live", "filelions.to", "filelions.online"]
-    ):
-        return filelions(link)
-    elif "mediafire.com" in domain:
-        return mediafire(link)
-    elif "osdn.net" in domain:
-        return osdn(link)
-    elif "github.com" in domain:
-        return github(link)
-    elif "hxfile.co" in domain:
-        return hxfile(link)
-    elif "1drv.ms" in domain:
-        return onedrive(link)
-    elif "pixeldrain.com" in domain:
-        return pixeldrain(link)
-    elif "antfiles.com" in domain:
-        return antfiles(link)
-    elif "racaty" in domain:
-        return racaty(link)
-    elif "1fichier.com" in domain:
-        return fichier(link)
-    elif "solidfiles.com" in domain:
-        return solidfiles(link)
-    elif "krakenfiles.com" in domain:
-        return krakenfiles(link)
-    elif "upload.ee" in domain:
-        return uploadee(link)
-    elif "akmfiles" in domain:
-        return akmfiles(link)
-    elif "linkbox" in domain:
-        return linkbox(link)
-    elif "shrdsk" in domain:
-        return shrdsk(link)
-    elif "letsupload.io" in domain:
-        return letsupload(link)
-    elif "gofile.io" in domain:
-        return gofile(link, auth)
-    elif "easyupload.io" in domain:
-        return easyupload(link)
-    elif "streamvid.net" in domain:
-        return streamvid(link)
-    elif "instagram.com" in domain:
-        return instagram(link)
-    elif any(
-        x in domain
-        for x in [
-            "dood.watch",
-            "doodstream.com",
-            "dood.to",
-            "dood.so",
-            "dood.cx",
-            "dood.la",
-            "dood.ws",
-            "dood.sh",
-            "doodstream.co",
-            "dood.pm",
-            "dood.wf",
-            "dood.re",
-            "dood.video",
-            "dooood.com",
-            "dood.yt",
-            "doods.yt",
-            "dood.stream",
-            "doods.pro",
-        ]
-    ):
-        return doods(link)
-    elif any(
-        x in domain
-        for x in [
-            "streamtape.com",
-            "streamtape.co",
-            "streamtape.cc",
-            "streamtape.to",
-            "streamtape.net",
-            "streamta.pe",
-            "streamtape.xyz",
-        ]
-    ):
-        return streamtape(link)
-    elif any(x in domain for x in ["wetransfer.com", "we.tl"]):
-        return wetransfer(link)
-    elif any(x in domain for x in anonfilesBaseSites):
-        raise DirectDownloadLinkException("ERROR: R.I.P Anon Sites!")
-    elif any(
-        x in domain
-        for x in [
-            "terabox.com",
-            "nephobox.com",
-            "4funbox.com",
-            "mirrobox.com",
-            "momerybox.com",
-            "teraboxapp.com",
-            "1024tera.com",
-        ]
-    ):
-        return terabox(link)
-    elif any(x in domain for x in fmed_list):
-        return fembed(link)
-    elif any(
-        x in domain
-        for x in ["sbembed.com", "watchsb.com", "streamsb.net", "sbplay.org"]
-    ):
-        return sbembed(link)
+    elif config_dict["DEBRID_LINK_API"] and domain in debrid_link_hosts:
+        return DEBRID_LINK
+    elif config_dict["REAL_DEBRID_API"] and domain in debrid_hosts:
+        return REAL_DEBRID
+    elif (resolver := resolvers.find(domain)) is not None:
+        return resolver
     elif is_index_link(link) and link.endswith("/"):
-        return gd_index(link, auth)
+        return INDEX
     elif is_share_link(link):
-        if "gdtot" in domain:
-            return gdtot(link)
-        elif "filepress" in domain:
-            return filepress(link)
-        elif "www.jiodrive" in domain:
-            return jiodrive(link)
-        else:
-            return sharer_scraper(link)
-    elif "zippyshare.com" in domain:
-        raise DirectDownloadLinkException("ERROR: R.I.P Zippyshare")
-    else:
-        raise DirectDownloadLinkException(f"No Direct link function found for {link}")
+        return SHARE
+    return None
+
+
+async def resolve_direct_link(link):
+    # Unknown hosts fail before any scrape, the rest are cached and shared by
+    # concurrent requests for the same link unless their resolver opts out
+    url = link[0] if isinstance(link, tuple) else link
+    if (resolver := find_resolver(url)) is None:
+        raise DirectDownloadLinkException(f"No Direct link function found for {url}")
+    if not resolver.cacheable:
+        return await resolver.resolve(link)
+    return await resolve_cache.get(link, resolver.resolve)
+
+
+def direct_link_generator(link):
+    url = link[0] if isinstance(link, tuple) else link
+    if (resolver := find_resolver(url)) is None:
+        raise DirectDownloadLinkException(f"No Direct link function found for {url}")
+    return resolver.call(link)
 
 
 def real_debrid(url: str, tor=False):
@@ -712,7 +633,7 @@ def real_debrid(url: str, tor=False):
     Based on Real-Debrid v1 API (Heroku/VPS) [Without VPN]"""
 
     def __unrestrict(url, tor=False):
-        cget = create_scraper().request
+        cget = sessions.scraper().request
         resp = cget(
             "POST",
             f"https://api.real-debrid.com/rest/1.0/unrestrict/link?auth_token={config_dict['REAL_DEBRID_API']}",
@@ -728,7 +649,7 @@ def real_debrid(url: str, tor=False):
             raise DirectDownloadLinkException(f"ERROR: {resp.json()['error']}")
 
     def __addMagnet(magnet):
-        cget = create_scraper().request
+        cget = sessions.scraper().request
         hash_ = search(r"(?<=xt=urn:btih:)[a-zA-Z0-9]+", magnet).group(0)
         resp = cget(
             "GET",
@@ -797,7 +718,7 @@ def real_debrid(url: str, tor=False):
 
 
 def debrid_link(url):
-    cget = create_scraper().request
+    cget = sessions.scraper().request
     resp = cget(
         "POST",
         f"https://debrid-link.com/api/v2/downloader/add?access_token={config_dict['DEBRID_LINK_API']}",
@@ -842,6 +763,7 @@ def get_captcha_token(session, params):
         return token[0]
 
 
+@resolvers.register("mediafire.com", timeout=600)
 def mediafire(url, session=None):
     if "/folder/" in url:
         return mediafireFolder(url)
@@ -850,7 +772,7 @@ def mediafire(url, session=None):
     ):
         return final_link[0]
     if session is None:
-        session = Session()
+        session = sessions.requests()
         parsed_url = urlparse(url)
         url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
     try:
@@ -872,8 +794,9 @@ def mediafire(url, session=None):
     return final_link[0]
 
 
+@resolvers.register("osdn.net")
 def osdn(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             html = HTML(session.get(url).text)
         except Exception as e:
@@ -883,18 +806,20 @@ def osdn(url):
         return f"https://osdn.net{direct_link[0]}"
 
 
+@resolvers.register("github.com")
 def github(url):
     try:
         findall(r"\bhttps?://.*github\.com.*releases\S+", url)[0]
     except IndexError as e:
         raise DirectDownloadLinkException("No GitHub Releases links found") from e
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         _res = session.get(url, stream=True, allow_redirects=False)
         if "location" in _res.headers:
             return _res.headers["location"]
         raise DirectDownloadLinkException("ERROR: Can't extract the link")
 
 
+@resolvers.register("hxfile.co")
 def hxfile(url):
     try:
         return Bypass().bypass_filesIm(url)
@@ -902,8 +827,9 @@ def hxfile(url):
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
 
 
+@resolvers.register("letsupload.io")
 def letsupload(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             res = session.post(url)
         except Exception as e:
@@ -915,7 +841,7 @@ def letsupload(url):
 
 
 def anonfilesBased(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             html = HTML(session.get(url).text)
         except Exception as e:
@@ -925,6 +851,7 @@ def anonfilesBased(url):
         raise DirectDownloadLinkException("ERROR: File not found!")
 
 
+@resolvers.register(*fmed_list)
 def fembed(link):
     try:
         dl_url = Bypass().bypass_fembed(link)
@@ -935,6 +862,7 @@ def fembed(link):
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
 
 
+@resolvers.register("sbembed.com", "watchsb.com", "streamsb.net", "sbplay.org")
 def sbembed(link):
     """Sbembed direct link generator
     Based on https://github.com/zevtyardt/lk21
@@ -948,8 +876,9 @@ def sbembed(link):
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
 
 
+@resolvers.register("1drv.ms")
 def onedrive(link):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             link = session.get(link).url
             parsed_link = urlparse(link)
@@ -982,6 +911,7 @@ def onedrive(link):
     return resp["@content.downloadUrl"]
 
 
+@resolvers.register("pixeldrain.com")
 def pixeldrain(url):
     url = url.strip("/ ")
     file_id = url.split("/")[-1]
@@ -991,7 +921,7 @@ def pixeldrain(url):
     else:
         info_link = f"https://pixeldrain.com/api/file/{file_id}/info"
         dl_link = f"https://pixeldrain.com/api/file/{file_id}?download"
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             resp = session.get(info_link).json()
         except Exception as e:
@@ -1004,6 +934,7 @@ def pixeldrain(url):
         )
 
 
+@resolvers.register("antfiles.com")
 def antfiles(url):
     try:
         return Bypass().bypass_antfiles(url)
@@ -1011,11 +942,20 @@ def antfiles(url):
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
 
 
+@resolvers.register(
+    "streamtape.com",
+    "streamtape.co",
+    "streamtape.cc",
+    "streamtape.to",
+    "streamtape.net",
+    "streamta.pe",
+    "streamtape.xyz",
+)
 def streamtape(url):
     splitted_url = url.split("/")
     _id = splitted_url[4] if len(splitted_url) >= 6 else splitted_url[-1]
     try:
-        with Session() as session:
+        with sessions.requests() as session:
             html = HTML(session.get(url).text)
     except Exception as e:
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
@@ -1026,8 +966,9 @@ def streamtape(url):
     return f"https://streamtape.com/get_video?id={_id}{link[-1]}"
 
 
+@resolvers.register("racaty")
 def racaty(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             json_data = {"op": "download2", "id": url.split("/")[-1]}
@@ -1040,6 +981,7 @@ def racaty(url):
         raise DirectDownloadLinkException("ERROR: Direct link not found")
 
 
+@resolvers.register("1fichier.com", cacheable=False)
 def fichier(link):
     regex = r"^([http:\/\/|https:\/\/]+)?.*1fichier\.com\/\?.+"
     gan = match(regex, link)
@@ -1051,7 +993,7 @@ def fichier(link):
     else:
         pswd = None
         url = link
-    cget = create_scraper().request
+    cget = sessions.scraper().request
     try:
         if pswd is None:
             req = cget("post", url)
@@ -1111,8 +1053,9 @@ def fichier(link):
     )
 
 
+@resolvers.register("solidfiles.com")
 def solidfiles(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_9_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/36.0.1985.125 Safari/537.36"
@@ -1126,8 +1069,9 @@ def solidfiles(url):
             raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
 
 
+@resolvers.register("krakenfiles.com")
 def krakenfiles(url):
-    with Session() as session:
+    with sessions.requests() as session:
         try:
             _res = session.get(url)
         except Exception as e:
@@ -1154,8 +1098,9 @@ def krakenfiles(url):
     return _json["url"]
 
 
+@resolvers.register("upload.ee")
 def uploadee(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             html = HTML(session.get(url).text)
         except Exception as e:
@@ -1166,6 +1111,16 @@ def uploadee(url):
         raise DirectDownloadLinkException("ERROR: Direct Link not found")
 
 
+@resolvers.register(
+    "terabox.com",
+    "nephobox.com",
+    "4funbox.com",
+    "mirrobox.com",
+    "momerybox.com",
+    "teraboxapp.com",
+    "1024tera.com",
+    timeout=600,
+)
 def terabox(url):
     if not path.isfile("terabox.txt"):
         raise DirectDownloadLinkException("ERROR: terabox.txt not found")
@@ -1231,7 +1186,7 @@ def terabox(url):
                     details["total_size"] += size
                 details["contents"].append(item)
 
-    with Session() as session:
+    with sessions.requests() as session:
         try:
             _res = session.get(url, cookies=cookies)
         except Exception as e:
@@ -1252,6 +1207,7 @@ def terabox(url):
     return details
 
 
+@resolvers.register("gofile.io", timeout=600, auth=True)
 def gofile(url, auth):
     try:
         _password = sha256(auth[1].encode("utf-8")).hexdigest() if auth else ""
@@ -1334,7 +1290,7 @@ def gofile(url, auth):
                 details["contents"].append(item)
 
     details = {"contents": [], "title": "", "total_size": 0}
-    with Session() as session:
+    with sessions.requests() as session:
         try:
             token = __get_token(session)
         except Exception as e:
@@ -1350,6 +1306,107 @@ def gofile(url, auth):
     return details
 
 
+class IndexCrawler:
+    # Lists a Bhadoo index tree page by page with a few workers, each fetch on
+    # a pooled session of its own, files are queued for download as soon as
+    # they are listed
+    def __init__(self, username, password):
+        self.total_size = 0
+        self.__username = username
+        self.__password = password
+        self.__files = Queue()
+        self.__folders = Queue()
+        self.__task = None
+
+    def fetch(self, url, page_token="", page_index=0):
+        payload = {
+            "id": "",
+            "type": "folder",
+            "username": self.__username,
+            "password": self.__password,
+            "page_token": page_token,
+            "page_index": page_index,
+        }
+        try:
+            with sessions.scraper() as session:
+                return session.post(url, json=payload).json()
+        except Exception:
+            raise DirectDownloadLinkException("Use Latest Bhadoo Index Link")
+
+    def add_page(self, url, folderPath, data, page_index=0):
+        for file_info in (data.get("data") or {}).get("files", []):
+            if file_info.get("mimeType", "") == "application/vnd.google-apps.folder":
+                self.__folders.put_nowait(
+                    (
+                        f"{url}{file_info['name']}/",
+                        path.join(folderPath, file_info["name"]),
+                        "",
+                        0,
+                    )
+                )
+            else:
+                if "size" in file_info:
+                    self.total_size += int(file_info["size"])
+                self.__files.put_nowait(
+                    {
+                        "path": folderPath,
+                        "filename": unquote(file_info["name"]),
+                        "url": urljoin(url, file_info.get("link", "") or ""),
+                    }
+                )
+        if page_token := data.get("nextPageToken"):
+            self.__folders.put_nowait((url, folderPath, page_token, page_index + 1))
+
+    def listed(self):
+        # The whole tree came with the first page, nothing left to crawl
+        if not self.__folders.empty():
+            return None
+        contents = []
+        while not self.__files.empty():
+            contents.append(self.__files.get_nowait())
+        return contents
+
+    async def __worker(self):
+        while True:
+            url, folderPath, page_token, page_index = await self.__folders.get()
+            try:
+                data = await sync_to_async(
+                    self.__fetch_page, url, page_token, page_index, pool="scrape"
+                )
+                self.add_page(url, folderPath, data, page_index)
+            except Exception as e:
+                LOGGER.error(f"{e}: while listing {url}")
+            finally:
+                self.__folders.task_done()
+
+    def __fetch_page(self, url, page_token, page_index):
+        # Worker threads run outside any resolver, sessions go by the index host
+        sessions.bind(urlparse(url).hostname)
+        try:
+            return self.fetch(url, page_token, page_index)
+        finally:
+            sessions.bind(None)
+
+    async def __crawl(self):
+        workers = [bot_loop.create_task(self.__worker()) for _ in range(INDEX_WORKERS)]
+        try:
+            await self.__folders.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.__files.put_nowait(None)
+
+    def start(self):
+        # Files already listed and the ones still to come, None ends the queue
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__crawl())
+        return self.__files
+
+    def cancel(self):
+        if self.__task is not None:
+            self.__task.cancel()
+
+
 def gd_index(url, auth):
     if not auth:
         auth = ("admin", "admin")
@@ -1359,58 +1416,25 @@ def gd_index(url, auth):
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}")
 
     details = {"contents": [], "title": unquote(_title), "total_size": 0}
-
-    def __fetch_links(url, folderPath, username, password):
-        with create_scraper() as session:
-            payload = {
-                "id": "",
-                "type": "folder",
-                "username": username,
-                "password": password,
-                "page_token": "",
-                "page_index": 0,
-            }
-            try:
-                data = (session.post(url, json=payload)).json()
-            except Exception:
-                raise DirectDownloadLinkException("Use Latest Bhadoo Index Link")
-
-        if "data" in data:
-            for file_info in data["data"]["files"]:
-                if (
-                    file_info.get("mimeType", "")
-                    == "application/vnd.google-apps.folder"
-                ):
-                    if not folderPath:
-                        newFolderPath = path.join(details["title"], file_info["name"])
-                    else:
-                        newFolderPath = path.join(folderPath, file_info["name"])
-                    __fetch_links(
-                        f"{url}{file_info['name']}/", newFolderPath, username, password
-                    )
-                else:
-                    if not folderPath:
-                        folderPath = details["title"]
-                    item = {
-                        "path": path.join(folderPath),
-                        "filename": unquote(file_info["name"]),
-                        "url": urljoin(url, file_info.get("link", "") or ""),
-                    }
-                    if "size" in file_info:
-                        details["total_size"] += int(file_info["size"])
-                    details["contents"].append(item)
-
+    crawler = IndexCrawler(auth[0], auth[1])
     try:
-        __fetch_links(url, "", auth[0], auth[1])
+        crawler.add_page(url, details["title"], crawler.fetch(url))
     except Exception as e:
         raise DirectDownloadLinkException(e)
+    details["total_size"] = crawler.total_size
+    if (contents := crawler.listed()) is None:
+        # Subfolders and further pages are listed while the download runs
+        details["contents"] = crawler
+        return details
+    details["contents"] = contents
     if len(details["contents"]) == 1:
         return details["contents"][0]["url"]
     return details
 
 
+@resolvers.register("filepress")
 def filepress(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             raw = urlparse(url)
@@ -1431,8 +1455,9 @@ def filepress(url):
     return f'https://drive.google.com/uc?id={res["data"]}&export=download'
 
 
+@resolvers.register("jiodrive")
 def jiodrive(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             cookies = {"access_token": config_dict["JIODRIVE_TOKEN"]}
@@ -1454,8 +1479,9 @@ def jiodrive(url):
         return resp["file"]
 
 
+@resolvers.register("gdtot")
 def gdtot(url):
-    cget = create_scraper().request
+    cget = sessions.scraper().request
     try:
         res = cget("GET", f'https://gdtot.pro/file/{url.split("/")[-1]}')
     except Exception as e:
@@ -1515,7 +1541,7 @@ def gdtot(url):
 
 
 def sharer_scraper(url):
-    cget = create_scraper().request
+    cget = sessions.scraper().request
     try:
         url = cget("GET", url).url
         raw = urlparse(url)
@@ -1570,8 +1596,9 @@ def sharer_scraper(url):
         )
 
 
+@resolvers.register("wetransfer.com", "we.tl")
 def wetransfer(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             splited_url = url.split("/")
@@ -1592,8 +1619,9 @@ def wetransfer(url):
         raise DirectDownloadLinkException("ERROR: cannot find direct link")
 
 
+@resolvers.register("akmfiles")
 def akmfiles(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             json_data = {"op": "download2", "id": url.split("/")[-1]}
@@ -1606,8 +1634,9 @@ def akmfiles(url):
         raise DirectDownloadLinkException("ERROR: Direct link not found")
 
 
+@resolvers.register("shrdsk")
 def shrdsk(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             res = session.get(
@@ -1623,8 +1652,9 @@ def shrdsk(url):
     raise DirectDownloadLinkException("ERROR: cannot find direct link")
 
 
+@resolvers.register("linkbox")
 def linkbox(url):
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             url = session.get(url).url
             res = session.get(
@@ -1778,11 +1808,31 @@ def mediafireFolder(url):
     return details
 
 
+@resolvers.register(
+    "dood.watch",
+    "doodstream.com",
+    "dood.to",
+    "dood.so",
+    "dood.cx",
+    "dood.la",
+    "dood.ws",
+    "dood.sh",
+    "doodstream.co",
+    "dood.pm",
+    "dood.wf",
+    "dood.re",
+    "dood.video",
+    "dooood.com",
+    "dood.yt",
+    "doods.yt",
+    "dood.stream",
+    "doods.pro",
+)
 def doods(url):
     if "/e/" in url:
         url = url.replace("/e/", "/d/")
     parsed_url = urlparse(url)
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             html = HTML(session.get(url).text)
         except Exception as e:
@@ -1806,6 +1856,7 @@ def doods(url):
     return (link.group(1), f"Referer: {parsed_url.scheme}://{parsed_url.hostname}/")
 
 
+@resolvers.register("easyupload.io")
 def easyupload(url):
     if "::" in url:
         _password = url.split("::")[-1]
@@ -1813,7 +1864,7 @@ def easyupload(url):
     else:
         _password = ""
     file_id = url.split("/")[-1]
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             _res = session.get(url)
         except Exception as e:
@@ -1869,6 +1920,9 @@ def easyupload(url):
     )
 
 
+@resolvers.register(
+    "filelions.com", "filelions.live", "filelions.to", "filelions.online"
+)
 def filelions(url):
     if not config_dict["FILELION_API"]:
         raise DirectDownloadLinkException(
@@ -1882,7 +1936,7 @@ def filelions(url):
         file_code = spited_file_code[0]
     parsed_url = urlparse(url)
     url = f"{parsed_url.scheme}://{parsed_url.hostname}/{file_code}"
-    with Session() as session:
+    with sessions.requests() as session:
         try:
             _res = session.get(
                 "https://api.filelions.com/api/file/direct_link",
@@ -1915,12 +1969,13 @@ def filelions(url):
     raise DirectDownloadLinkException(f"ERROR: {error}")
 
 
+@resolvers.register("streamvid.net")
 def streamvid(url: str):
     file_code = url.split("/")[-1]
     parsed_url = urlparse(url)
     url = f"{parsed_url.scheme}://{parsed_url.hostname}/d/{file_code}"
     quality_defined = bool(url.endswith(("_o", "_h", "_n", "_l")))
-    with create_scraper() as session:
+    with sessions.scraper() as session:
         try:
             html = HTML(session.get(url).text)
         except Exception as e:
@@ -1964,6 +2019,7 @@ def streamvid(url: str):
             raise DirectDownloadLinkException(f"ERROR: {error[0]}")
         raise DirectDownloadLinkException("ERROR: Something went wrong")
 
+@resolvers.register("instagram.com")
 def instagram(link: str) -> str:
     """
     Fetches the direct video download URL from an Instagram post.
@@ -1995,4 +2051,12 @@ def instagram(link: str) -> str:
         raise DirectDownloadLinkException("ERROR: Failed to retrieve video URL.")
 
     except Exception as e:
-        raise DirectDownloadLinkException(f"ERROR: {e}")
\ No newline at end of file
+        raise DirectDownloadLinkException(f"ERROR: {e}")
+
+
+# Chosen by the link itself rather than its host, see find_resolver
+MAGNET = Resolver(partial(real_debrid, tor=True))
+REAL_DEBRID = Resolver(real_debrid)
+DEBRID_LINK = Resolver(debrid_link)
+INDEX = Resolver(gd_index, cacheable=False, auth=True)
+SHARE = Resolver(sharer_scraper)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+from time import time, monotonic
+from datetime import datetime, timezone
+from threading import RLock, local
+from collections import OrderedDict
+from asyncio import shield, wait_for, TimeoutError
+from urllib.parse import parse_qs, urlparse
+from requests import Session
+from cloudscraper import create_scraper
+
+from bot import bot_loop
+from bot.helper.ext_utils.bot_utils import async_to_sync, sync_to_async
+from bot.helper.ext_utils.exceptions import DirectDownloadLinkException
+
+SESSION_IDLE = 900
+RESOLVE_TTL = 300
+EXPIRY_MARGIN = 60
+MAX_ENTRIES = 512
+RESOLVE_TIMEOUT = 120
+# Cloudflare clearance, worth keeping for the next link to the same host
+KEPT_COOKIES = ("cf_", "__cf")
+# Query parameters signed links carry their absolute expiry in
+EXPIRY_KEYS = ["expires", "expire", "expiry", "exp", "e", "validto", "valid_until"]
+
+
+def link_expiry(url):
+    query = {k.lower(): v[0] for k, v in parse_qs(urlparse(url).query).items()}
+    if (date := query.get("x-amz-date")) and (
+        seconds := query.get("x-amz-expires", "")
+    ).isdigit():
+        try:
+            signed = datetime.strptime(date, "%Y%m%dT%H%M%SZ")
+        except ValueError:
+            return None
+        return signed.replace(tzinfo=timezone.utc).timestamp() + int(seconds)
+    for key in EXPIRY_KEYS:
+        if (value := query.get(key, "")).isdigit() and len(value) in [10, 13]:
+            return int(value[:10])
+    return None
+
+
+class PooledSession:
+    # A host's session checked out for one link, leaving a with block, close()
+    # or dropping the last reference hands it back for the next link
+    def __init__(self, pool, key, session, headers):
+        self.__pool = pool
+        self.__key = key
+        self.__session = session
+        self.__headers = headers
+
+    def __getattr__(self, name):
+        return getattr(self.__session, name)
+
+    def __send(self, method, args, kwargs):
+        if (left := self.__pool.time_left()) is not None:
+            kwargs["timeout"] = min(kwargs.get("timeout") or left, left)
+        return getattr(self.__session, method)(*args, **kwargs)
+
+    # Bound to the proxy so `cget = sessions.scraper().request` keeps it out
+    def request(self, *args, **kwargs):
+        return self.__send("request", args, kwargs)
+
+    def get(self, *args, **kwargs):
+        return self.__send("get", args, kwargs)
+
+    def post(self, *args, **kwargs):
+        return self.__send("post", args, kwargs)
+
+    def head(self, *args, **kwargs):
+        return self.__send("head", args, kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if (session := self.__session) is not None:
+            self.__session = None
+            self.__pool.release(self.__key, session, self.__headers)
+
+    def __del__(self):
+        self.close()
+
+
+class SessionPool:
+    # requests and cloudscraper sessions per host, each used by one thread at a
+    # time, a solved challenge and open TLS connections outlive the link that
+    # needed them
+    def __init__(self):
+        self.__idle = {}
+        self.__lock = RLock()
+        self.__local = local()
+
+    def bind(self, host, timeout=None):
+        # Sessions taken by this thread belong to host until the next bind, and
+        # their requests share what is left of timeout
+        self.__local.host = host
+        self.__local.timeout = timeout
+        self.__local.deadline = None if timeout is None else monotonic() + timeout
+
+    def time_left(self):
+        if (deadline := getattr(self.__local, "deadline", None)) is None:
+            return None
+        if (left := deadline - monotonic()) <= 0:
+            raise DirectDownloadLinkException(
+                f"ERROR: No link after {self.__local.timeout}s, try again later"
+            )
+        return left
+
+    def __expire(self, now):
+        for key, idle in list(self.__idle.items()):
+            for entry in [entry for entry in idle if now - entry[0] > SESSION_IDLE]:
+                idle.remove(entry)
+                entry[1].close()
+            if not idle:
+                del self.__idle[key]
+
+    def __get(self, kind, factory):
+        key = (kind, getattr(self.__local, "host", None))
+        with self.__lock:
+            self.__expire(monotonic())
+            if idle := self.__idle.get(key):
+                _, session, headers = idle.pop()
+            else:
+                session = factory()
+                headers = session.headers.copy()
+        return PooledSession(self, key, session, headers)
+
+    def release(self, key, session, headers):
+        # What one link set on the session stays with it, only the clearance
+        # cookies of a solved challenge carry over to the next
+        session.headers = headers.copy()
+        for cookie in list(session.cookies):
+            if not cookie.name.startswith(KEPT_COOKIES):
+                session.cookies.clear(cookie.domain, cookie.path, cookie.name)
+        with self.__lock:
+            self.__idle.setdefault(key, []).append((monotonic(), session, headers))
+
+    def scraper(self):
+        return self.__get("scraper", create_scraper)
+
+    def requests(self):
+        return self.__get("requests", Session)
+
+    def clear(self):
+        with self.__lock:
+            for idle in self.__idle.values():
+                for _, session, _ in idle:
+                    session.close()
+            self.__idle.clear()
+
+
+class ResolveCache:
+    # Resolved links keyed by url and auth, concurrent requests for the same
+    # link share one scrape and signed links are dropped before they expire
+    def __init__(self):
+        self.__cache = OrderedDict()
+        self.__pending = {}
+
+    @staticmethod
+    def __key(link):
+        if isinstance(link, tuple):
+            return link[0], tuple(link[1])
+        return link, None
+
+    @staticmethod
+    def __urls(result):
+        if isinstance(result, str):
+            return [result]
+        if isinstance(result, tuple):
+            return [result[0]]
+        if isinstance(result, dict) and isinstance(result.get("contents"), list):
+            return [content["url"] for content in result["contents"]]
+        return None
+
+    def __store(self, key, result):
+        # A crawl still in progress can't be handed to a second task
+        if (urls := self.__urls(result)) is None:
+            return
+        ttl = RESOLVE_TTL
+        for url in urls:
+            if (expiry := link_expiry(url)) is not None:
+                ttl = min(ttl, expiry - time() - EXPIRY_MARGIN)
+        if ttl <= 0:
+            return
+        self.__cache[key] = (monotonic() + ttl, result)
+        self.__cache.move_to_end(key)
+        while len(self.__cache) > MAX_ENTRIES:
+            self.__cache.popitem(last=False)
+
+    async def get(self, link, resolve):
+        key = self.__key(link)
+        if (entry := self.__cache.get(key)) is not None:
+            if entry[0] > monotonic():
+                self.__cache.move_to_end(key)
+                return entry[1]
+            del self.__cache[key]
+        if (task := self.__pending.get(key)) is None:
+            task = self.__pending[key] = bot_loop.create_task(
+                self.__resolve(key, link, resolve)
+            )
+            task.add_done_callback(lambda _: self.__pending.pop(key, None))
+        return await shield(task)
+
+    async def __resolve(self, key, link, resolve):
+        result = await resolve(link)
+        self.__store(key, result)
+        return result
+
+    def clear(self):
+        self.__cache.clear()
+
+
+class HostMap:
+    # Hosts match a registered suffix (dood.to matches www.dood.to) or a bare
+    # label for sites hopping between tlds (racaty matches racaty.io), a lookup
+    # is one dict probe per label of the host however many are registered
+    def __init__(self, hosts=()):
+        self.__suffixes = {}
+        self.__labels = {}
+        for host in hosts:
+            self.__table(host)[host] = True
+
+    def __table(self, host):
+        return self.__suffixes if "." in host else self.__labels
+
+    def add(self, host, value):
+        if host in (table := self.__table(host)):
+            raise ValueError(f"{host} is registered twice")
+        table[host] = value
+
+    def find(self, domain):
+        # A registered host also matches with a prefix glued on (terabox.com
+        # for 1024terabox.com) as the substring checks it replaced did, still
+        # one dict probe per character of the host however many are registered
+        host = domain.lower().rstrip(".")
+        for i in range(len(host)):
+            if (value := self.__suffixes.get(host[i:])) is not None:
+                return value
+        for label in host.split("."):
+            for i in range(len(label)):
+                if (value := self.__labels.get(label[i:])) is not None:
+                    return value
+        return None
+
+    def __contains__(self, domain):
+        return self.find(domain) is not None
+
+
+class Resolver:
+    def __init__(
+        self, func, is_async=False, timeout=RESOLVE_TIMEOUT, cacheable=True, auth=False
+    ):
+        self.func = func
+        self.is_async = is_async
+        self.timeout = timeout
+        self.cacheable = cacheable
+        self.auth = auth
+
+    def __args(self, link):
+        url, auth = link if isinstance(link, tuple) else (link, None)
+        return (url, auth) if self.auth else (url,)
+
+    def __run(self, link):
+        sessions.bind(urlparse(self.__args(link)[0]).hostname, self.timeout)
+        try:
+            return self.func(*self.__args(link))
+        finally:
+            sessions.bind(None)
+
+    def call(self, link):
+        # From a scrape thread, where direct_link_generator runs
+        if self.is_async:
+            return async_to_sync(self.func, *self.__args(link))
+        return self.__run(link)
+
+    async def resolve(self, link):
+        if self.is_async:
+            coro = self.func(*self.__args(link))
+        else:
+            coro = sync_to_async(self.__run, link, pool="scrape")
+        # Only stops the wait, a scrape thread is bounded by its requests
+        # timing out once the same deadline passes
+        try:
+            return await wait_for(coro, self.timeout)
+        except TimeoutError:
+            raise DirectDownloadLinkException(
+                f"ERROR: No link after {self.timeout}s, try again later"
+            )
+
+
+class ResolverRegistry(HostMap):
+    def register(self, *hosts, **options):
+        def decorator(func):
+            resolver = Resolver(func, **options)
+            for host in hosts:
+                self.add(host, resolver)
+            return func
+
+        return decorator
+
+    def refuse(self, message, *hosts):
+        # Dead sites fail on the spot instead of costing a scrape
+        async def refused(_):
+            raise DirectDownloadLinkException(message)
+
+        self.register(*hosts, is_async=True, cacheable=False)(refused)
+
+
+sessions = SessionPool()
+resolve_cache = ResolveCache()
+resolvers = ResolverRegistry()
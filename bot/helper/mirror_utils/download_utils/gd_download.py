@@ -28,7 +28,7 @@ from bot.helper.ext_utils.task_manager import (
 
 async def add_gd_download(link, path, listener, newname, org_link):
     drive = GoogleDriveHelper()
-    name, mime_type, size, _, _ = await sync_to_async(drive.count, link)
+    name, mime_type, size, _, _ = await sync_to_async(drive.count, link, pool="drive")
     if is_share_link(org_link):
         cget().request(
             "POST",
@@ -82,4 +82,4 @@ async def add_gd_download(link, path, listener, newname, org_link):
         await listener.onDownloadStart()
         await sendStatusMessage(listener.message)
 
-    await sync_to_async(drive.download, link)
+    await sync_to_async(drive.download, link, pool="download")
@@ -135,7 +135,7 @@ class AsyncExecutor:
 
     async def do(self, function, args):
         self.continue_event.clear()
-        await sync_to_async(function, *args)
+        await sync_to_async(function, *args, pool="rpc")
         await self.continue_event.wait()
 
 
@@ -160,7 +160,9 @@ async def add_mega_download(mega_link, path, listener, name):
         folder_api = MegaApi(None, None, None, "WZML-X")
         folder_api.addListener(mega_listener)
         await executor.do(folder_api.loginToFolder, (mega_link,))
-        node = await sync_to_async(folder_api.authorizeNode, mega_listener.node)
+        node = await sync_to_async(
+            folder_api.authorizeNode, mega_listener.node, pool="rpc"
+        )
     if mega_listener.error is not None:
         await sendMessage(listener.message, str(mega_listener.error))
         await executor.do(api.logout, ())
@@ -43,7 +43,7 @@ def __get_hash_file(path):
 
 
 async def add_qb_torrent(link, path, listener, ratio, seed_time):
-    client = await sync_to_async(get_client)
+    client = await sync_to_async(get_client, pool="rpc")
     ADD_TIME = time()
     try:
         url = link
@@ -62,13 +62,16 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
             ratio_limit=ratio,
             seeding_time_limit=seed_time,
             headers={"user-agent": "Wget/1.12"},
+            pool="rpc",
         )
         if op.lower() == "ok.":
-            tor_info = await sync_to_async(client.torrents_info, tag=f"{listener.uid}")
+            tor_info = await sync_to_async(
+                client.torrents_info, tag=f"{listener.uid}", pool="rpc"
+            )
             if len(tor_info) == 0:
                 while True:
                     tor_info = await sync_to_async(
-                        client.torrents_info, tag=f"{listener.uid}"
+                        client.torrents_info, tag=f"{listener.uid}", pool="rpc"
                     )
                     if len(tor_info) > 0:
                         break
@@ -106,7 +109,7 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
                 meta = await sendMessage(listener.message, metamsg)
                 while True:
                     tor_info = await sync_to_async(
-                        client.torrents_info, tag=f"{listener.uid}"
+                        client.torrents_info, tag=f"{listener.uid}", pool="rpc"
                     )
                     if len(tor_info) == 0:
                         await deleteMessage(meta)
@@ -126,7 +129,9 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
 
             ext_hash = tor_info.hash
             if not added_to_queue:
-                await sync_to_async(client.torrents_pause, torrent_hashes=ext_hash)
+                await sync_to_async(
+                    client.torrents_pause, torrent_hashes=ext_hash, pool="rpc"
+                )
             SBUTTONS = bt_selection_buttons(ext_hash)
             msg = "Your download paused. Choose files then press Done Selecting button to start downloading."
             await sendMessage(listener.message, msg, SBUTTONS)
@@ -141,7 +146,9 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
                     return
                 download_dict[listener.uid].queued = False
 
-            await sync_to_async(client.torrents_resume, torrent_hashes=ext_hash)
+            await sync_to_async(
+                client.torrents_resume, torrent_hashes=ext_hash, pool="rpc"
+            )
             LOGGER.info(
                 f"Start Queued Download from Qbittorrent: {tor_info.name} - Hash: {ext_hash}"
             )
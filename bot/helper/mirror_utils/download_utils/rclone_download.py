@@ -13,6 +13,7 @@ from bot import (
 from bot.helper.ext_utils.bot_utils import cmd_exec
 from bot.helper.telegram_helper.message_utils import sendMessage, sendStatusMessage
 from bot.helper.ext_utils.task_manager import is_queued, stop_duplicate_check
+from bot.helper.ext_utils.storage_ledger import reserve_storage
 from bot.helper.mirror_utils.status_utils.rclone_status import RcloneStatus
 from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
 from bot.helper.mirror_utils.rclone_utils.transfer import RcloneTransferHelper
@@ -68,6 +69,7 @@ async def add_rclone_download(rc_path, config_path, path, name, listener):
         await sendMessage(listener.message, msg, button)
         return
 
+    reserve_storage(listener.uid, size, listener.storage_copies(), listener.seed)
     added_to_queue, event = await is_queued(listener.uid)
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {name}")
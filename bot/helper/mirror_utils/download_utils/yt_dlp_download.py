@@ -245,7 +245,7 @@ class YoutubeDLHelper:
         if options:
             self.__set_options(options)
 
-        await sync_to_async(self.extractMetaData, link, name)
+        await sync_to_async(self.extractMetaData, link, name, pool="scrape")
         if self.__is_cancelled:
             return
 
@@ -345,7 +345,7 @@ class YoutubeDLHelper:
         async with queue_dict_lock:
             non_queued_dl.add(self.__listener.uid)
 
-        await sync_to_async(self.__download, link, path)
+        await sync_to_async(self.__download, link, path, pool="download")
 
     async def cancel_download(self):
         self.__is_cancelled = True
@@ -1,10 +1,8 @@
 #!/usr/bin/env python3
-from asyncio import wait_for, Event, wrap_future
+from asyncio import Event, wrap_future
 from aiofiles.os import path as aiopath
 from aiofiles import open as aiopen
 from configparser import ConfigParser
-from pyrogram.handlers import CallbackQueryHandler
-from pyrogram.filters import regex, user
 from functools import partial
 from json import loads
 from time import time
@@ -12,6 +10,7 @@ from time import time
 from bot import LOGGER, config_dict
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.conversation import conversations
 from bot.helper.telegram_helper.message_utils import (
     sendMessage,
     editMessage,
@@ -136,19 +135,21 @@ class RcloneList:
     @new_thread
     async def __event_handler(self):
         pfunc = partial(path_updates, obj=self)
-        handler = self.__client.add_handler(
-            CallbackQueryHandler(pfunc, filters=regex("^rcq") & user(self.__user_id)),
-            group=-1,
-        )
         try:
-            await wait_for(self.event.wait(), timeout=self.__timeout)
+            await conversations.serve(
+                self.__message.chat.id,
+                self.__user_id,
+                lambda: self.__reply_to,
+                pfunc,
+                lambda query: query.data.startswith("rcq"),
+                self.event,
+                self.__timeout,
+            )
         except Exception:
             self.path = ""
             self.remote = "Timed Out. Task has been cancelled!"
             self.is_cancelled = True
             self.event.set()
-        finally:
-            self.__client.remove_handler(*handler)
 
     async def __send_list_message(self, msg, button):
         if not self.is_cancelled:
@@ -9,7 +9,12 @@ from random import randrange
 from logging import getLogger
 
 from bot import config_dict, GLOBAL_EXTENSION_FILTER
-from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async
+from bot.helper.ext_utils.bot_utils import (
+    cmd_exec,
+    sync_to_async,
+    get_size_bytes,
+    get_time_seconds,
+)
 from bot.helper.ext_utils.fs_utils import get_mime_type, count_files_and_folders
 
 
@@ -25,6 +30,11 @@ class RcloneTransferHelper:
         self.__percentage = "0%"
         self.__speed = "0 B/s"
         self.__size = "0 B"
+        self.processed_raw = 0
+        self.size_raw = 0
+        self.speed_raw = 0
+        self.progress_raw = 0
+        self.eta_raw = None
         self.__is_cancelled = False
         self.__is_download = False
         self.__is_upload = False
@@ -72,6 +82,11 @@ class RcloneTransferHelper:
                     self.__speed,
                     self.__eta,
                 ) = data[0]
+                self.processed_raw = get_size_bytes(self.__transferred_size)
+                self.size_raw = get_size_bytes(self.__size)
+                self.speed_raw = get_size_bytes(self.__speed)
+                self.progress_raw = float(self.__percentage.rstrip("%"))
+                self.eta_raw = get_time_seconds(self.__eta)
 
     def __switchServiceAccount(self):
         if self.__sa_index == self.__sa_number - 1:
@@ -287,7 +302,7 @@ class RcloneTransferHelper:
                     "This file extension is excluded by extension filter!"
                 )
                 return
-            mime_type = await sync_to_async(get_mime_type, path)
+            mime_type = await sync_to_async(get_mime_type, path, pool="fs")
             folders = 0
             files = 1
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from time import time
+from datetime import timedelta
 
 from bot import aria2, LOGGER
 from bot.helper.ext_utils.bot_utils import (
@@ -8,6 +9,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
     sync_to_async,
 )
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
 
 
 def get_download(gid):
@@ -31,10 +33,12 @@ class Aria2Status:
         self.message = self.__listener.message
 
     def __update(self):
-        if self.__download is None:
+        if (download := engine_snapshot.get_aria2(self.__gid)) is not None:
+            self.__download = download
+        elif self.__download is None or not engine_snapshot.aria2_fresh():
+            # A fresh snapshot without the gid means it was just removed, the
+            # last state stands instead of asking aria2 on every render
             self.__download = get_download(self.__gid)
-        else:
-            self.__download = self.__download.live
         if self.__download.followed_by_ids:
             self.__gid = self.__download.followed_by_ids[0]
             self.__download = get_download(self.__gid)
@@ -54,9 +58,26 @@ class Aria2Status:
     def size(self):
         return self.__download.total_length_string()
 
+    def size_raw(self):
+        return self.__download.total_length
+
+    def processed_raw(self):
+        return self.__download.completed_length
+
+    def speed_raw(self):
+        return self.__download.download_speed
+
+    def progress_raw(self):
+        return self.__download.progress
+
     def eta(self):
         return self.__download.eta_string()
 
+    def eta_raw(self):
+        if (eta := self.__download.eta) == timedelta.max:
+            return None
+        return eta.total_seconds()
+
     def listener(self):
         return self.__listener
 
@@ -87,6 +108,13 @@ class Aria2Status:
         self.__update()
         return self.__download.upload_speed_string()
 
+    def uploaded_raw(self):
+        return self.__download.upload_length
+
+    def upload_speed_raw(self):
+        self.__update()
+        return self.__download.upload_speed
+
     def ratio(self):
         return f"{round(self.__download.upload_length / self.__download.completed_length, 3)}"
 
@@ -102,18 +130,22 @@ class Aria2Status:
 
     async def cancel_download(self):
         self.__update()
-        await sync_to_async(self.__update)
+        await sync_to_async(self.__update, pool="rpc")
         if self.__download.seeder and self.seeding:
             LOGGER.info(f"Cancelling Seed: {self.name()}")
             await self.__listener.onUploadError(
                 f"Seeding stopped with Ratio: {self.ratio()} and Time: {self.seeding_time()}"
             )
-            await sync_to_async(aria2.remove, [self.__download], force=True, files=True)
+            await sync_to_async(
+                aria2.remove, [self.__download], force=True, files=True, pool="rpc"
+            )
         elif downloads := self.__download.followed_by:
             LOGGER.info(f"Cancelling Download: {self.name()}")
             await self.__listener.onDownloadError("Download cancelled by user!")
             downloads.append(self.__download)
-            await sync_to_async(aria2.remove, downloads, force=True, files=True)
+            await sync_to_async(
+                aria2.remove, downloads, force=True, files=True, pool="rpc"
+            )
         else:
             if self.queued:
                 LOGGER.info(f"Cancelling QueueDl: {self.name()}")
@@ -122,7 +154,9 @@ class Aria2Status:
                 LOGGER.info(f"Cancelling Download: {self.name()}")
                 msg = "Download stopped by user!"
             await self.__listener.onDownloadError(msg)
-            await sync_to_async(aria2.remove, [self.__download], force=True, files=True)
+            await sync_to_async(
+                aria2.remove, [self.__download], force=True, files=True, pool="rpc"
+            )
 
     def eng(self):
         return EngineStatus().STATUS_ARIA
@@ -28,31 +28,44 @@ class DirectStatus:
     def progress(self):
         return f"{round(self.progress_raw(), 2)}%"
 
+    def speed_raw(self):
+        return self.__obj.speed
+
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def name(self):
         return self.__obj.name
 
+    def size_raw(self):
+        return self.__obj.total_size
+
     def size(self):
-        return get_readable_file_size(self.__obj.total_size)
+        return get_readable_file_size(self.size_raw())
 
-    def eta(self):
+    def eta_raw(self):
         try:
-            seconds = (
+            return (
                 self.__obj.total_size - self.__obj.processed_bytes
             ) / self.__obj.speed
-            return get_readable_time(seconds)
         except Exception:
+            return None
+
+    def eta(self):
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def status(self):
-        if self.__obj.task and self.__obj.task.is_waiting:
+        if self.__obj.is_waiting:
             return MirrorStatus.STATUS_QUEUEDL
         return MirrorStatus.STATUS_DOWNLOADING
 
+    def processed_raw(self):
+        return self.__obj.processed_bytes
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_raw())
 
     def download(self):
         return self.__obj
@@ -16,8 +16,14 @@ class GdriveStatus:
         self.upload_details = upload_details
         self.message = message
 
+    def processed_raw(self):
+        return self.__obj.processed_bytes
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_raw())
+
+    def size_raw(self):
+        return self.__size
 
     def size(self):
         return get_readable_file_size(self.__size)
@@ -45,15 +51,22 @@ class GdriveStatus:
     def progress(self):
         return f"{round(self.progress_raw(), 2)}%"
 
+    def speed_raw(self):
+        return self.__obj.speed
+
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
-    def eta(self):
+    def eta_raw(self):
         try:
-            seconds = (self.__size - self.__obj.processed_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
+            return (self.__size - self.__obj.processed_bytes) / self.__obj.speed
         except Exception:
+            return None
+
+    def eta(self):
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def download(self):
         return self.__obj
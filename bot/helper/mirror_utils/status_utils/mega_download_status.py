@@ -32,21 +32,34 @@ class MegaDownloadStatus:
     def status(self):
         return MirrorStatus.STATUS_DOWNLOADING
 
+    def processed_raw(self):
+        return self.__obj.downloaded_bytes
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.downloaded_bytes)
+        return get_readable_file_size(self.processed_raw())
 
-    def eta(self):
+    def eta_raw(self):
         try:
-            seconds = (self.__size - self.__obj.downloaded_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
+            return (self.__size - self.__obj.downloaded_bytes) / self.__obj.speed
         except ZeroDivisionError:
+            return None
+
+    def eta(self):
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
+
+    def size_raw(self):
+        return self.__size
 
     def size(self):
         return get_readable_file_size(self.__size)
 
+    def speed_raw(self):
+        return self.__obj.speed
+
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def gid(self):
         return self.__gid
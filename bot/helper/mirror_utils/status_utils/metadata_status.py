@@ -23,24 +23,39 @@ class MetadataStatus:
     def progress(self):
         return "0"
 
+    def progress_raw(self):
+        return 0
+
     def speed(self):
         return "0"
 
+    def speed_raw(self):
+        return 0
+
     def name(self):
         return self.__name
 
     def size(self):
         return get_readable_file_size(self.__size)
 
+    def size_raw(self):
+        return self.__size
+
     def eta(self):
         return "0s"
 
+    def eta_raw(self):
+        return None
+
     def status(self):
         return MirrorStatus.STATUS_METADATA
 
     def processed_bytes(self):
         return 0
 
+    def processed_raw(self):
+        return 0
+
     def download(self):
         return self
 
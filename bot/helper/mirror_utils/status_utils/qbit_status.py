@@ -9,6 +9,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
     sync_to_async,
 )
+from bot.helper.ext_utils.engine_snapshot import engine_snapshot
 
 
 def get_download(client, tag):
@@ -31,18 +32,29 @@ class QbittorrentStatus:
         self.message = listener.message
 
     def __update(self):
-        new_info = get_download(self.__client, f"{self.__listener.uid}")
+        tag = f"{self.__listener.uid}"
+        if (new_info := engine_snapshot.get_qbit(tag)) is None:
+            new_info = get_download(self.__client, tag)
         if new_info is not None:
             self.__info = new_info
 
+    def progress_raw(self):
+        return self.__info.progress * 100
+
     def progress(self):
-        return f"{round(self.__info.progress*100, 2)}%"
+        return f"{round(self.progress_raw(), 2)}%"
+
+    def processed_raw(self):
+        return self.__info.downloaded
 
     def processed_bytes(self):
-        return get_readable_file_size(self.__info.downloaded)
+        return get_readable_file_size(self.processed_raw())
+
+    def speed_raw(self):
+        return self.__info.dlspeed
 
     def speed(self):
-        return f"{get_readable_file_size(self.__info.dlspeed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def name(self):
         if self.__info.state in ["metaDL", "checkingResumeData"]:
@@ -51,7 +63,14 @@ class QbittorrentStatus:
             return self.__info.name
 
     def size(self):
-        return get_readable_file_size(self.__info.size)
+        return get_readable_file_size(self.size_raw())
+
+    def size_raw(self):
+        return self.__info.size
+
+    def eta_raw(self):
+        # qBittorrent reports 8640000 (100 days) when it has no estimate
+        return None if self.__info.eta >= 8640000 else self.__info.eta
 
     def eta(self):
         return get_readable_time(self.__info.eta)
@@ -78,11 +97,17 @@ class QbittorrentStatus:
     def leechers_num(self):
         return self.__info.num_leechs
 
+    def uploaded_raw(self):
+        return self.__info.uploaded
+
     def uploaded_bytes(self):
-        return get_readable_file_size(self.__info.uploaded)
+        return get_readable_file_size(self.uploaded_raw())
+
+    def upload_speed_raw(self):
+        return self.__info.upspeed
 
     def upload_speed(self):
-        return f"{get_readable_file_size(self.__info.upspeed)}/s"
+        return f"{get_readable_file_size(self.upload_speed_raw())}/s"
 
     def ratio(self):
         return f"{round(self.__info.ratio, 3)}"
@@ -109,7 +134,7 @@ class QbittorrentStatus:
     async def cancel_download(self):
         self.__update()
         await sync_to_async(
-            self.__client.torrents_pause, torrent_hashes=self.__info.hash
+            self.__client.torrents_pause, torrent_hashes=self.__info.hash, pool="rpc"
         )
         if not self.seeding:
             if self.queued:
@@ -124,9 +149,10 @@ class QbittorrentStatus:
                 self.__client.torrents_delete,
                 torrent_hashes=self.__info.hash,
                 delete_files=True,
+                pool="rpc",
             )
             await sync_to_async(
-                self.__client.torrents_delete_tags, tags=self.__info.tags
+                self.__client.torrents_delete_tags, tags=self.__info.tags, pool="rpc"
             )
             async with qb_listener_lock:
                 if self.__info.tags in QbTorrents:
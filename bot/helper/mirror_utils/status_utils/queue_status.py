@@ -26,32 +26,57 @@ class QueueStatus:
     def size(self):
         return get_readable_file_size(self.__size)
 
+    def size_raw(self):
+        return self.__size
+
     def status(self):
         if self.__status == "dl":
             return MirrorStatus.STATUS_QUEUEDL
+        elif self.__status == "pp":
+            return MirrorStatus.STATUS_QUEUEPP
         return MirrorStatus.STATUS_QUEUEUP
 
     def processed_bytes(self):
         return 0
 
+    def processed_raw(self):
+        return 0
+
     def progress(self):
         return "0%"
 
+    def progress_raw(self):
+        return 0
+
     def speed(self):
         return "0B/s"
 
+    def speed_raw(self):
+        return 0
+
     def eta(self):
         return "-"
 
+    def eta_raw(self):
+        return None
+
     def download(self):
         return self
 
+    def listener(self):
+        return self.__listener
+
     async def cancel_download(self):
         LOGGER.info(f"Cancelling Queue{self.__status}: {self.__name}")
         if self.__status == "dl":
             await self.__listener.onDownloadError(
                 "task have been removed from queue/download"
             )
+        elif self.__status == "pp":
+            self.__listener.suproc = "cancelled"
+            await self.__listener.onUploadError(
+                "task have been removed from queue/post-processing"
+            )
         else:
             await self.__listener.onUploadError(
                 "task have been removed from queue/upload"
@@ -15,18 +15,30 @@ class RcloneStatus:
     def progress(self):
         return self.__obj.percentage
 
+    def progress_raw(self):
+        return self.__obj.progress_raw
+
     def speed(self):
         return self.__obj.speed
 
+    def speed_raw(self):
+        return self.__obj.speed_raw
+
     def name(self):
         return self.__obj.name
 
     def size(self):
         return self.__obj.size
 
+    def size_raw(self):
+        return self.__obj.size_raw
+
     def eta(self):
         return self.__obj.eta
 
+    def eta_raw(self):
+        return self.__obj.eta_raw
+
     def status(self):
         if self.__status == "dl":
             return MirrorStatus.STATUS_DOWNLOADING
@@ -38,6 +50,9 @@ class RcloneStatus:
     def processed_bytes(self):
         return self.__obj.transferred_size
 
+    def processed_raw(self):
+        return self.__obj.processed_raw
+
     def download(self):
         return self.__obj
 
@@ -16,8 +16,14 @@ class TelegramStatus:
         self.upload_details = upload_details
         self.message = message
 
+    def processed_raw(self):
+        return self.__obj.processed_bytes
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_raw())
+
+    def size_raw(self):
+        return self.__size
 
     def size(self):
         return get_readable_file_size(self.__size)
@@ -30,22 +36,31 @@ class TelegramStatus:
     def name(self):
         return self.__obj.name
 
-    def progress(self):
+    def progress_raw(self):
         try:
-            progress_raw = self.__obj.processed_bytes / self.__size * 100
+            return self.__obj.processed_bytes / self.__size * 100
         except Exception:
-            progress_raw = 0
-        return f"{round(progress_raw, 2)}%"
+            return 0
+
+    def progress(self):
+        return f"{round(self.progress_raw(), 2)}%"
+
+    def speed_raw(self):
+        return self.__obj.speed
 
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
-    def eta(self):
+    def eta_raw(self):
         try:
-            seconds = (self.__size - self.__obj.processed_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
+            return (self.__size - self.__obj.processed_bytes) / self.__obj.speed
         except Exception:
+            return None
+
+    def eta(self):
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def gid(self) -> str:
         return self.__gid
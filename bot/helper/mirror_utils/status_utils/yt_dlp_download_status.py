@@ -29,6 +29,9 @@ class YtDlpDownloadStatus:
         else:
             return async_to_sync(get_path_size, self.__listener.dir)
 
+    def size_raw(self):
+        return self.__obj.size
+
     def size(self):
         return get_readable_file_size(self.__obj.size)
 
@@ -38,22 +41,30 @@ class YtDlpDownloadStatus:
     def name(self):
         return self.__obj.name
 
+    def progress_raw(self):
+        return self.__obj.progress
+
     def progress(self):
-        return f"{round(self.__obj.progress, 2)}%"
+        return f"{round(self.progress_raw(), 2)}%"
+
+    def speed_raw(self):
+        return self.__obj.download_speed
 
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.download_speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
-    def eta(self):
+    def eta_raw(self):
         if self.__obj.eta != "-":
-            return get_readable_time(self.__obj.eta)
+            return self.__obj.eta
         try:
-            seconds = (
-                self.__obj.size - self.processed_raw()
-            ) / self.__obj.download_speed
-            return get_readable_time(seconds)
+            return (self.__obj.size - self.processed_raw()) / self.__obj.download_speed
         except Exception:
+            return None
+
+    def eta(self):
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def download(self):
         return self.__obj
@@ -47,12 +47,19 @@ class ZipStatus:
     def size(self):
         return get_readable_file_size(self.__size)
 
-    def eta(self):
+    def size_raw(self):
+        return self.__size
+
+    def eta_raw(self):
         try:
-            seconds = (self.__size - self.processed_raw()) / self.speed_raw()
-            return get_readable_time(seconds)
+            return (self.__size - self.processed_raw()) / self.speed_raw()
         except Exception:
+            return None
+
+    def eta(self):
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def status(self):
         return MirrorStatus.STATUS_ARCHIVING
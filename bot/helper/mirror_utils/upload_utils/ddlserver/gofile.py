@@ -84,7 +84,7 @@ class Gofile:
 
         folderId = folderId or folder_data["folderId"]
         folder_ids = {".": folderId}
-        for root, _, files in await sync_to_async(walk, path):
+        for root, _, files in await sync_to_async(walk, path, pool="fs"):
             rel_path = ospath.relpath(root, path)
             parentFolderId = folder_ids.get(ospath.dirname(rel_path), folderId)
             folder_name = ospath.basename(rel_path)
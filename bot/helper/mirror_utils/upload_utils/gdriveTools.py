@@ -28,6 +28,7 @@ from bot.helper.ext_utils.bot_utils import (
 )
 from bot.helper.ext_utils.fs_utils import get_mime_type
 from bot.helper.ext_utils.leech_utils import format_filename
+from bot.helper.ext_utils.metrics import metrics
 
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
@@ -121,6 +122,7 @@ class GoogleDriveHelper:
         else:
             self.__sa_index += 1
         self.__sa_count += 1
+        metrics.inc("drive_sa_switch_total")
         LOGGER.info(f"Switching to {self.__sa_index} index")
         self.__service = self.__authorize()
 
@@ -473,6 +475,7 @@ class GoogleDriveHelper:
                         "dailyLimitExceeded",
                     ]:
                         raise err
+                    metrics.inc("drive_rate_limit_total", reason=reason)
                     if config_dict["USE_SERVICE_ACCOUNTS"]:
                         if self.__sa_count >= self.__sa_number:
                             LOGGER.info(
@@ -613,6 +616,7 @@ class GoogleDriveHelper:
                     "cannotCopyFile",
                 ]:
                     raise err
+                metrics.inc("drive_rate_limit_total", reason=reason)
                 if reason == "cannotCopyFile":
                     LOGGER.error(err)
                 elif config_dict["USE_SERVICE_ACCOUNTS"]:
@@ -1024,6 +1028,7 @@ class GoogleDriveHelper:
                         "dailyLimitExceeded",
                     ]:
                         raise err
+                    metrics.inc("drive_rate_limit_total", reason=reason)
                     if config_dict["USE_SERVICE_ACCOUNTS"]:
                         if self.__sa_count >= self.__sa_number:
                             LOGGER.info(
@@ -45,6 +45,7 @@ from bot.helper.telegram_helper.message_utils import (
     get_tg_link_content,
 )
 from bot.helper.ext_utils.fs_utils import clean_unwanted, is_archive, get_base_name
+from bot.helper.ext_utils.metrics import metrics
 from bot.helper.ext_utils.bot_utils import (
     get_readable_file_size,
     is_telegram_link,
@@ -97,6 +98,10 @@ class TgUploader:
         self.__user_id = listener.message.from_user.id
         self.__leechmsg = {}
         self.__leech_utils = self.__listener.leech_utils
+        self.__started = False
+        self.__early = False
+        self.__early_files = set()
+        self.__log_deleted = False
 
     async def get_custom_thumb(self, thumb):
         if is_telegram_link(thumb):
@@ -121,7 +126,7 @@ class TgUploader:
                 await mkdir(path)
             des_dir = ospath.join(path, f"{time()}.jpg")
             await sync_to_async(
-                Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG"
+                Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG", pool="fs"
             )
             await aioremove(photo_dir)
             return des_dir
@@ -294,19 +299,15 @@ class TgUploader:
                     ),
                 )
             except Exception as er:
-                await self.__listener.onUploadError(str(er))
-                return False
+                return str(er)
             self.__sent_msg = list(self.__leechmsg.values())[0]
         elif IS_PREMIUM_USER:
             if not self.__listener.isSuperGroup:
-                await self.__listener.onUploadError(
-                    "Use SuperGroup to leech with User Client! or Set LEECH_LOG_ID to Leech in PM"
-                )
-                return False
+                return "Use SuperGroup to leech with User Client! or Set LEECH_LOG_ID to Leech in PM"
             self.__sent_msg = self.__listener.message
         else:
             self.__sent_msg = self.__listener.message
-        return True
+        return ""
 
     async def __prepare_file(self, prefile_, dirpath):
         try:
@@ -318,7 +319,7 @@ class TgUploader:
             )
         if prefile_ != file_:
             if (
-                self.__listener.seed
+                self.__keep_source()
                 and not self.__listener.newDir
                 and not dirpath.endswith("/splited_files_mltb")
             ):
@@ -347,7 +348,7 @@ class TgUploader:
             remain = 64 - extn
             name = name[:remain]
             if (
-                self.__listener.seed
+                self.__keep_source()
                 and not self.__listener.newDir
                 and not dirpath.endswith("/splited_files_mltb")
             ):
@@ -427,88 +428,145 @@ class TgUploader:
             if not self.__is_cancelled:
                 LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
 
-    async def upload(self, o_files, m_size, size):
+    def __keep_source(self):
+        return self.__listener.seed or self.__early
+
+    async def __start(self):
+        if self.__started:
+            return ""
         await self.__user_settings()
-        res = await self.__msg_to_reply()
-        if not res:
+        if err := await self.__msg_to_reply():
+            return err
+        self.__started = True
+        return ""
+
+    async def __upload_path(self, dirpath, file_, o_files, m_size, uploaded):
+        self.__up_path = ospath.join(dirpath, file_)
+        if file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
+            if not self.__early:
+                await aioremove(self.__up_path)
+            return True
+        try:
+            o_path = self.__up_path
+            if o_path in uploaded or o_path in self.__early_files:
+                return True
+            f_size = await aiopath.getsize(self.__up_path)
+            if self.__listener.seed and file_ in o_files and f_size in m_size:
+                return True
+            if f_size == 0 and self.__early:
+                return True
+            if not self.__early:
+                self.__total_files += 1
+            if f_size == 0:
+                LOGGER.error(
+                    f"{self.__up_path} size is zero, telegram don't upload zero size files"
+                )
+                self.__corrupted += 1
+                return True
+            if self.__is_cancelled:
+                return False
+            self.__prm_media = True if f_size > 2097152000 else False
+            cap_mono, file_ = await self.__prepare_file(file_, dirpath)
+            if self.__last_msg_in_group:
+                group_lists = [x for v in self.__media_dict.values() for x in v.keys()]
+                if (
+                    match := re_match(
+                        r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", self.__up_path
+                    )
+                ) and match.group(0) not in group_lists:
+                    for key, value in list(self.__media_dict.items()):
+                        for subkey, msgs in list(value.items()):
+                            if len(msgs) > 1:
+                                await self.__send_media_group(subkey, key, msgs)
+            self.__last_msg_in_group = False
+            self.__last_uploaded = 0
+            await self.__switching_client()
+            await self.__upload_file(cap_mono, file_)
+            if (
+                self.__leechmsg
+                and not self.__log_deleted
+                and config_dict["CLEAN_LOG_MSG"]
+            ):
+                await deleteMessage(list(self.__leechmsg.values())[0])
+                self.__log_deleted = True
+            if self.__is_cancelled:
+                return False
+            if not self.__is_corrupted and (
+                self.__listener.isSuperGroup or config_dict["LEECH_LOG_ID"]
+            ):
+                self.__msgs_dict[self.__sent_msg.link] = file_
+            if not self.__is_corrupted:
+                await self.__listener.journal_upload(
+                    o_path,
+                    (
+                        self.__sent_msg.link
+                        if self.__sent_msg.link in self.__msgs_dict
+                        else ""
+                    ),
+                    file_,
+                )
+                # Only files that really went up are skipped by the final pass
+                if self.__early:
+                    self.__total_files += 1
+                    self.__early_files.add(o_path)
+            await sleep(1)
+        except Exception as err:
+            if isinstance(err, RetryError):
+                LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
+            else:
+                LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
+            if self.__is_cancelled:
+                return False
+            if self.__early:
+                LOGGER.error(f"Leaving {self.__up_path} for the final upload")
+        finally:
+            if (
+                not self.__is_cancelled
+                and await aiopath.exists(self.__up_path)
+                and (
+                    not self.__keep_source()
+                    or self.__listener.newDir
+                    or dirpath.endswith("/splited_files_mltb")
+                    or "/copied_mltb/" in self.__up_path
+                )
+            ):
+                await aioremove(self.__up_path)
+        return True
+
+    async def upload_early(self, path):
+        # Called while the download is still running, so the source file must be
+        # left exactly where it is: renames go through copied_mltb like seeding
+        self.__early = True
+        if err := await self.__start():
+            LOGGER.error(f"{err}. Leaving {path} for the final upload")
+            return False
+        dirpath, file_ = path.rsplit("/", 1)
+        return await self.__upload_path(dirpath, file_, [], [], {})
+
+    def stop_early(self):
+        self.__is_cancelled = True
+
+    async def upload(self, o_files, m_size, size):
+        self.__early = False
+        if err := await self.__start():
+            await self.__listener.onUploadError(err)
             return
-        isDeleted = False
-        for dirpath, _, files in sorted(await sync_to_async(walk, self.__path)):
+        uploaded = {}
+        for item in self.__listener.journal.get("uploaded", []):
+            uploaded[item["path"]] = item
+            if item["link"]:
+                self.__msgs_dict[item["link"]] = item["name"]
+        self.__total_files += len(uploaded)
+        for dirpath, _, files in sorted(
+            await sync_to_async(walk, self.__path, pool="fs")
+        ):
             if dirpath.endswith("/yt-dlp-thumb"):
                 continue
             for file_ in natsorted(files):
-                self.__up_path = ospath.join(dirpath, file_)
-                if file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                    await aioremove(self.__up_path)
-                    continue
-                try:
-                    f_size = await aiopath.getsize(self.__up_path)
-                    if self.__listener.seed and file_ in o_files and f_size in m_size:
-                        continue
-                    self.__total_files += 1
-                    if f_size == 0:
-                        LOGGER.error(
-                            f"{self.__up_path} size is zero, telegram don't upload zero size files"
-                        )
-                        self.__corrupted += 1
-                        continue
-                    if self.__is_cancelled:
-                        return
-                    self.__prm_media = True if f_size > 2097152000 else False
-                    cap_mono, file_ = await self.__prepare_file(file_, dirpath)
-                    if self.__last_msg_in_group:
-                        group_lists = [
-                            x for v in self.__media_dict.values() for x in v.keys()
-                        ]
-                        if (
-                            match := re_match(
-                                r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", self.__up_path
-                            )
-                        ) and match.group(0) not in group_lists:
-                            for key, value in list(self.__media_dict.items()):
-                                for subkey, msgs in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self.__send_media_group(subkey, key, msgs)
-                    self.__last_msg_in_group = False
-                    self.__last_uploaded = 0
-                    await self.__switching_client()
-                    await self.__upload_file(cap_mono, file_)
-                    if (
-                        self.__leechmsg
-                        and not isDeleted
-                        and config_dict["CLEAN_LOG_MSG"]
-                    ):
-                        await deleteMessage(list(self.__leechmsg.values())[0])
-                        isDeleted = True
-                    if self.__is_cancelled:
-                        return
-                    if not self.__is_corrupted and (
-                        self.__listener.isSuperGroup or config_dict["LEECH_LOG_ID"]
-                    ):
-                        self.__msgs_dict[self.__sent_msg.link] = file_
-                    await sleep(1)
-                except Exception as err:
-                    if isinstance(err, RetryError):
-                        LOGGER.info(
-                            f"Total Attempts: {err.last_attempt.attempt_number}"
-                        )
-                    else:
-                        LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
-                    if self.__is_cancelled:
-                        return
-                    continue
-                finally:
-                    if (
-                        not self.__is_cancelled
-                        and await aiopath.exists(self.__up_path)
-                        and (
-                            not self.__listener.seed
-                            or self.__listener.newDir
-                            or dirpath.endswith("/splited_files_mltb")
-                            or "/copied_mltb/" in self.__up_path
-                        )
-                    ):
-                        await aioremove(self.__up_path)
+                if not await self.__upload_path(
+                    dirpath, file_, o_files, m_size, uploaded
+                ):
+                    return
         for key, value in list(self.__media_dict.items()):
             for subkey, msgs in list(value.items()):
                 if len(msgs) > 1:
@@ -618,7 +676,7 @@ class TgUploader:
                 if not self.__up_path.upper().endswith(("MKV", "MP4")):
                     dirpath, file_ = self.__up_path.rsplit("/", 1)
                     if (
-                        self.__listener.seed
+                        self.__keep_source()
                         and not self.__listener.newDir
                         and not dirpath.endswith("/splited_files_mltb")
                     ):
@@ -732,7 +790,9 @@ class TgUploader:
                     await rmdir(dir_name)
             self.__retry_error = False
         except FloodWait as f:
+            metrics.flood_wait(f.value)
             LOGGER.warning(str(f))
+            self.__is_corrupted = True
             await sleep(f.value)
         except Exception as err:
             self.__retry_error = True
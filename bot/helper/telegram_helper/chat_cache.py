@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+from time import monotonic
+from collections import OrderedDict
+from asyncio import shield, gather
+from pyrogram.enums import ChatMemberStatus
+from pyrogram.errors import PeerIdInvalid, ChannelInvalid, UserNotParticipant
+from pyrogram.handlers import ChatMemberUpdatedHandler
+
+from bot import bot, bot_loop, user_data, LOGGER
+
+CHAT_TTL = 600
+INVALID_TTL = 60
+MEMBER_TTL = 300
+NOT_MEMBER_TTL = 60
+MAX_ENTRIES = 10000
+
+
+class ChatCache:
+    # Dump and log chats are looked up for every uploaded file and authorized
+    # channels for every settings command, the answers barely ever change
+    def __init__(self):
+        self.__chats = OrderedDict()
+        self.__members = OrderedDict()
+        self.__pending = {}
+        self.__authorized = None
+
+    @staticmethod
+    def __store(cache, key, entry):
+        # Least recently used entries go first once the cache is full
+        cache[key] = entry
+        cache.move_to_end(key)
+        while len(cache) > MAX_ENTRIES:
+            cache.popitem(last=False)
+
+    async def __load(self, cache, key, fetch):
+        now = monotonic()
+        if (entry := cache.get(key)) is not None and entry[0] > now:
+            cache.move_to_end(key)
+            return entry[1]
+        # Concurrent misses for the same key share one request
+        if (task := self.__pending.get((id(cache), key))) is None:
+            task = self.__pending[(id(cache), key)] = bot_loop.create_task(fetch())
+            task.add_done_callback(lambda _: self.__pending.pop((id(cache), key), None))
+        value, ttl = await shield(task)
+        self.__store(cache, key, (monotonic() + ttl, value))
+        return value
+
+    async def get_chat(self, chat_id, refresh=False):
+        async def fetch():
+            try:
+                return await bot.get_chat(chat_id), CHAT_TTL
+            except (PeerIdInvalid, ChannelInvalid) as e:
+                LOGGER.error(f"{e.NAME}: {e.MESSAGE} for {chat_id}")
+                return None, INVALID_TTL
+
+        if refresh:
+            self.__chats.pop(chat_id, None)
+        return await self.__load(self.__chats, chat_id, fetch)
+
+    async def get_member(self, chat, user_id):
+        async def fetch():
+            try:
+                return await chat.get_member(user_id), MEMBER_TTL
+            except UserNotParticipant:
+                return None, NOT_MEMBER_TTL
+
+        return await self.__load(self.__members, (chat.id, user_id), fetch)
+
+    async def __lookup_member(self, chat_id, user_id):
+        if (chat := await self.get_chat(chat_id)) is None:
+            return None
+        return await self.get_member(chat, user_id)
+
+    async def is_member_of_any(self, chat_ids, user_id):
+        # Known answers come from memory, the unknown ones are asked together
+        now, unknown = monotonic(), []
+        for chat_id in chat_ids:
+            if (entry := self.__members.get((chat_id, user_id))) and entry[0] > now:
+                self.__members.move_to_end((chat_id, user_id))
+                if entry[1] is not None:
+                    return True
+            else:
+                unknown.append(chat_id)
+        if not unknown:
+            return False
+        members = await gather(
+            *(self.__lookup_member(chat_id, user_id) for chat_id in unknown),
+            return_exceptions=True,
+        )
+        return any(
+            member is not None and not isinstance(member, Exception)
+            for member in members
+        )
+
+    def authorized_chats(self):
+        if self.__authorized is None:
+            self.__authorized = [
+                chat_id
+                for chat_id, data in list(user_data.items())
+                if data.get("is_auth") and str(chat_id).startswith("-100")
+            ]
+        return self.__authorized
+
+    def auth_changed(self):
+        self.__authorized = None
+
+    async def member_updated(self, _, update):
+        # Joins and leaves in chats where the bot is admin keep the answers
+        # fresh between lookups
+        member = update.new_chat_member or update.old_chat_member
+        if member is None or member.user is None:
+            return
+        if update.new_chat_member and member.status not in [
+            ChatMemberStatus.LEFT,
+            ChatMemberStatus.BANNED,
+        ]:
+            entry = (monotonic() + MEMBER_TTL, member)
+        else:
+            entry = (monotonic() + NOT_MEMBER_TTL, None)
+        self.__store(self.__members, (update.chat.id, member.user.id), entry)
+
+    def clear(self):
+        self.__chats.clear()
+        self.__members.clear()
+        self.__authorized = None
+
+
+chat_cache = ChatCache()
+bot.add_handler(ChatMemberUpdatedHandler(chat_cache.member_updated), group=-1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+from inspect import iscoroutine
+from asyncio import wait_for
+from pyrogram.filters import create
+from pyrogram.types import CallbackQuery
+from pyrogram.handlers import MessageHandler, CallbackQueryHandler
+
+from bot import bot, bot_loop
+
+
+class Waiter:
+    def __init__(self, check, callback=None, prompt=None):
+        self.check = check
+        self.callback = callback
+        self.prompt = prompt
+        self.future = bot_loop.create_future()
+
+
+class ConversationRouter:
+    # One handler per update type for every pending prompt, keyed by chat and
+    # user so an update costs a dict lookup however many prompts are open.
+    # Under that each module keeps its own prompts in a scope, and a button
+    # selection only gets presses on its own prompt message
+    def __init__(self):
+        self.__waiters = {}
+
+    @staticmethod
+    def __key(update):
+        if isinstance(update, CallbackQuery):
+            if update.message is None:
+                return None
+            return ("query", update.message.chat.id, update.from_user.id)
+        if (user := update.from_user or update.sender_chat) is None:
+            return None
+        return ("message", update.chat.id, user.id)
+
+    def __find(self, update):
+        if (waiters := self.__waiters.get(key := self.__key(update))) is None:
+            return key, None, None
+        # Newest prompt first, as a newer one in the same chat used to win
+        for scope, waiter in reversed(list(waiters.items())):
+            if waiter.prompt is not None and (
+                getattr(waiter.prompt(), "id", None) != update.message.id
+            ):
+                continue
+            if waiter.check is None or waiter.check(update):
+                return key, scope, waiter
+        return key, None, None
+
+    async def __match(self, _, update):
+        return self.__find(update)[2] is not None
+
+    async def __route(self, client, update):
+        key, scope, waiter = self.__find(update)
+        if waiter is None:
+            return
+        if waiter.callback is None:
+            self.__drop(key, scope, waiter)
+            if not waiter.future.done():
+                waiter.future.set_result(update)
+        elif iscoroutine(result := waiter.callback(client, update)):
+            await result
+
+    def __set(self, key, scope, waiter):
+        waiters = self.__waiters.setdefault(key, {})
+        if (old := waiters.pop(scope, None)) is not None and not old.future.done():
+            old.future.set_result(None)
+        waiters[scope] = waiter
+
+    def __drop(self, key, scope, waiter):
+        if (waiters := self.__waiters.get(key)) is None:
+            return
+        if waiters.get(scope) is waiter:
+            del waiters[scope]
+        if not waiters:
+            del self.__waiters[key]
+
+    async def listen(
+        self, scope, chat_id, user_id, check=None, timeout=60, query=False
+    ):
+        # The next matching reply, None when the prompt was cancelled or
+        # replaced by a newer one of the same scope, TimeoutError when nothing
+        # came
+        key = ("query" if query else "message", chat_id, user_id)
+        waiter = Waiter(check)
+        self.__set(key, scope, waiter)
+        try:
+            return await wait_for(waiter.future, timeout)
+        finally:
+            self.__drop(key, scope, waiter)
+
+    async def serve(self, chat_id, user_id, prompt, callback, check, done, timeout):
+        # Feeds every matching press on the buttons of the message prompt()
+        # returns, None until it is sent, to callback until done is set
+        key = ("query", chat_id, user_id)
+        waiter = Waiter(check, callback, prompt)
+        scope = ("selection", waiter)
+        self.__set(key, scope, waiter)
+        try:
+            await wait_for(done.wait(), timeout)
+        finally:
+            self.__drop(key, scope, waiter)
+
+    def cancel(self, scope, chat_id=None, user_id=None):
+        for key, waiters in list(self.__waiters.items()):
+            if chat_id not in [None, key[1]] or user_id not in [None, key[2]]:
+                continue
+            if (waiter := waiters.get(scope)) is None:
+                continue
+            self.__drop(key, scope, waiter)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+
+    def register(self):
+        bot.add_handler(
+            MessageHandler(self.__route, filters=create(self.__match)), group=-1
+        )
+        bot.add_handler(
+            CallbackQueryHandler(self.__route, filters=create(self.__match)), group=-1
+        )
+
+
+conversations = ConversationRouter()
+conversations.register()
@@ -3,7 +3,7 @@ from pyrogram.filters import create
 from pyrogram.enums import ChatType
 
 from bot import user_data, OWNER_ID
-from bot.helper.telegram_helper.message_utils import chat_info
+from bot.helper.telegram_helper.chat_cache import chat_cache
 
 
 class CustomFilters:
@@ -74,18 +74,9 @@ class CustomFilters:
         ):
             isExists = True
         elif message.chat.type == ChatType.PRIVATE:
-            for channel_id in user_data:
-                if not (
-                    user_data[channel_id].get("is_auth")
-                    and str(channel_id).startswith("-100")
-                ):
-                    continue
-                try:
-                    if await (await chat_info(str(channel_id))).get_member(uid):
-                        isExists = True
-                        break
-                except Exception:
-                    continue
+            isExists = await chat_cache.is_member_of_any(
+                chat_cache.authorized_chats(), uid
+            )
         return isExists
 
     authorized_uset = create(authorized_usetting)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from traceback import format_exc
-from asyncio import sleep
+from functools import partial
+from asyncio import sleep, wait_for, Event, TimeoutError
 from aiofiles.os import remove as aioremove
 from random import choice as rchoice
 from time import time
@@ -12,11 +13,7 @@ from pyrogram.enums import ParseMode
 from pyrogram.types import InputMediaPhoto
 from pyrogram.errors import (
     ReplyMarkupInvalid,
-    FloodWait,
-    PeerIdInvalid,
-    ChannelInvalid,
     RPCError,
-    UserNotParticipant,
     MessageNotModified,
     MessageEmpty,
     PhotoInvalidDimensions,
@@ -48,6 +45,8 @@ from bot.helper.ext_utils.bot_utils import (
     new_thread,
 )
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.send_queue import send_queue, EDIT, STATUS
+from bot.helper.telegram_helper.chat_cache import chat_cache
 from bot.helper.ext_utils.exceptions import TgLinkException
 
 
@@ -57,13 +56,17 @@ async def sendMessage(message, text, buttons=None, photo=None, **kwargs):
             try:
                 if photo == "IMAGES":
                     photo = rchoice(config_dict["IMAGES"])
-                return await message.reply_photo(
-                    photo=photo,
-                    reply_to_message_id=message.id,
-                    caption=text,
-                    reply_markup=buttons,
-                    disable_notification=True,
-                    **kwargs,
+                return await send_queue.submit(
+                    message.chat.id,
+                    partial(
+                        message.reply_photo,
+                        photo=photo,
+                        reply_to_message_id=message.id,
+                        caption=text,
+                        reply_markup=buttons,
+                        disable_notification=True,
+                        **kwargs,
+                    ),
                 )
             except IndexError:
                 pass
@@ -74,25 +77,25 @@ async def sendMessage(message, text, buttons=None, photo=None, **kwargs):
                 return
             except Exception as e:
                 LOGGER.error(format_exc())
-        return await message.reply(
-            text=text,
-            quote=True,
-            disable_web_page_preview=True,
-            disable_notification=True,
-            reply_markup=buttons,
-            reply_to_message_id=(
-                rply.id
-                if (rply := message.reply_to_message)
-                and not rply.text
-                and not rply.caption
-                else None
+        return await send_queue.submit(
+            message.chat.id,
+            partial(
+                message.reply,
+                text=text,
+                quote=True,
+                disable_web_page_preview=True,
+                disable_notification=True,
+                reply_markup=buttons,
+                reply_to_message_id=(
+                    rply.id
+                    if (rply := message.reply_to_message)
+                    and not rply.text
+                    and not rply.caption
+                    else None
+                ),
+                **kwargs,
             ),
-            **kwargs,
         )
-    except FloodWait as f:
-        LOGGER.warning(str(f))
-        await sleep(f.value * 1.2)
-        return await sendMessage(message, text, buttons, photo)
     except ReplyMarkupInvalid:
         return await sendMessage(message, text, None, photo)
     except MessageEmpty:
@@ -108,12 +111,16 @@ async def sendCustomMsg(chat_id, text, buttons=None, photo=None, debug=False):
             try:
                 if photo == "IMAGES":
                     photo = rchoice(config_dict["IMAGES"])
-                return await bot.send_photo(
-                    chat_id=chat_id,
-                    photo=photo,
-                    caption=text,
-                    reply_markup=buttons,
-                    disable_notification=True,
+                return await send_queue.submit(
+                    chat_id,
+                    partial(
+                        bot.send_photo,
+                        chat_id=chat_id,
+                        photo=photo,
+                        caption=text,
+                        reply_markup=buttons,
+                        disable_notification=True,
+                    ),
                 )
             except IndexError:
                 pass
@@ -124,17 +131,17 @@ async def sendCustomMsg(chat_id, text, buttons=None, photo=None, debug=False):
                 return
             except Exception as e:
                 LOGGER.error(format_exc())
-        return await bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            disable_web_page_preview=True,
-            disable_notification=True,
-            reply_markup=buttons,
+        return await send_queue.submit(
+            chat_id,
+            partial(
+                bot.send_message,
+                chat_id=chat_id,
+                text=text,
+                disable_web_page_preview=True,
+                disable_notification=True,
+                reply_markup=buttons,
+            ),
         )
-    except FloodWait as f:
-        LOGGER.warning(str(f))
-        await sleep(f.value * 1.2)
-        return await sendCustomMsg(chat_id, text, buttons, photo)
     except ReplyMarkupInvalid:
         return await sendCustomMsg(chat_id, text, None, photo)
     except Exception as e:
@@ -142,7 +149,7 @@ async def sendCustomMsg(chat_id, text, buttons=None, photo=None, debug=False):
         return str(e)
 
 
-async def chat_info(channel_id):
+async def chat_info(channel_id, refresh=False):
     channel_id = str(channel_id).strip()
     if channel_id.startswith("-100"):
         channel_id = int(channel_id)
@@ -150,11 +157,7 @@ async def chat_info(channel_id):
         channel_id = channel_id.replace("@", "")
     else:
         return None
-    try:
-        return await bot.get_chat(channel_id)
-    except (PeerIdInvalid, ChannelInvalid) as e:
-        LOGGER.error(f"{e.NAME}: {e.MESSAGE} for {channel_id}")
-        return None
+    return await chat_cache.get_chat(channel_id, refresh)
 
 
 async def sendMultiMessage(chat_ids, text, buttons=None, photo=None):
@@ -168,13 +171,17 @@ async def sendMultiMessage(chat_ids, text, buttons=None, photo=None):
                 try:
                     if photo == "IMAGES":
                         photo = rchoice(config_dict["IMAGES"])
-                    sent = await bot.send_photo(
-                        chat_id=chat.id,
-                        photo=photo,
-                        caption=text,
-                        reply_markup=buttons,
-                        reply_to_message_id=topic_id,
-                        disable_notification=True,
+                    sent = await send_queue.submit(
+                        chat.id,
+                        partial(
+                            bot.send_photo,
+                            chat_id=chat.id,
+                            photo=photo,
+                            caption=text,
+                            reply_markup=buttons,
+                            reply_to_message_id=topic_id,
+                            disable_notification=True,
+                        ),
                     )
                     msg_dict[f"{chat.id}:{topic_id}"] = sent
                 except IndexError:
@@ -187,45 +194,53 @@ async def sendMultiMessage(chat_ids, text, buttons=None, photo=None):
                 except Exception as e:
                     LOGGER.error(str(e))
                 continue
-            LOGGER.info("DEBUG CP 2")
-            sent = await bot.send_message(
-                chat_id=chat.id,
-                text=text,
-                disable_web_page_preview=True,
-                disable_notification=True,
-                reply_to_message_id=topic_id,
-                reply_markup=buttons,
+            LOGGER.debug("DEBUG CP 2")
+            sent = await send_queue.submit(
+                chat.id,
+                partial(
+                    bot.send_message,
+                    chat_id=chat.id,
+                    text=text,
+                    disable_web_page_preview=True,
+                    disable_notification=True,
+                    reply_to_message_id=topic_id,
+                    reply_markup=buttons,
+                ),
             )
             msg_dict[f"{chat.id}:{topic_id}"] = sent
-        except FloodWait as f:
-            LOGGER.warning(str(f))
-            await sleep(f.value * 1.2)
-            return await sendMultiMessage(chat_ids, text, buttons, photo)
         except Exception as e:
             LOGGER.error(str(e))
     return msg_dict
 
 
-async def editMessage(message, text, buttons=None, photo=None):
+async def editMessage(message, text, buttons=None, photo=None, priority=EDIT):
     try:
         if message.media:
             if photo:
                 photo = rchoice(config_dict["IMAGES"]) if photo == "IMAGES" else photo
-                return await message.edit_media(
-                    InputMediaPhoto(photo, text), reply_markup=buttons
+                edit = partial(
+                    message.edit_media,
+                    InputMediaPhoto(photo, text),
+                    reply_markup=buttons,
                 )
-            return await message.edit_caption(caption=text, reply_markup=buttons)
-        await message.edit(
-            text=text, disable_web_page_preview=True, reply_markup=buttons
+            else:
+                edit = partial(message.edit_caption, caption=text, reply_markup=buttons)
+        else:
+            edit = partial(
+                message.edit,
+                text=text,
+                disable_web_page_preview=True,
+                reply_markup=buttons,
+            )
+        result = await send_queue.submit(
+            message.chat.id, edit, priority, ("edit", message.id)
         )
-    except FloodWait as f:
-        LOGGER.warning(str(f))
-        await sleep(f.value * 1.2)
-        return await editMessage(message, text, buttons, photo)
+        if message.media:
+            return result
     except (MessageNotModified, MessageEmpty):
         pass
     except ReplyMarkupInvalid:
-        return await editMessage(message, text, None, photo)
+        return await editMessage(message, text, None, photo, priority)
     except Exception as e:
         LOGGER.error(str(e))
         return str(e)
@@ -243,17 +258,17 @@ async def editReplyMarkup(message, reply_markup):
 
 async def sendFile(message, file, caption=None, buttons=None):
     try:
-        return await message.reply_document(
-            document=file,
-            quote=True,
-            caption=caption,
-            disable_notification=True,
-            reply_markup=buttons,
+        return await send_queue.submit(
+            message.chat.id,
+            partial(
+                message.reply_document,
+                document=file,
+                quote=True,
+                caption=caption,
+                disable_notification=True,
+                reply_markup=buttons,
+            ),
         )
-    except FloodWait as f:
-        LOGGER.warning(str(f))
-        await sleep(f.value * 1.2)
-        return await sendFile(message, file, caption)
     except Exception as e:
         LOGGER.error(str(e))
         return str(e)
@@ -261,24 +276,16 @@ async def sendFile(message, file, caption=None, buttons=None):
 
 async def sendRss(text):
     try:
-        if user:
-            return await user.send_message(
+        return await send_queue.submit(
+            config_dict["RSS_CHAT"],
+            partial(
+                (user or bot).send_message,
                 chat_id=config_dict["RSS_CHAT"],
                 text=text,
                 disable_web_page_preview=True,
                 disable_notification=True,
-            )
-        else:
-            return await bot.send_message(
-                chat_id=config_dict["RSS_CHAT"],
-                text=text,
-                disable_web_page_preview=True,
-                disable_notification=True,
-            )
-    except FloodWait as f:
-        LOGGER.warning(str(f))
-        await sleep(f.value * 1.2)
-        return await sendRss(text)
+            ),
+        )
     except Exception as e:
         LOGGER.error(str(e))
         return str(e)
@@ -411,14 +418,14 @@ async def update_all_messages(force=False):
         for chat_id in list(status_reply_dict.keys()):
             status_reply_dict[chat_id][1] = time()
     async with download_dict_lock:
-        msg, buttons = await sync_to_async(get_readable_message)
+        msg, buttons = await sync_to_async(get_readable_message, pool="render")
     if msg is None:
         return
     async with status_reply_dict_lock:
         for chat_id in list(status_reply_dict.keys()):
             if status_reply_dict[chat_id] and msg != status_reply_dict[chat_id][0].text:
                 rmsg = await editMessage(
-                    status_reply_dict[chat_id][0], msg, buttons, "IMAGES"
+                    status_reply_dict[chat_id][0], msg, buttons, "IMAGES", STATUS
                 )
                 if isinstance(rmsg, str) and rmsg.startswith("Telegram says: [400"):
                     del status_reply_dict[chat_id]
@@ -429,7 +436,7 @@ async def update_all_messages(force=False):
 
 async def sendStatusMessage(msg):
     async with download_dict_lock:
-        progress, buttons = await sync_to_async(get_readable_message)
+        progress, buttons = await sync_to_async(get_readable_message, pool="render")
     if progress is None:
         return
     async with status_reply_dict_lock:
@@ -479,12 +486,12 @@ async def open_category_btns(message):
         buttons.build_menu(3),
     )
     start_time = time()
-    bot_cache[msg_id] = [None, None, False, False, start_time]
-    while time() - start_time <= 60:
-        await sleep(0.5)
-        if bot_cache[msg_id][2] or bot_cache[msg_id][3]:
-            break
-    drive_id, index_link, _, is_cancelled, __ = bot_cache[msg_id]
+    bot_cache[msg_id] = [None, None, False, False, start_time, Event()]
+    try:
+        await wait_for(bot_cache[msg_id][5].wait(), 60)
+    except TimeoutError:
+        pass
+    drive_id, index_link, _, is_cancelled, *__ = bot_cache[msg_id]
     if not is_cancelled:
         await deleteMessage(prompt)
     else:
@@ -515,12 +522,12 @@ async def open_dump_btns(message):
         buttons.build_menu(3),
     )
     start_time = time()
-    bot_cache[msg_id] = [None, False, False, start_time]
-    while time() - start_time <= 60:
-        await sleep(0.5)
-        if bot_cache[msg_id][1] or bot_cache[msg_id][2]:
-            break
-    dump_chat, _, is_cancelled, __ = bot_cache[msg_id]
+    bot_cache[msg_id] = [None, False, False, start_time, Event()]
+    try:
+        await wait_for(bot_cache[msg_id][4].wait(), 60)
+    except TimeoutError:
+        pass
+    dump_chat, _, is_cancelled, *__ = bot_cache[msg_id]
     if not is_cancelled:
         await deleteMessage(prompt)
     else:
@@ -535,8 +542,8 @@ async def forcesub(message, ids, button=None):
     for channel_id in ids.split():
         chat = await chat_info(channel_id)
         try:
-            await chat.get_member(message.from_user.id)
-        except UserNotParticipant:
+            if await chat_cache.get_member(chat, message.from_user.id) is not None:
+                continue
             if username := chat.username:
                 invite_link = f"https://t.me/{username}"
             else:
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+from time import monotonic
+from heapq import heappush, heappop
+from itertools import count
+from asyncio import Event, TimeoutError, wait_for
+from pyrogram.errors import FloodWait
+
+from bot import bot_loop, LOGGER
+from bot.helper.ext_utils.metrics import metrics
+
+# Lanes, a lower one always goes first within a chat
+SEND, EDIT, STATUS = range(3)
+
+# Telegram allows about 30 messages a second per bot, one a second in a
+# private chat and 20 a minute in a group
+GLOBAL_LIMIT = (30, 30)
+PRIVATE_LIMIT = (1, 3)
+GROUP_LIMIT = (20 / 60, 5)
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.__stamp = monotonic()
+
+    def ready_at(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.__stamp) * self.rate)
+        self.__stamp = now
+        return now if self.tokens >= 1 else now + (1 - self.tokens) / self.rate
+
+    def full(self, now):
+        return self.ready_at(now) == now and self.tokens >= self.burst
+
+    def take(self):
+        self.tokens -= 1
+
+
+class SendJob:
+    def __init__(self, priority, seq, key, func):
+        self.priority = priority
+        self.seq = seq
+        self.key = key
+        self.func = func
+        self.futures = []
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ChatLane:
+    def __init__(self, limit):
+        self.bucket = TokenBucket(*limit)
+        self.jobs = []
+        self.pending = {}
+        self.paused_until = 0
+        self.busy = False
+
+
+class SendQueue:
+    # Every outbound call goes through one dispatcher, so concurrent tasks
+    # writing to the same chat are paced instead of flooding it together
+    def __init__(self):
+        self.private_limit = PRIVATE_LIMIT
+        self.group_limit = GROUP_LIMIT
+        self.bucket = TokenBucket(*GLOBAL_LIMIT)
+        self.__chats = {}
+        self.__seq = count()
+        self.__wakeup = Event()
+        self.__task = None
+
+    def submit(self, chat_id, func, priority=SEND, key=None):
+        if self.__task is None:
+            self.__task = bot_loop.create_task(self.__dispatcher())
+        future = bot_loop.create_future()
+        if (chat := self.__chats.get(chat_id)) is None:
+            chat = self.__chats[chat_id] = ChatLane(
+                self.group_limit if str(chat_id).startswith("-") else self.private_limit
+            )
+        if key is not None and (job := chat.pending.get(key)):
+            # Only the latest edit of a message is worth sending, it keeps the
+            # place of the first one so refreshes can't starve it
+            job.func = func
+            metrics.inc("telegram_edits_coalesced_total")
+        else:
+            job = SendJob(priority, next(self.__seq), key, func)
+            heappush(chat.jobs, job)
+            if key is not None:
+                chat.pending[key] = job
+        job.futures.append(future)
+        self.__wakeup.set()
+        return future
+
+    def __next(self, now):
+        best, wait = None, None
+        for chat_id, chat in list(self.__chats.items()):
+            if chat.busy:
+                continue
+            if not chat.jobs:
+                if chat.paused_until <= now and chat.bucket.full(now):
+                    del self.__chats[chat_id]
+                continue
+            ready = max(chat.paused_until, chat.bucket.ready_at(now))
+            if ready > now:
+                wait = ready - now if wait is None else min(wait, ready - now)
+            elif best is None or chat.jobs[0] < best.jobs[0]:
+                best = chat
+        if best is not None and (ready := self.bucket.ready_at(now)) > now:
+            return None, ready - now
+        return best, wait
+
+    async def __dispatcher(self):
+        while True:
+            chat, wait = self.__next(monotonic())
+            if chat is None:
+                self.__wakeup.clear()
+                try:
+                    await wait_for(self.__wakeup.wait(), wait)
+                except TimeoutError:
+                    pass
+                continue
+            job = heappop(chat.jobs)
+            if job.key is not None:
+                del chat.pending[job.key]
+            if all(future.done() for future in job.futures):
+                continue
+            chat.bucket.take()
+            self.bucket.take()
+            chat.busy = True
+            bot_loop.create_task(self.__run(chat, job))
+
+    async def __run(self, chat, job):
+        try:
+            result = await job.func()
+        except FloodWait as f:
+            # Only this chat waits, the job goes back to the front of its lane
+            metrics.flood_wait(f.value)
+            LOGGER.warning(str(f))
+            chat.paused_until = monotonic() + f.value * 1.2
+            if job.key is not None and (newer := chat.pending.pop(job.key, None)):
+                job.func = newer.func
+                job.futures.extend(newer.futures)
+                chat.jobs.remove(newer)
+                chat.jobs.sort()
+            heappush(chat.jobs, job)
+            if job.key is not None:
+                chat.pending[job.key] = job
+            return
+        except Exception as e:
+            for future in job.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            chat.busy = False
+            self.__wakeup.set()
+        for future in job.futures:
+            if not future.done():
+                future.set_result(result)
+
+
+send_queue = SendQueue()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from os import listdir
-from importlib import import_module
+from importlib import import_module, reload
 from random import choice as rchoice
 from bot import config_dict, LOGGER
 from bot.helper.themes import wzml_minimal
@@ -11,22 +11,51 @@ for theme in listdir("bot/helper/themes"):
         AVL_THEMES[theme[5:-3]] = import_module(f"bot.helper.themes.{theme[:-3]}")
 
 
-def BotTheme(var_name, **format_vars):
-    text = None
-    theme_ = config_dict["BOT_THEME"]
-
-    if theme_ in AVL_THEMES:
-        text = getattr(AVL_THEMES[theme_].WZMLStyle(), var_name, None)
-        if text is None:
+def compile_theme(theme_):
+    # Every string is bound to its own format_map once, anything the theme
+    # lacks comes from minimal
+    style = AVL_THEMES[theme_].WZMLStyle
+    templates = {}
+    for var_name, text in vars(wzml_minimal.WZMLStyle).items():
+        if var_name.startswith("__") or not isinstance(text, str):
+            continue
+        if (own := getattr(style, var_name, None)) is None:
             LOGGER.error(
                 f"{var_name} not Found in {theme_}. Please recheck with Official Repo"
             )
-    elif theme_ == "random":
-        rantheme = rchoice(list(AVL_THEMES.values()))
-        LOGGER.info(f"Random Theme Chosen: {rantheme}")
-        text = getattr(rantheme.WZMLStyle(), var_name, None)
+            own = text
+        templates[var_name] = own.format_map
+    return templates
+
+
+COMPILED_THEMES = {theme_: compile_theme(theme_) for theme_ in AVL_THEMES}
+ACTIVE_THEME = {"name": None, "templates": COMPILED_THEMES["minimal"]}
+
 
-    if text is None:
-        text = getattr(wzml_minimal.WZMLStyle(), var_name)
+def load_theme(theme_):
+    # Picks up edits to the theme file when BOT_THEME is switched to it
+    if theme_ in AVL_THEMES:
+        try:
+            AVL_THEMES[theme_] = reload(AVL_THEMES[theme_])
+            COMPILED_THEMES[theme_] = compile_theme(theme_)
+        except Exception as e:
+            LOGGER.error(f"Failed to reload {theme_} theme: {e}")
+        ACTIVE_THEME["templates"] = COMPILED_THEMES[theme_]
+    else:
+        ACTIVE_THEME["templates"] = COMPILED_THEMES["minimal"]
+    ACTIVE_THEME["name"] = theme_
+
+
+def BotTheme(var_name, **format_vars):
+    theme_ = config_dict["BOT_THEME"]
+    if theme_ != ACTIVE_THEME["name"]:
+        load_theme(theme_)
+
+    if theme_ == "random":
+        rantheme = rchoice(list(AVL_THEMES))
+        LOGGER.info(f"Random Theme Chosen: {rantheme}")
+        templates = COMPILED_THEMES[rantheme]
+    else:
+        templates = ACTIVE_THEME["templates"]
 
-    return text.format_map(format_vars)
+    return templates[var_name](format_vars)
@@ -188,6 +188,8 @@ class WZMLStyle:
     ELAPSED = " | <b>Elapsed:</b> {Elapsed}"
     ENGINE = "\n┠ <b>Engine:</b> {Engine}"
     STA_MODE = "\n┠ <b>Mode:</b> {Mode}"
+    QUEUE_POS = "\n┠ <b>Queue:</b> #{Pos} of {Total} ({Policy})"
+    QUEUE_REASON = "\n┠ <b>Waiting:</b> {Reason}"
     SEEDERS = "\n┠ <b>Seeders:</b> {Seeders} | "
     LEECHERS = "<b>Leechers:</b> {Leechers}"
 
@@ -217,6 +219,7 @@ class WZMLStyle:
     FREE = "<b>F:</b> {free} [{free_p}%]"
     Ram = "\n┠ <b>RAM:</b> {ram}% | "
     uptime = "<b>UPTIME:</b> {uptime}"
+    QUEUED = "\n┠ <b>Queued:</b> {Qdl} DL | {Qup} UP"
     DL = "\n┖ <b>DL:</b> {DL}/s | "
     UL = "<b>UL:</b> {UL}/s"
 
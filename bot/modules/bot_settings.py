@@ -1,16 +1,20 @@
 #!/usr/bin/env python3
 from random import choice
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
-from pyrogram.filters import command, regex, create
+from pyrogram.filters import command, regex
 from pyrogram.enums import ChatType
 from functools import partial
 from collections import OrderedDict
-from asyncio import create_subprocess_exec, create_subprocess_shell, sleep, gather
+from asyncio import (
+    create_subprocess_exec,
+    create_subprocess_shell,
+    gather,
+    TimeoutError,
+)
 from aiofiles.os import remove, rename, path as aiopath
 from aiofiles import open as aiopen
 from os import environ, getcwd
 from dotenv import load_dotenv
-from time import time
 from io import BytesIO
 from aioshutil import rmtree as aiormtree
 
@@ -44,20 +48,25 @@ from bot.helper.telegram_helper.message_utils import (
     update_all_messages,
 )
 from bot.helper.telegram_helper.filters import CustomFilters
+from bot.helper.telegram_helper.chat_cache import chat_cache
+from bot.helper.mirror_utils.download_utils.direct_resolver import resolve_cache
+from bot.helper.telegram_helper.conversation import conversations
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async, new_thread
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.postprocess import postprocess
+from bot.helper.ext_utils.executors import executors
+from bot.helper.ext_utils.log_pipeline import log_pipeline
 from bot.helper.ext_utils.help_messages import default_desp
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
-from bot.modules.torrent_search import initiate_search_tools
+from bot.helper.ext_utils.lazy_modules import lazy_modules
 from bot.modules.rss import addJob
 from bot.helper.themes import AVL_THEMES
 
 START = 0
 STATE = "view"
-handler_dict = {}
 default_values = {
     "AUTO_DELETE_MESSAGE_DURATION": 30,
     "DEFAULT_UPLOAD": "gd",
@@ -68,12 +77,15 @@ default_values = {
     "SEARCH_LIMIT": 0,
     "UPSTREAM_BRANCH": "master",
     "BOT_THEME": "minimal",
+    "QUEUE_SCHEDULER": "fair",
     "BOT_LANG": "en",
     "IMG_PAGE": 1,
     "AUTHOR_NAME": "WZML-X",
     "AUTHOR_URL": "https://t.me/WZML_X",
     "TITLE_NAME": "WZ Mirror/Leech X",
     "GD_INFO": "Uploaded by WZML-X",
+    "LOG_MAX_SIZE": 20,
+    "DIRECT_CONCURRENCY": 5,
 }
 bool_vars = [
     "AS_DOCUMENT",
@@ -89,16 +101,25 @@ bool_vars = [
     "USE_SERVICE_ACCOUNTS",
     "WEB_PINCODE",
     "EQUAL_SPLITS",
+    "PIPELINE_UPLOAD",
     "DISABLE_DRIVE_LINK",
     "DELETE_LINKS",
     "CLEAN_LOG_MSG",
     "USER_TD_MODE",
     "INCOMPLETE_TASK_NOTIFIER",
+    "RESUME_TASKS",
+    "LOG_JSON",
     "UPGRADE_PACKAGES",
     "SCREENSHOTS_MODE",
 ]
 
 
+async def initiate_search_tools():
+    # Until the first /search the plugins get set up when torrent_search loads
+    if search := lazy_modules["torrent_search"].module:
+        await search.initiate_search_tools()
+
+
 async def load_config():
 
     BOT_TOKEN = environ.get("BOT_TOKEN", "")
@@ -306,6 +327,7 @@ async def load_config():
                         aria2.client.change_option,
                         download.gid,
                         {"bt-stop-timeout": "0"},
+                        pool="rpc",
                     )
                 except Exception as e:
                     LOGGER.error(e)
@@ -321,6 +343,7 @@ async def load_config():
                         aria2.client.change_option,
                         download.gid,
                         {"bt-stop-timeout": TORRENT_TIMEOUT},
+                        pool="rpc",
                     )
                 except Exception as e:
                     LOGGER.error(e)
@@ -338,11 +361,52 @@ async def load_config():
     QUEUE_UPLOAD = environ.get("QUEUE_UPLOAD", "")
     QUEUE_UPLOAD = "" if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+    QUEUE_SCHEDULER = environ.get("QUEUE_SCHEDULER", "").lower()
+    if QUEUE_SCHEDULER not in ["fair", "fifo"]:
+        QUEUE_SCHEDULER = "fair"
+
+    ADMISSION_MAX_LOAD = environ.get("ADMISSION_MAX_LOAD", "")
+    ADMISSION_MAX_LOAD = (
+        "" if len(ADMISSION_MAX_LOAD) == 0 else float(ADMISSION_MAX_LOAD)
+    )
+
+    ADMISSION_MAX_DL = environ.get("ADMISSION_MAX_DL", "")
+    ADMISSION_MAX_DL = "" if len(ADMISSION_MAX_DL) == 0 else int(ADMISSION_MAX_DL)
+
+    ADMISSION_MAX_UP = environ.get("ADMISSION_MAX_UP", "")
+    ADMISSION_MAX_UP = "" if len(ADMISSION_MAX_UP) == 0 else int(ADMISSION_MAX_UP)
+
+    POSTPROCESS_SLOTS = environ.get("POSTPROCESS_SLOTS", "")
+    POSTPROCESS_SLOTS = "" if len(POSTPROCESS_SLOTS) == 0 else int(POSTPROCESS_SLOTS)
+
+    POSTPROCESS_NICE = environ.get("POSTPROCESS_NICE", "")
+
+    LOOP_LAG_THRESHOLD = environ.get("LOOP_LAG_THRESHOLD", "")
+    LOOP_LAG_THRESHOLD = (
+        "" if len(LOOP_LAG_THRESHOLD) == 0 else float(LOOP_LAG_THRESHOLD)
+    )
+
+    THREAD_POOLS = environ.get("THREAD_POOLS", "")
+
+    LOG_MAX_SIZE = environ.get("LOG_MAX_SIZE", "")
+    LOG_MAX_SIZE = 20 if len(LOG_MAX_SIZE) == 0 else int(LOG_MAX_SIZE)
+
+    LOG_JSON = environ.get("LOG_JSON", "")
+    LOG_JSON = LOG_JSON.lower() == "true"
+
+    DIRECT_CONCURRENCY = environ.get("DIRECT_CONCURRENCY", "")
+    DIRECT_CONCURRENCY = 5 if len(DIRECT_CONCURRENCY) == 0 else int(DIRECT_CONCURRENCY)
+
     INCOMPLETE_TASK_NOTIFIER = environ.get("INCOMPLETE_TASK_NOTIFIER", "")
     INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == "true"
     if not INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
         await DbManger().trunc_table("tasks")
 
+    RESUME_TASKS = environ.get("RESUME_TASKS", "")
+    RESUME_TASKS = RESUME_TASKS.lower() == "true"
+    if not RESUME_TASKS and DATABASE_URL:
+        await DbManger().trunc_table("journal")
+
     STOP_DUPLICATE = environ.get("STOP_DUPLICATE", "")
     STOP_DUPLICATE = STOP_DUPLICATE.lower() == "true"
 
@@ -379,6 +443,9 @@ async def load_config():
     EQUAL_SPLITS = environ.get("EQUAL_SPLITS", "")
     EQUAL_SPLITS = EQUAL_SPLITS.lower() == "true"
 
+    PIPELINE_UPLOAD = environ.get("PIPELINE_UPLOAD", "")
+    PIPELINE_UPLOAD = PIPELINE_UPLOAD.lower() == "true"
+
     MEDIA_GROUP = environ.get("MEDIA_GROUP", "")
     MEDIA_GROUP = MEDIA_GROUP.lower() == "true"
 
@@ -719,9 +786,11 @@ async def load_config():
             "GDTOT_CRYPT": GDTOT_CRYPT,
             "JIODRIVE_TOKEN": JIODRIVE_TOKEN,
             "EQUAL_SPLITS": EQUAL_SPLITS,
+            "PIPELINE_UPLOAD": PIPELINE_UPLOAD,
             "EXTENSION_FILTER": EXTENSION_FILTER,
             "GDRIVE_ID": GDRIVE_ID,
             "INCOMPLETE_TASK_NOTIFIER": INCOMPLETE_TASK_NOTIFIER,
+            "RESUME_TASKS": RESUME_TASKS,
             "INDEX_URL": INDEX_URL,
             "IS_TEAM_DRIVE": IS_TEAM_DRIVE,
             "LEECH_FILENAME_PREFIX": LEECH_FILENAME_PREFIX,
@@ -743,6 +812,17 @@ async def load_config():
             "QUEUE_ALL": QUEUE_ALL,
             "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
             "QUEUE_UPLOAD": QUEUE_UPLOAD,
+            "QUEUE_SCHEDULER": QUEUE_SCHEDULER,
+            "ADMISSION_MAX_LOAD": ADMISSION_MAX_LOAD,
+            "ADMISSION_MAX_DL": ADMISSION_MAX_DL,
+            "ADMISSION_MAX_UP": ADMISSION_MAX_UP,
+            "POSTPROCESS_SLOTS": POSTPROCESS_SLOTS,
+            "POSTPROCESS_NICE": POSTPROCESS_NICE,
+            "LOOP_LAG_THRESHOLD": LOOP_LAG_THRESHOLD,
+            "THREAD_POOLS": THREAD_POOLS,
+            "LOG_MAX_SIZE": LOG_MAX_SIZE,
+            "LOG_JSON": LOG_JSON,
+            "DIRECT_CONCURRENCY": DIRECT_CONCURRENCY,
             "RCLONE_FLAGS": RCLONE_FLAGS,
             "RCLONE_PATH": RCLONE_PATH,
             "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
@@ -784,6 +864,11 @@ async def load_config():
 
     if DATABASE_URL:
         await DbManger().update_config(config_dict)
+    postprocess.wake()
+    executors.configure()
+    log_pipeline.configure(LOG_MAX_SIZE, LOG_JSON)
+    chat_cache.clear()
+    resolve_cache.clear()
     await gather(initiate_search_tools(), start_from_queued(), rclone_serve_booter())
 
 
@@ -915,7 +1000,7 @@ async def update_buttons(message, key=None, edit_type=None, edit_mode=None):
 
 
 async def edit_variable(_, message, pre_message, key):
-    handler_dict[message.chat.id] = False
+    conversations.cancel("bot_settings", chat_id=message.chat.id)
     value = message.text
     if key == "RSS_DELAY":
         value = int(value)
@@ -935,7 +1020,7 @@ async def edit_variable(_, message, pre_message, key):
                     Interval.append(setInterval(value, update_all_messages))
     elif key == "TORRENT_TIMEOUT":
         value = int(value)
-        downloads = await sync_to_async(aria2.get_downloads)
+        downloads = await sync_to_async(aria2.get_downloads, pool="rpc")
         for download in downloads:
             if not download.is_complete:
                 try:
@@ -943,6 +1028,7 @@ async def edit_variable(_, message, pre_message, key):
                         aria2.client.change_option,
                         download.gid,
                         {"bt-stop-timeout": f"{value}"},
+                        pool="rpc",
                     )
                 except Exception as e:
                     LOGGER.error(e)
@@ -952,6 +1038,12 @@ async def edit_variable(_, message, pre_message, key):
     elif key == "BOT_THEME":
         if not value.strip() in AVL_THEMES.keys():
             value = "minimal"
+    elif key == "QUEUE_SCHEDULER":
+        value = value.strip().lower()
+        if value not in ["fair", "fifo"]:
+            value = "fair"
+    elif key in ["ADMISSION_MAX_LOAD", "STORAGE_THRESHOLD", "LOOP_LAG_THRESHOLD"]:
+        value = float(value)
     elif key == "CAP_FONT":
         value = value.strip().lower()
         if value not in ["b", "i", "u", "s", "spoiler", "code"]:
@@ -992,14 +1084,22 @@ async def edit_variable(_, message, pre_message, key):
     elif value.isdigit():
         value = int(value)
     config_dict[key] = value
+    chat_cache.clear()
+    resolve_cache.clear()
     await update_buttons(pre_message, key, "editvar", False)
     await deleteMessage(message)
     if DATABASE_URL:
         await DbManger().update_config({key: value})
     if key in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
         await initiate_search_tools()
-    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD", "QUEUE_SCHEDULER"]:
         await start_from_queued()
+    elif key == "POSTPROCESS_SLOTS":
+        postprocess.wake()
+    elif key == "THREAD_POOLS":
+        executors.configure()
+    elif key == "LOG_MAX_SIZE":
+        log_pipeline.configure(value, config_dict["LOG_JSON"])
     elif key in [
         "RCLONE_SERVE_URL",
         "RCLONE_SERVE_PORT",
@@ -1010,7 +1110,7 @@ async def edit_variable(_, message, pre_message, key):
 
 
 async def edit_aria(_, message, pre_message, key):
-    handler_dict[message.chat.id] = False
+    conversations.cancel("bot_settings", chat_id=message.chat.id)
     value = message.text
     if key == "newkey":
         key, value = [x.strip() for x in value.split(":", 1)]
@@ -1019,14 +1119,17 @@ async def edit_aria(_, message, pre_message, key):
     elif value.lower() == "false":
         value = "false"
     if key in aria2c_global:
-        await sync_to_async(aria2.set_global_options, {key: value})
+        await sync_to_async(aria2.set_global_options, {key: value}, pool="rpc")
     else:
-        downloads = await sync_to_async(aria2.get_downloads)
+        downloads = await sync_to_async(aria2.get_downloads, pool="rpc")
         for download in downloads:
             if not download.is_complete:
                 try:
                     await sync_to_async(
-                        aria2.client.change_option, download.gid, {key: value}
+                        aria2.client.change_option,
+                        download.gid,
+                        {key: value},
+                        pool="rpc",
                     )
                 except Exception as e:
                     LOGGER.error(e)
@@ -1038,7 +1141,7 @@ async def edit_aria(_, message, pre_message, key):
 
 
 async def edit_qbit(_, message, pre_message, key):
-    handler_dict[message.chat.id] = False
+    conversations.cancel("bot_settings", chat_id=message.chat.id)
     value = message.text
     if value.lower() == "true":
         value = True
@@ -1048,7 +1151,7 @@ async def edit_qbit(_, message, pre_message, key):
         value = float(value)
     elif value.isdigit():
         value = int(value)
-    await sync_to_async(get_client().app_set_preferences, {key: value})
+    await sync_to_async(get_client().app_set_preferences, {key: value}, pool="rpc")
     qbit_options[key] = value
     await update_buttons(pre_message, "qbit")
     await deleteMessage(message)
@@ -1057,7 +1160,7 @@ async def edit_qbit(_, message, pre_message, key):
 
 
 async def update_private_file(_, message, pre_message):
-    handler_dict[message.chat.id] = False
+    conversations.cancel("bot_settings", chat_id=message.chat.id)
     if not message.media and (file_name := message.text):
         path = file_name
         fn = file_name.rsplit(".zip", 1)[0]
@@ -1196,27 +1299,17 @@ async def update_private_file(_, message, pre_message):
 
 
 async def event_handler(client, query, pfunc, rfunc, document=False):
-    chat_id = query.message.chat.id
-    handler_dict[chat_id] = True
-    start_time = time()
-
-    async def event_filter(_, __, event):
-        user = event.from_user or event.sender_chat
-        return bool(
-            user.id == query.from_user.id
-            and event.chat.id == chat_id
-            and (event.text or event.document and document)
+    try:
+        event = await conversations.listen(
+            "bot_settings",
+            query.message.chat.id,
+            query.from_user.id,
+            lambda event: event.text or event.document and document,
         )
-
-    handler = client.add_handler(
-        MessageHandler(pfunc, filters=create(event_filter)), group=-1
-    )
-    while handler_dict[chat_id]:
-        await sleep(0.5)
-        if time() - start_time > 60:
-            handler_dict[chat_id] = False
-            await rfunc()
-    client.remove_handler(*handler)
+    except TimeoutError:
+        return await rfunc()
+    if event is not None:
+        await pfunc(client, event)
 
 
 @new_thread
@@ -1224,12 +1317,12 @@ async def edit_bot_settings(client, query):
     data = query.data.split()
     message = query.message
     if data[1] == "close":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         await deleteMessage(message)
         await deleteMessage(message.reply_to_message)
     elif data[1] == "back":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         key = data[2] if len(data) == 3 else None
         if key is None:
@@ -1239,7 +1332,7 @@ async def edit_bot_settings(client, query):
         await query.answer()
         await update_buttons(message, data[1])
     elif data[1] == "resetvar":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer("Reset Done!", show_alert=True)
         value = ""
         if data[2] in default_values:
@@ -1254,7 +1347,7 @@ async def edit_bot_settings(client, query):
             GLOBAL_EXTENSION_FILTER.clear()
             GLOBAL_EXTENSION_FILTER.extend(["aria2", "!qB"])
         elif data[2] == "TORRENT_TIMEOUT":
-            downloads = await sync_to_async(aria2.get_downloads)
+            downloads = await sync_to_async(aria2.get_downloads, pool="rpc")
             for download in downloads:
                 if not download.is_complete:
                     try:
@@ -1262,6 +1355,7 @@ async def edit_bot_settings(client, query):
                             aria2.client.change_option,
                             download.gid,
                             {"bt-stop-timeout": "0"},
+                            pool="rpc",
                         )
                     except Exception as e:
                         LOGGER.error(e)
@@ -1291,14 +1385,29 @@ async def edit_bot_settings(client, query):
                 categories_dict["Root"] = {"drive_id": GDRIVE_ID, "index_link": ""}
         elif data[2] == "INCOMPLETE_TASK_NOTIFIER" and DATABASE_URL:
             await DbManger().trunc_table("tasks")
+        elif data[2] == "RESUME_TASKS" and DATABASE_URL:
+            await DbManger().trunc_table("journal")
         config_dict[data[2]] = value
+        chat_cache.clear()
+        resolve_cache.clear()
         await update_buttons(message, data[2], "editvar", False)
         if DATABASE_URL:
             await DbManger().update_config({data[2]: value})
         if data[2] in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
             await initiate_search_tools()
-        elif data[2] in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+        elif data[2] in [
+            "QUEUE_ALL",
+            "QUEUE_DOWNLOAD",
+            "QUEUE_UPLOAD",
+            "QUEUE_SCHEDULER",
+        ]:
             await start_from_queued()
+        elif data[2] == "POSTPROCESS_SLOTS":
+            postprocess.wake()
+        elif data[2] == "THREAD_POOLS":
+            executors.configure()
+        elif data[2] == "LOG_MAX_SIZE":
+            log_pipeline.configure(value, config_dict["LOG_JSON"])
         elif data[2] in [
             "RCLONE_SERVE_URL",
             "RCLONE_SERVE_PORT",
@@ -1307,8 +1416,8 @@ async def edit_bot_settings(client, query):
         ]:
             await rclone_serve_booter()
     elif data[1] == "resetaria":
-        handler_dict[message.chat.id] = False
-        aria2_defaults = await sync_to_async(aria2.client.get_global_option)
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
+        aria2_defaults = await sync_to_async(aria2.client.get_global_option, pool="rpc")
         if aria2_defaults[data[2]] == aria2_options[data[2]]:
             await query.answer("Value already same as you added in aria.sh!")
             return
@@ -1316,60 +1425,72 @@ async def edit_bot_settings(client, query):
         value = aria2_defaults[data[2]]
         aria2_options[data[2]] = value
         await update_buttons(message, "aria")
-        downloads = await sync_to_async(aria2.get_downloads)
+        downloads = await sync_to_async(aria2.get_downloads, pool="rpc")
         for download in downloads:
             if not download.is_complete:
                 try:
                     await sync_to_async(
-                        aria2.client.change_option, download.gid, {data[2]: value}
+                        aria2.client.change_option,
+                        download.gid,
+                        {data[2]: value},
+                        pool="rpc",
                     )
                 except Exception as e:
                     LOGGER.error(e)
         if DATABASE_URL:
             await DbManger().update_aria2(data[2], value)
     elif data[1] == "emptyaria":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         aria2_options[data[2]] = ""
         await update_buttons(message, "aria")
-        downloads = await sync_to_async(aria2.get_downloads)
+        downloads = await sync_to_async(aria2.get_downloads, pool="rpc")
         for download in downloads:
             if not download.is_complete:
                 try:
                     await sync_to_async(
-                        aria2.client.change_option, download.gid, {data[2]: ""}
+                        aria2.client.change_option,
+                        download.gid,
+                        {data[2]: ""},
+                        pool="rpc",
                     )
                 except Exception as e:
                     LOGGER.error(e)
         if DATABASE_URL:
             await DbManger().update_aria2(data[2], "")
     elif data[1] == "emptyqbit":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
-        await sync_to_async(get_client().app_set_preferences, {data[2]: value})
+        await sync_to_async(
+            get_client().app_set_preferences, {data[2]: value}, pool="rpc"
+        )
         qbit_options[data[2]] = ""
         await update_buttons(message, "qbit")
         if DATABASE_URL:
             await DbManger().update_qbittorrent(data[2], "")
     elif data[1] == "private":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         await update_buttons(message, data[1])
         pfunc = partial(update_private_file, pre_message=message)
         rfunc = partial(update_buttons, message)
         await event_handler(client, query, pfunc, rfunc, True)
     elif data[1] == "boolvar":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         value = data[3] == "on"
         await query.answer(f"Successfully Var changed to {value}!", show_alert=True)
         config_dict[data[2]] = value
         if not value and data[2] == "INCOMPLETE_TASK_NOTIFIER" and DATABASE_URL:
             await DbManger().trunc_table("tasks")
+        elif not value and data[2] == "RESUME_TASKS" and DATABASE_URL:
+            await DbManger().trunc_table("journal")
+        elif data[2] == "LOG_JSON":
+            log_pipeline.configure(config_dict["LOG_MAX_SIZE"], value)
         await update_buttons(message, data[2], "editvar", False)
         if DATABASE_URL:
             await DbManger().update_config({data[2]: value})
     elif data[1] == "editvar":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         edit_mode = len(data) == 4
         await update_buttons(message, data[2], data[1], edit_mode)
@@ -1390,7 +1511,7 @@ async def edit_bot_settings(client, query):
             value = None
         await query.answer(f"{value}", show_alert=True)
     elif data[1] == "editaria" and (STATE == "edit" or data[2] == "newkey"):
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         await update_buttons(message, data[2], data[1])
         pfunc = partial(edit_aria, pre_message=message, key=data[2])
@@ -1408,7 +1529,7 @@ async def edit_bot_settings(client, query):
             value = None
         await query.answer(f"{value}", show_alert=True)
     elif data[1] == "editqbit" and STATE == "edit":
-        handler_dict[message.chat.id] = False
+        conversations.cancel("bot_settings", chat_id=message.chat.id)
         await query.answer()
         await update_buttons(message, data[2], data[1])
         pfunc = partial(edit_qbit, pre_message=message, key=data[2])
@@ -13,6 +13,7 @@ from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.bot_utils import new_task, get_readable_time
+from bot.helper.ext_utils.metrics import metrics
 
 bc_cache = {}
 
@@ -106,6 +107,7 @@ async def broadcast(_, message):
                 await sleep(0.5)
                 s += 1
             except FloodWait as e:
+                metrics.flood_wait(e.value)
                 await sleep(e.value)
                 await msg.edit(
                     text=rply.text,
@@ -142,6 +144,7 @@ async def broadcast(_, message):
                 bc_msg = await rply.copy(uid, disable_notification=quietly)
             s += 1
         except FloodWait as e:
+            metrics.flood_wait(e.value)
             await sleep(e.value)
             if forwarded:
                 bc_msg = await rply.forward(uid, disable_notification=quietly)
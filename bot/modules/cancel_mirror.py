@@ -82,6 +82,7 @@ async def cancell_all_buttons(_, message):
     buttons.ibutton("Archiving", f"canall {MirrorStatus.STATUS_ARCHIVING}")
     buttons.ibutton("QueuedDl", f"canall {MirrorStatus.STATUS_QUEUEDL}")
     buttons.ibutton("QueuedUp", f"canall {MirrorStatus.STATUS_QUEUEUP}")
+    buttons.ibutton("QueuedPP", f"canall {MirrorStatus.STATUS_QUEUEPP}")
     buttons.ibutton("Paused", f"canall {MirrorStatus.STATUS_PAUSED}")
     buttons.ibutton("All", "canall all")
     buttons.ibutton("Close", "canall close")
@@ -88,7 +88,7 @@ async def change_category(client, message):
         if drive_id:
             if not (
                 folder_name := await sync_to_async(
-                    GoogleDriveHelper().getFolderData, drive_id
+                    GoogleDriveHelper().getFolderData, drive_id, pool="drive"
                 )
             ):
                 return await sendMessage(message, "Google Drive id validation failed!!")
@@ -116,9 +116,11 @@ async def confirm_category(client, query):
         return await query.answer(text="This task is not for you!", show_alert=True)
     elif data[3] == "sdone":
         bot_cache[msg_id][2] = True
+        bot_cache[msg_id][5].set()
         return
     elif data[3] == "scancel":
         bot_cache[msg_id][3] = True
+        bot_cache[msg_id][5].set()
         return
     await query.answer()
     user_tds = await fetch_user_tds(user_id)
@@ -163,9 +165,11 @@ async def confirm_dump(client, query):
         return await query.answer(text="This task is not for you!", show_alert=True)
     elif data[3] == "ddone":
         bot_cache[msg_id][1] = True
+        bot_cache[msg_id][4].set()
         return
     elif data[3] == "dcancel":
         bot_cache[msg_id][2] = True
+        bot_cache[msg_id][4].set()
         return
     await query.answer()
     user_dumps = await fetch_user_dumps(user_id)
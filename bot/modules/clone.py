@@ -45,7 +45,7 @@ from bot.helper.ext_utils.bot_utils import (
 )
 from bot.helper.ext_utils.exceptions import DirectDownloadLinkException
 from bot.helper.mirror_utils.download_utils.direct_link_generator import (
-    direct_link_generator,
+    resolve_direct_link,
 )
 from bot.helper.mirror_utils.rclone_utils.list import RcloneList
 from bot.helper.mirror_utils.rclone_utils.transfer import RcloneTransferHelper
@@ -199,7 +199,7 @@ async def gdcloneNode(message, link, listen_up):
             message, f"<i><b>Processing Link:</b></i> <code>{link}</code>"
         )
         try:
-            link = await sync_to_async(direct_link_generator, link)
+            link = await resolve_direct_link(link)
             LOGGER.info(f"Generated link: {link}")
             await editMessage(
                 process_msg, f"<i><b>Generated Link:</b></i> <code>{link}</code>"
@@ -212,7 +212,9 @@ async def gdcloneNode(message, link, listen_up):
         await deleteMessage(process_msg)
     if is_gdrive_link(link):
         gd = GoogleDriveHelper()
-        name, mime_type, size, files, _ = await sync_to_async(gd.count, link)
+        name, mime_type, size, files, _ = await sync_to_async(
+            gd.count, link, pool="drive"
+        )
         if org_link:
             cget().request(
                 "POST",
@@ -232,7 +234,7 @@ async def gdcloneNode(message, link, listen_up):
         if config_dict["STOP_DUPLICATE"]:
             LOGGER.info("Checking File/Folder if already in Drive...")
             telegraph_content, contents_no = await sync_to_async(
-                gd.drive_list, name, True, True
+                gd.drive_list, name, True, True, pool="drive"
             )
             if telegraph_content:
                 msg = BotTheme("STOP_DUPLICATE", content=contents_no)
@@ -258,7 +260,7 @@ async def gdcloneNode(message, link, listen_up):
                 message, f"<i><b>Cloning:</b></i> <code>{link}</code>"
             )
             link, size, mime_type, files, folders = await sync_to_async(
-                drive.clone, link, listener.drive_id
+                drive.clone, link, listener.drive_id, pool="upload"
             )
             await deleteMessage(msg)
         else:
@@ -269,7 +271,7 @@ async def gdcloneNode(message, link, listen_up):
                 )
             await sendStatusMessage(message)
             link, size, mime_type, files, folders = await sync_to_async(
-                drive.clone, link, listener.drive_id
+                drive.clone, link, listener.drive_id, pool="upload"
             )
         if not link:
             return
@@ -408,7 +410,7 @@ async def clone(client, message):
                 await delete_links(message)
                 return
         if drive_id and not await sync_to_async(
-            GoogleDriveHelper().getFolderData, drive_id
+            GoogleDriveHelper().getFolderData, drive_id, pool="drive"
         ):
             return await sendMessage(message, "Google Drive ID validation failed!!")
         if not config_dict["GDRIVE_ID"] and not drive_id:
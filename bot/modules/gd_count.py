@@ -31,7 +31,9 @@ async def countNode(_, message):
     if is_gdrive_link(link):
         msg = await sendMessage(message, BotTheme("COUNT_MSG", LINK=link))
         gd = GoogleDriveHelper()
-        name, mime_type, size, files, folders = await sync_to_async(gd.count, link)
+        name, mime_type, size, files, folders = await sync_to_async(
+            gd.count, link, pool="drive"
+        )
         if mime_type is None:
             await sendMessage(message, name)
             return
@@ -1,14 +1,12 @@
 #!/usr/bin/env python3
-from time import time
 from aiofiles.os import remove as aioremove
-from asyncio import sleep, wrap_future, Lock
-from functools import partial
+from asyncio import sleep, wrap_future, Lock, TimeoutError
 from cryptography.fernet import Fernet
 
 from pyrogram import Client
 from pyrogram.types import ForceReply
 from pyrogram.enums import ChatType
-from pyrogram.filters import command, user, text, private
+from pyrogram.filters import command, private
 from pyrogram.handlers import MessageHandler
 from pyrogram.errors import (
     SessionPasswordNeeded,
@@ -22,7 +20,7 @@ from pyrogram.errors import (
     PeerIdInvalid,
 )
 
-from bot import bot, LOGGER, bot_cache, bot_name
+from bot import bot, LOGGER, bot_name
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.ext_utils.bot_utils import new_thread, new_task
 from bot.helper.telegram_helper.message_utils import (
@@ -33,6 +31,7 @@ from bot.helper.telegram_helper.message_utils import (
     sendCustomMsg,
 )
 from bot.helper.telegram_helper.filters import CustomFilters
+from bot.helper.telegram_helper.conversation import conversations
 
 session_dict = {}
 session_lock = Lock()
@@ -227,26 +226,22 @@ async def set_details(_, message, newkey):
 async def invoke(client, message, key):
     global isStop
     user_id = message.from_user.id
-    start_time = time()
-    handler = client.add_handler(
-        MessageHandler(
-            partial(set_details, newkey=key), filters=user(user_id) & text & private
-        ),
-        group=-1,
-    )
-    while not bool(session_dict.get(key)):
-        await sleep(0.5)
-        if time() - start_time > 120:
-            await editMessage(message, "⌬ <b>Process Stopped</b>")
-            isStop = True
-            break
-    client.remove_handler(*handler)
+    try:
+        event = await conversations.listen(
+            "gen_pyro_sess", user_id, user_id, lambda event: event.text, 120
+        )
+    except TimeoutError:
+        event = None
+        await editMessage(message, "⌬ <b>Process Stopped</b>")
+    if event is None:
+        isStop = True
+        return
+    await set_details(client, event, key)
 
 
 @new_thread
 async def get_decrypt_key(client, message):
     user_id = message.from_user.id
-    msg_id = message.id
     grp_prompt = None
     if message.chat.type != ChatType.PRIVATE:
         btn = ButtonMaker()
@@ -261,25 +256,15 @@ async def get_decrypt_key(client, message):
         "<b><u>DECRYPTION:</u></b>\n<i>• This Value is not stored anywhere, so you need to provide it everytime...\n\n</i><b><i>Send your Decrypt Key 🔑 ..</i></b>\n\n<b>Timeout:</b> 60s",
     )
 
-    bot_cache[msg_id] = [True, "", False]
-
-    async def set_details(_, message):
-        await deleteMessage(message)
-        bot_cache[msg_id] = [False, message.text, False]
-
-    start_time = time()
-    handler = client.add_handler(
-        MessageHandler(set_details, filters=user(user_id) & text & private), group=-1
-    )
-    while bot_cache[msg_id][0]:
-        await sleep(0.5)
-        if time() - start_time > 60:
-            bot_cache[msg_id][0] = False
-            await editMessage(prompt, "<b>Decryption Key TimeOut.. Try Again</b>")
-            bot_cache[msg_id][2] = True
-    client.remove_handler(*handler)
-
-    _, key, is_cancelled = bot_cache[msg_id]
+    key, is_cancelled = "", True
+    try:
+        if event := await conversations.listen(
+            "decrypt_key", user_id, user_id, lambda event: event.text
+        ):
+            await deleteMessage(event)
+            key, is_cancelled = event.text, False
+    except TimeoutError:
+        await editMessage(prompt, "<b>Decryption Key TimeOut.. Try Again</b>")
     if is_cancelled:
         await editMessage(prompt, "<b>Decrypt Key Invoke Cancelled</b>")
         if grp_prompt:
@@ -288,8 +273,7 @@ async def get_decrypt_key(client, message):
         await editMessage(prompt, "<b>✅️ Decrypt Key Accepted!</b>")
         if grp_prompt:
             await deleteMessage(grp_prompt)
-    del bot_cache[msg_id]
-    return Fernet(key), is_cancelled
+    return Fernet(key) if key else None, is_cancelled
 
 
 bot.add_handler(
@@ -3,15 +3,18 @@ from pyrogram.filters import command, regex
 from html import escape
 from traceback import format_exc
 from base64 import b64encode
-from re import match as re_match
+from re import match as re_match, sub as re_sub
 from asyncio import sleep, wrap_future
-from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath
 from cloudscraper import create_scraper
 
 from bot import (
     bot,
+    bot_loop,
     DOWNLOAD_DIR,
+    DATABASE_URL,
+    download_dict,
+    download_dict_lock,
     LOGGER,
     config_dict,
     bot_name,
@@ -35,6 +38,9 @@ from bot.helper.ext_utils.bot_utils import (
     get_stats,
 )
 from bot.helper.ext_utils.exceptions import DirectDownloadLinkException
+from bot.helper.ext_utils.db_handler import DbManger
+from bot.helper.ext_utils.fs_utils import clean_download
+from bot.helper.ext_utils.log_pipeline import log_pipeline
 from bot.helper.ext_utils.task_manager import task_utils
 from bot.helper.mirror_utils.download_utils.aria2_download import add_aria2c_download
 from bot.helper.mirror_utils.download_utils.gd_download import add_gd_download
@@ -44,7 +50,7 @@ from bot.helper.mirror_utils.download_utils.rclone_download import add_rclone_do
 from bot.helper.mirror_utils.rclone_utils.list import RcloneList
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.mirror_utils.download_utils.direct_link_generator import (
-    direct_link_generator,
+    resolve_direct_link,
 )
 from bot.helper.mirror_utils.download_utils.telegram_download import (
     TelegramDownloadHelper,
@@ -64,6 +70,7 @@ from bot.helper.telegram_helper.message_utils import (
     open_dump_btns,
 )
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
+from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
 from bot.helper.ext_utils.help_messages import (
     MIRROR_HELP_MESSAGE,
     CLONE_HELP_MESSAGE,
@@ -71,7 +78,7 @@ from bot.helper.ext_utils.help_messages import (
     help_string,
 )
 from bot.helper.ext_utils.bulk_links import extract_bulk_links
-from bot.modules.gen_pyro_sess import get_decrypt_key
+from bot.helper.ext_utils.lazy_modules import lazy_modules
 
 
 @new_task
@@ -268,8 +275,9 @@ async def _mirror_leech(
         try:
             reply_to, session = await get_tg_link_content(link, message.from_user.id)
             if reply_to is None and session == "":
+                gen_pyro_sess = await lazy_modules["gen_pyro_sess"].load()
                 decrypter, is_cancelled = await wrap_future(
-                    get_decrypt_key(client, message)
+                    gen_pyro_sess.get_decrypt_key(client, message)
                 )
                 if is_cancelled:
                     return
@@ -357,7 +365,7 @@ async def _mirror_leech(
             try:
                 if not is_magnet(link) and (ussr or pssw):
                     link = (link, (ussr, pssw))
-                link = await sync_to_async(direct_link_generator, link)
+                link = await resolve_direct_link(link)
                 if isinstance(link, tuple):
                     link, headers = link
                 elif isinstance(link, str):
@@ -407,7 +415,7 @@ async def _mirror_leech(
                     await delete_links(message)
                     return
             if drive_id and not await sync_to_async(
-                GoogleDriveHelper().getFolderData, drive_id
+                GoogleDriveHelper().getFolderData, drive_id, pool="drive"
             ):
                 return await sendMessage(message, "Google Drive ID validation failed!!")
         if up == "gd" and not config_dict["GDRIVE_ID"] and not drive_id:
@@ -535,8 +543,7 @@ async def wzmlxcb(_, query):
         return await query.answer(text="Not Yours!", show_alert=True)
     elif data[2] == "logdisplay":
         await query.answer()
-        async with aiopen("log.txt", "r") as f:
-            logFileLines = (await f.read()).splitlines()
+        logFileLines = (await log_pipeline.read(4000)).splitlines()
 
         def parseline(line):
             try:
@@ -563,8 +570,7 @@ async def wzmlxcb(_, query):
             LOGGER.error(f"TG Log Display : {str(err)}")
     elif data[2] == "webpaste":
         await query.answer()
-        async with aiopen("log.txt", "r") as f:
-            logFile = await f.read()
+        logFile = await log_pipeline.read(log_pipeline.file_handler.maxBytes)
         cget = create_scraper().request
         resp = cget(
             "POST",
@@ -636,6 +642,40 @@ async def wzmlxcb(_, query):
                 await deleteMessage(message.reply_to_message.reply_to_message)
 
 
+async def resume_tasks():
+    if not config_dict["RESUME_TASKS"] or not DATABASE_URL:
+        return
+    for journal in await DbManger().get_journals():
+        uid, opts = journal["_id"], journal.get("opts", {})
+        message = None
+        if opts and (journal.get("done") or not opts["isYtdlp"]):
+            try:
+                message = await bot.get_messages(journal["cid"], uid)
+                message.from_user = await bot.get_users(journal["user_id"])
+            except Exception as e:
+                LOGGER.error(f"{e}: while fetching task {uid} to resume")
+                message = None
+        if message is None or message.empty:
+            await DbManger().rm_journal(uid)
+            await clean_download(f"{DOWNLOAD_DIR}{uid}")
+            await clean_download(f"{DOWNLOAD_DIR}{uid}10000")
+            continue
+        if not journal.get("done"):
+            LOGGER.info(f"Resuming Download: {uid}")
+            text = message.text.split("\n")
+            text[0] = re_sub(r"\s-i\s+\d+", "", text[0])
+            message.text = "\n".join(text)
+            _mirror_leech(bot, message, opts["isQbit"], opts["isLeech"])
+            continue
+        LOGGER.info(f"Resuming Task: {journal['name']} after {journal['done']}")
+        listener = MirrorLeechListener(message, journal=journal, **opts)
+        async with download_dict_lock:
+            download_dict[uid] = QueueStatus(
+                journal["name"], journal["size"], journal["gid"], listener, "dl"
+            )
+        bot_loop.create_task(listener.onDownloadComplete())
+
+
 async def mirror(client, message):
     _mirror_leech(client, message)
 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+from pyrogram.handlers import MessageHandler
+from pyrogram.filters import command
+from io import BytesIO
+from time import time
+
+from bot import LOGGER, bot
+from bot.helper.telegram_helper.message_utils import sendMessage, sendFile
+from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.ext_utils.loop_monitor import loop_monitor
+from bot.helper.telegram_helper.filters import CustomFilters
+from bot.helper.telegram_helper.bot_commands import BotCommands
+
+MAX_PROFILE_SECONDS = 300
+
+
+@new_task
+async def profile(_, message):
+    args = message.text.split()
+    seconds = args[1] if len(args) > 1 else "30"
+    try:
+        seconds = float(seconds)
+    except ValueError:
+        await sendMessage(message, "Send the number of seconds to profile for.")
+        return
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        await sendMessage(
+            message, f"Profile for more than 0 and up to {MAX_PROFILE_SECONDS} seconds."
+        )
+        return
+    if loop_monitor.profiling:
+        await sendMessage(message, "A profile is already running, wait for it.")
+        return
+    LOGGER.info(f"Profiling bot_loop and thread pools for {seconds}s")
+    samples, stacks = await loop_monitor.profile(seconds)
+    if not stacks:
+        await sendMessage(message, f"Nothing but idle threads in {samples} samples.")
+        return
+    with BytesIO(str.encode(stacks)) as out_file:
+        out_file.name = f"profile_{int(time())}.folded"
+        await sendFile(
+            message,
+            out_file,
+            f"<b>{samples}</b> samples over <b>{seconds}s</b>\n"
+            "Open it with speedscope or flamegraph.pl",
+        )
+
+
+bot.add_handler(
+    MessageHandler(
+        profile, filters=command(BotCommands.ProfileCommand) & CustomFilters.sudo
+    )
+)
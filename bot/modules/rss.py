@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 from feedparser import parse as feedparse
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
-from pyrogram.filters import command, regex, create
-from asyncio import Lock, sleep
+from pyrogram.filters import command, regex
+from asyncio import Lock, TimeoutError, sleep
 from datetime import datetime, timedelta
-from time import time
 from functools import partial
 from aiohttp import ClientSession
 from apscheduler.triggers.interval import IntervalTrigger
@@ -22,12 +21,12 @@ from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.conversation import conversations
 from bot.helper.ext_utils.bot_utils import new_thread
 from bot.helper.ext_utils.exceptions import RssShutdownException
 from bot.helper.ext_utils.help_messages import RSS_HELP_MESSAGE
 
 rss_dict_lock = Lock()
-handler_dict = {}
 
 
 async def rssMenu(event):
@@ -68,7 +67,7 @@ async def getRssMenu(client, message):
 
 async def rssSub(client, message, pre_event):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("rss", user_id=user_id)
     if username := message.from_user.username:
         tag = f"@{username}"
     else:
@@ -200,7 +199,7 @@ async def getUserId(title):
 
 async def rssUpdate(client, message, pre_event, state):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("rss", user_id=user_id)
     titles = message.text.split()
     is_sudo = await CustomFilters.sudo(client, message)
     updated = []
@@ -294,7 +293,7 @@ async def rssList(query, start, all_users=False):
 
 async def rssGet(client, message, pre_event):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("rss", user_id=user_id)
     args = message.text.split()
     if len(args) < 2:
         await sendMessage(
@@ -348,7 +347,7 @@ async def rssGet(client, message, pre_event):
 
 async def rssEdit(client, message, pre_event):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("rss", user_id=user_id)
     items = message.text.split("\n")
     for item in items:
         args = item.split()
@@ -395,7 +394,7 @@ async def rssEdit(client, message, pre_event):
 
 
 async def rssDelete(client, message, pre_event):
-    handler_dict[message.from_user.id] = False
+    conversations.cancel("rss", user_id=message.from_user.id)
     users = message.text.split()
     for user in users:
         user = int(user)
@@ -407,23 +406,14 @@ async def rssDelete(client, message, pre_event):
 
 
 async def event_handler(client, query, pfunc):
-    user_id = query.from_user.id
-    handler_dict[user_id] = True
-    start_time = time()
-
-    async def event_filter(_, __, event):
-        user = event.from_user or event.sender_chat
-        return bool(
-            user.id == user_id and event.chat.id == query.message.chat.id and event.text
+    try:
+        event = await conversations.listen(
+            "rss", query.message.chat.id, query.from_user.id, lambda event: event.text
         )
-
-    handler = client.add_handler(MessageHandler(pfunc, create(event_filter)), group=-1)
-    while handler_dict[user_id]:
-        await sleep(0.5)
-        if time() - start_time > 60:
-            handler_dict[user_id] = False
-            await updateRssMenu(query)
-    client.remove_handler(*handler)
+    except TimeoutError:
+        return await updateRssMenu(query)
+    if event is not None:
+        await pfunc(client, event)
 
 
 @new_thread
@@ -437,16 +427,16 @@ async def rssListener(client, query):
         )
     elif data[1] == "close":
         await query.answer()
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         await message.reply_to_message.delete()
         await message.delete()
     elif data[1] == "back":
         await query.answer()
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         await updateRssMenu(query)
     elif data[1] == "sub":
         await query.answer()
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         buttons = ButtonMaker()
         buttons.ibutton("Back", f"rss back {user_id}")
         buttons.ibutton("Close", f"rss close {user_id}")
@@ -455,7 +445,7 @@ async def rssListener(client, query):
         pfunc = partial(rssSub, pre_event=query)
         await event_handler(client, query, pfunc)
     elif data[1] == "list":
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         if len(rss_dict.get(int(data[2]), {})) == 0:
             await query.answer(text="No subscriptions!", show_alert=True)
         else:
@@ -463,7 +453,7 @@ async def rssListener(client, query):
             start = int(data[3])
             await rssList(query, start)
     elif data[1] == "get":
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         if len(rss_dict.get(int(data[2]), {})) == 0:
             await query.answer(text="No subscriptions!", show_alert=True)
         else:
@@ -480,7 +470,7 @@ async def rssListener(client, query):
             pfunc = partial(rssGet, pre_event=query)
             await event_handler(client, query, pfunc)
     elif data[1] in ["unsubscribe", "pause", "resume"]:
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         if len(rss_dict.get(int(data[2]), {})) == 0:
             await query.answer(text="No subscriptions!", show_alert=True)
         else:
@@ -503,7 +493,7 @@ async def rssListener(client, query):
             pfunc = partial(rssUpdate, pre_event=query, state=data[1])
             await event_handler(client, query, pfunc)
     elif data[1] == "edit":
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         if len(rss_dict.get(int(data[2]), {})) == 0:
             await query.answer(text="No subscriptions!", show_alert=True)
         else:
@@ -524,7 +514,7 @@ Timeout: 60 sec. Argument -c for command and options
             pfunc = partial(rssEdit, pre_event=query)
             await event_handler(client, query, pfunc)
     elif data[1].startswith("uall"):
-        handler_dict[user_id] = False
+        conversations.cancel("rss", user_id=user_id)
         if len(rss_dict.get(int(data[2]), {})) == 0:
             await query.answer(text="No subscriptions!", show_alert=True)
             return
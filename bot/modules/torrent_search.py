@@ -24,20 +24,24 @@ TELEGRAPH_LIMIT = 300
 
 
 async def initiate_search_tools():
-    qbclient = await sync_to_async(get_client)
-    qb_plugins = await sync_to_async(qbclient.search_plugins)
+    qbclient = await sync_to_async(get_client, pool="rpc")
+    qb_plugins = await sync_to_async(qbclient.search_plugins, pool="rpc")
     if SEARCH_PLUGINS := config_dict["SEARCH_PLUGINS"]:
         globals()["PLUGINS"] = []
         src_plugins = eval(SEARCH_PLUGINS)
         if qb_plugins:
             names = [plugin["name"] for plugin in qb_plugins]
-            await sync_to_async(qbclient.search_uninstall_plugin, names=names)
-        await sync_to_async(qbclient.search_install_plugin, src_plugins)
+            await sync_to_async(
+                qbclient.search_uninstall_plugin, names=names, pool="rpc"
+            )
+        await sync_to_async(qbclient.search_install_plugin, src_plugins, pool="rpc")
     elif qb_plugins:
         for plugin in qb_plugins:
-            await sync_to_async(qbclient.search_uninstall_plugin, names=plugin["name"])
+            await sync_to_async(
+                qbclient.search_uninstall_plugin, names=plugin["name"], pool="rpc"
+            )
         globals()["PLUGINS"] = []
-    await sync_to_async(qbclient.auth_log_out)
+    await sync_to_async(qbclient.auth_log_out, pool="rpc")
 
     if SEARCH_API_LINK := config_dict["SEARCH_API_LINK"]:
         global SITES
@@ -105,20 +109,23 @@ async def __search(key, site, message, method):
             return
     else:
         LOGGER.info(f"PLUGINS Searching: {key} from {site}")
-        client = await sync_to_async(get_client)
+        client = await sync_to_async(get_client, pool="rpc")
         search = await sync_to_async(
-            client.search_start, pattern=key, plugins=site, category="all"
+            client.search_start, pattern=key, plugins=site, category="all", pool="rpc"
         )
         search_id = search.id
         while True:
             result_status = await sync_to_async(
-                client.search_status, search_id=search_id
+                client.search_status, search_id=search_id, pool="rpc"
             )
             status = result_status[0].status
             if status != "Running":
                 break
         dict_search_results = await sync_to_async(
-            client.search_results, search_id=search_id, limit=TELEGRAPH_LIMIT
+            client.search_results,
+            search_id=search_id,
+            limit=TELEGRAPH_LIMIT,
+            pool="rpc",
         )
         search_results = dict_search_results.results
         total_results = dict_search_results.total
@@ -130,8 +137,8 @@ async def __search(key, site, message, method):
             return
         msg = f"<b>Found {min(total_results, TELEGRAPH_LIMIT)}</b>"
         msg += f" <b>result(s) for <i>{key}</i>\nTorrent Site:- <i>{site.capitalize()}</i></b>"
-        await sync_to_async(client.search_delete, search_id=search_id)
-        await sync_to_async(client.auth_log_out)
+        await sync_to_async(client.search_delete, search_id=search_id, pool="rpc")
+        await sync_to_async(client.auth_log_out, pool="rpc")
     link = await __getResult(search_results, key, message, method)
     buttons = ButtonMaker()
     buttons.ubutton("🔎 VIEW", link)
@@ -229,11 +236,11 @@ def __api_buttons(user_id, method):
 async def __plugin_buttons(user_id):
     buttons = ButtonMaker()
     if not PLUGINS:
-        qbclient = await sync_to_async(get_client)
-        pl = await sync_to_async(qbclient.search_plugins)
+        qbclient = await sync_to_async(get_client, pool="rpc")
+        pl = await sync_to_async(qbclient.search_plugins, pool="rpc")
         for name in pl:
             PLUGINS.append(name["name"])
-        await sync_to_async(qbclient.auth_log_out)
+        await sync_to_async(qbclient.auth_log_out, pool="rpc")
     for siteName in PLUGINS:
         buttons.ibutton(siteName.capitalize(), f"torser {user_id} {siteName} plugin")
     buttons.ibutton("All", f"torser {user_id} all plugin")
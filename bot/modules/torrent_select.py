@@ -83,12 +83,14 @@ async def select(client, message):
             id_ = dl.hash()
             client = dl.client()
             if not dl.queued:
-                await sync_to_async(client.torrents_pause, torrent_hashes=id_)
+                await sync_to_async(
+                    client.torrents_pause, torrent_hashes=id_, pool="rpc"
+                )
         else:
             id_ = dl.gid()
             if not dl.queued:
                 try:
-                    await sync_to_async(aria2.client.force_pause, id_)
+                    await sync_to_async(aria2.client.force_pause, id_, pool="rpc")
                 except Exception as e:
                     LOGGER.error(
                         f"{e} Error in pause, this mostly happens after abuse aria2"
@@ -131,9 +133,13 @@ async def get_confirm(client, query):
         id_ = data[3]
         if len(id_) > 20:
             client = dl.client()
-            tor_info = (await sync_to_async(client.torrents_info, torrent_hash=id_))[0]
+            tor_info = (
+                await sync_to_async(client.torrents_info, torrent_hash=id_, pool="rpc")
+            )[0]
             path = tor_info.content_path.rsplit("/", 1)[0]
-            res = await sync_to_async(client.torrents_files, torrent_hash=id_)
+            res = await sync_to_async(
+                client.torrents_files, torrent_hash=id_, pool="rpc"
+            )
             for f in res:
                 if f.priority == 0:
                     f_paths = [f"{path}/{f.name}", f"{path}/{f.name}.!qB"]
@@ -142,16 +148,18 @@ async def get_confirm(client, query):
                             with suppress(Exception):
                                 await aioremove(f_path)
             if not dl.queued:
-                await sync_to_async(client.torrents_resume, torrent_hashes=id_)
+                await sync_to_async(
+                    client.torrents_resume, torrent_hashes=id_, pool="rpc"
+                )
         else:
-            res = await sync_to_async(aria2.client.get_files, id_)
+            res = await sync_to_async(aria2.client.get_files, id_, pool="rpc")
             for f in res:
                 if f["selected"] == "false" and await aiopath.exists(f["path"]):
                     with suppress(Exception):
                         await aioremove(f["path"])
             if not dl.queued:
                 try:
-                    await sync_to_async(aria2.client.unpause, id_)
+                    await sync_to_async(aria2.client.unpause, id_, pool="rpc")
                 except Exception as e:
                     LOGGER.error(
                         f"{e} Error in resume, this mostly happens after abuse aria2. Try to use select cmd again!"
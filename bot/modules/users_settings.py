@@ -2,17 +2,16 @@
 #!/usr/bin/env python3
 from datetime import datetime
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
-from pyrogram.filters import command, regex, create
+from pyrogram.filters import command, regex
 from aiofiles import open as aiopen
 from aiofiles.os import remove as aioremove, path as aiopath, mkdir
 from langcodes import Language
 from os import path as ospath, getcwd
 from PIL import Image
-from time import time
 from functools import partial
 from html import escape
 from io import BytesIO
-from asyncio import sleep
+from asyncio import TimeoutError
 from cryptography.fernet import Fernet
 
 import asyncio
@@ -39,6 +38,7 @@ from bot.helper.telegram_helper.message_utils import (
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.conversation import conversations
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.ext_utils.bot_utils import (
@@ -52,7 +52,6 @@ from bot.helper.ext_utils.bot_utils import (
 from bot.helper.mirror_utils.upload_utils.ddlserver.gofile import Gofile
 from bot.helper.themes import BotTheme
 
-handler_dict = {}
 desp_dict = {
     "rcc": [
         "RClone is a command-line program to sync files and directories to and from different cloud storage providers like GDrive, OneDrive...",
@@ -703,14 +702,14 @@ async def user_settings(client, message):
         )
     else:
         from_user = message.from_user
-        handler_dict[from_user.id] = False
+        conversations.cancel("users_settings", user_id=from_user.id)
         msg, button = await get_user_settings(from_user)
         await sendMessage(message, msg, button, "IMAGES")
 
 
 async def set_custom(client, message, pre_event, key, direct=False):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("users_settings", user_id=user_id)
     value = message.text
     return_key = "leech"
     n_key = key
@@ -747,7 +746,7 @@ async def set_custom(client, message, pre_event, key, direct=False):
                 if is_gdrive_link(td_details[1].strip()):
                     td_details[1] = GoogleDriveHelper.getIdFromUrl(td_details[1])
                 if await sync_to_async(
-                    GoogleDriveHelper().getFolderData, td_details[1]
+                    GoogleDriveHelper().getFolderData, td_details[1], pool="drive"
                 ):
                     user_tds[td_details[0]] = {
                         "drive_id": td_details[1],
@@ -770,7 +769,9 @@ async def set_custom(client, message, pre_event, key, direct=False):
             for title in list(ldumps.keys()):
                 if dump_info[0].casefold() == title.casefold():
                     del ldumps[title]
-            if len(dump_info) > 1 and (dump_chat := await chat_info(dump_info[1])):
+            if len(dump_info) > 1 and (
+                dump_chat := await chat_info(dump_info[1], refresh=True)
+            ):
                 ldumps[dump_info[0]] = dump_chat.id
         value = ldumps
     elif key in ["yt_opt", "usess"]:
@@ -799,13 +800,15 @@ async def set_custom(client, message, pre_event, key, direct=False):
 
 async def set_thumb(client, message, pre_event, key, direct=False):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("users_settings", user_id=user_id)
     path = "Thumbnails/"
     if not await aiopath.isdir(path):
         await mkdir(path)
     photo_dir = await message.download()
     des_dir = ospath.join(path, f"{user_id}.jpg")
-    await sync_to_async(Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG")
+    await sync_to_async(
+        Image.open(photo_dir).convert("RGB").save, des_dir, "JPEG", pool="fs"
+    )
     await aioremove(photo_dir)
     update_user_ldata(user_id, "thumb", des_dir)
     await deleteMessage(message)
@@ -816,7 +819,7 @@ async def set_thumb(client, message, pre_event, key, direct=False):
 
 async def add_rclone(client, message, pre_event):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("users_settings", user_id=user_id)
     path = f"{getcwd()}/rclone/"
     if not await aiopath.isdir(path):
         await mkdir(path)
@@ -831,7 +834,7 @@ async def add_rclone(client, message, pre_event):
 
 async def leech_split_size(client, message, pre_event):
     user_id = message.from_user.id
-    handler_dict[user_id] = False
+    conversations.cancel("users_settings", user_id=user_id)
     sdic = ["b", "kb", "mb", "gb"]
     value = message.text.strip()
     slice = -2 if value[-2].lower() in ["k", "m", "g"] else -1
@@ -848,31 +851,21 @@ async def leech_split_size(client, message, pre_event):
 
 
 async def event_handler(client, query, pfunc, rfunc, photo=False, document=False):
-    user_id = query.from_user.id
-    handler_dict[user_id] = True
-    start_time = time()
-
-    async def event_filter(_, __, event):
+    def event_filter(event):
         if photo:
-            mtype = event.photo
+            return event.photo
         elif document:
-            mtype = event.document
-        else:
-            mtype = event.text
-        user = event.from_user or event.sender_chat
-        return bool(
-            user.id == user_id and event.chat.id == query.message.chat.id and mtype
-        )
+            return event.document
+        return event.text
 
-    handler = client.add_handler(
-        MessageHandler(pfunc, filters=create(event_filter)), group=-1
-    )
-    while handler_dict[user_id]:
-        await sleep(0.5)
-        if time() - start_time > 60:
-            handler_dict[user_id] = False
-            await rfunc()
-    client.remove_handler(*handler)
+    try:
+        event = await conversations.listen(
+            "users_settings", query.message.chat.id, query.from_user.id, event_filter
+        )
+    except TimeoutError:
+        return await rfunc()
+    if event is not None:
+        await pfunc(client, event)
 
 
 @new_thread
@@ -896,14 +889,14 @@ async def edit_user_settings(client, query):
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] == "vthumb":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         buttons = ButtonMaker()
         buttons.ibutton("Cʟᴏsᴇ", f"wzmlx {user_id} close")
         await sendMessage(message, from_user.mention, buttons.build_menu(1), thumb_path)
         await update_user_settings(query, "thumb", "leech")
     elif data[2] == "show_tds":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         user_tds = user_dict.get("user_tds", {})
         msg = f"➲ <b><u>User TD(s) Details</u></b>\n\n<b>Total UserTD(s) :</b> {len(user_tds)}\n\n"
         for index_no, (drive_name, drive_dict) in enumerate(user_tds.items(), start=1):
@@ -919,7 +912,7 @@ async def edit_user_settings(client, query):
             )
         await update_user_settings(query, "user_tds", "mirror")
     elif data[2] == "dthumb":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         if await aiopath.exists(thumb_path):
             await query.answer()
             await aioremove(thumb_path)
@@ -949,14 +942,14 @@ async def edit_user_settings(client, query):
         rfunc = partial(update_user_settings, query, data[2], "universal")
         await event_handler(client, query, pfunc, rfunc)
     elif data[2] in ["dyt_opt", "dusess"]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         update_user_ldata(user_id, data[2][1:], "")
         await update_user_settings(query, data[2][1:], "universal")
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] in ["bot_pm", "mediainfo", "save_mode", "td_mode"]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         if (
             data[2] == "save_mode"
             and not user_dict.get(data[2], False)
@@ -999,14 +992,14 @@ async def edit_user_settings(client, query):
         rfunc = partial(update_user_settings, query, data[2], "leech")
         await event_handler(client, query, pfunc, rfunc)
     elif data[2] == "dsplit_size":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         update_user_ldata(user_id, "split_size", "")
         await update_user_settings(query, "split_size", "leech")
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] == "esplits":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         update_user_ldata(
             user_id, "equal_splits", not user_dict.get("equal_splits", False)
@@ -1015,7 +1008,7 @@ async def edit_user_settings(client, query):
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] == "mgroup":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         update_user_ldata(
             user_id, "media_group", not user_dict.get("media_group", False)
@@ -1024,7 +1017,7 @@ async def edit_user_settings(client, query):
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] in ["sgofile", "sstreamtape", "dgofile", "dstreamtape"]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         ddl_dict = user_dict.get("ddl_servers", {})
         key = data[2][1:]
         mode, api = ddl_dict.get(key, [False, ""])
@@ -1051,7 +1044,7 @@ async def edit_user_settings(client, query):
         rfunc = partial(update_user_settings, query, data[2], "mirror")
         await event_handler(client, query, pfunc, rfunc, document=True)
     elif data[2] == "drcc":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         if await aiopath.exists(rclone_path):
             await query.answer()
             await aioremove(rclone_path)
@@ -1063,7 +1056,7 @@ async def edit_user_settings(client, query):
             await query.answer("Old Settings", show_alert=True)
             await update_user_settings(query)
     elif data[2] in ["ddl_servers", "user_tds", "gofile", "streamtape"]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         edit_mode = len(data) == 4
         await update_user_settings(
@@ -1093,7 +1086,7 @@ async def edit_user_settings(client, query):
         "mremname",
         "lmeta",
     ]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         edit_mode = len(data) == 4
         return_key = "leech" if data[2][0] == "l" else "mirror"
@@ -1111,14 +1104,14 @@ async def edit_user_settings(client, query):
         "dldump",
         "dlmeta",
     ]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         update_user_ldata(user_id, data[2][1:], {} if data[2] == "dldump" else "")
         await update_user_settings(query, data[2][1:], "leech")
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] in ["dmprefix", "dmsuffix", "dmremname", "duser_tds"]:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         update_user_ldata(user_id, data[2][1:], {} if data[2] == "duser_tds" else "")
         if data[2] == "duser_tds":
@@ -1127,12 +1120,12 @@ async def edit_user_settings(client, query):
         if DATABASE_URL:
             await DbManger().update_user_data(user_id)
     elif data[2] == "back":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         setting = data[3] if len(data) == 4 else None
         await update_user_settings(query, setting)
     elif data[2] == "reset_all":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         buttons = ButtonMaker()
         buttons.ibutton("Yes", f"userset {user_id} reset_now y")
@@ -1142,7 +1135,7 @@ async def edit_user_settings(client, query):
             message, "Do you want to Reset Settings ?", buttons.build_menu(2)
         )
     elif data[2] == "reset_now":
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         if data[3] == "n":
             return await update_user_settings(query)
         if await aiopath.exists(thumb_path):
@@ -1172,7 +1165,7 @@ async def edit_user_settings(client, query):
             await DbManger().update_user_doc(user_id, "rclone")
         await editMessage(message, f"Data Reset for {user_id}")
     else:
-        handler_dict[user_id] = False
+        conversations.cancel("users_settings", user_id=user_id)
         await query.answer()
         await deleteMessage(message.reply_to_message)
         await deleteMessage(message)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
-from pyrogram.handlers import MessageHandler, CallbackQueryHandler
-from pyrogram.filters import command, regex, user
-from asyncio import sleep, wait_for, Event, wrap_future
+from pyrogram.handlers import MessageHandler
+from pyrogram.filters import command
+from asyncio import sleep, Event, wrap_future
 from aiohttp import ClientSession
 from aiofiles.os import path as aiopath
 from yt_dlp import YoutubeDL
@@ -20,6 +20,7 @@ from bot.helper.telegram_helper.message_utils import (
     open_dump_btns,
 )
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.conversation import conversations
 from bot.helper.ext_utils.bot_utils import (
     get_readable_file_size,
     fetch_user_tds,
@@ -98,19 +99,21 @@ class YtSelection:
     @new_thread
     async def __event_handler(self):
         pfunc = partial(select_format, obj=self)
-        handler = self.__client.add_handler(
-            CallbackQueryHandler(pfunc, filters=regex("^ytq") & user(self.__user_id)),
-            group=-1,
-        )
         try:
-            await wait_for(self.event.wait(), timeout=self.__timeout)
+            await conversations.serve(
+                self.__message.chat.id,
+                self.__user_id,
+                lambda: self.__reply_to,
+                pfunc,
+                lambda query: query.data.startswith("ytq"),
+                self.event,
+                self.__timeout,
+            )
         except Exception:
             await editMessage(self.__reply_to, "Timed Out. Task has been cancelled!")
             self.qual = None
             self.is_cancelled = True
             self.event.set()
-        finally:
-            self.__client.remove_handler(*handler)
 
     async def get_quality(self, result):
         future = self.__event_handler()
@@ -480,7 +483,7 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
                     await delete_links(message)
                     return
             if drive_id and not await sync_to_async(
-                GoogleDriveHelper().getFolderData, drive_id
+                GoogleDriveHelper().getFolderData, drive_id, pool="drive"
             ):
                 return await sendMessage(message, "Google Drive ID validation failed!!")
         if up == "gd" and not config_dict["GDRIVE_ID"] and not drive_id:
@@ -581,7 +584,7 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
         options["playlist_items"] = "0"
 
     try:
-        result = await sync_to_async(extract_info, link, options)
+        result = await sync_to_async(extract_info, link, options, pool="scrape")
     except Exception as e:
         msg = str(e).replace("<", " ").replace(">", " ")
         await sendMessage(message, f"{tag} {msg}")
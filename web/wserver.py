@@ -1,19 +1,24 @@
-from logging import getLogger, FileHandler, StreamHandler, INFO, basicConfig
-from time import sleep
+from logging import getLogger, StreamHandler, INFO, basicConfig
+from logging.handlers import WatchedFileHandler
+from time import sleep, time
+from json import load
 from qbittorrentapi import NotFound404Error, Client as qbClient
 from aria2p import API as ariaAPI, Client as ariaClient
-from flask import Flask, request
+from flask import Flask, request, Response
 
 from web.nodes import make_tree
 
 app = Flask(__name__)
 
+METRICS_FILE = "metrics.json"
+
 aria2 = ariaAPI(ariaClient(host="http://localhost", port=6800, secret=""))
 
 basicConfig(
     format="[%(asctime)s] [%(levelname)s] - %(message)s",
     datefmt="%d-%b-%y %I:%M:%S %p",
-    handlers=[FileHandler("log.txt"), StreamHandler()],
+    # Reopened once the bot rotates log.txt instead of writing into log.txt.1
+    handlers=[WatchedFileHandler("log.txt"), StreamHandler()],
     level=INFO,
 )
 
@@ -851,6 +856,56 @@ def homepage():
 """
 
 
+def metric_labels(labels):
+    if not labels:
+        return ""
+    values = []
+    for key, value in labels.items():
+        value = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        values.append(f'{key}="{value}"')
+    return "{" + ",".join(values) + "}"
+
+
+def render_metrics(data):
+    lines = [
+        "# TYPE wzml_metrics_age_seconds gauge",
+        f"wzml_metrics_age_seconds {round(time() - data['time'], 3)}",
+    ]
+    for kind, samples in [("counter", data["counters"]), ("gauge", data["gauges"])]:
+        typed = set()
+        for name, labels, value in sorted(samples, key=lambda x: x[0]):
+            name = f"wzml_{name}"
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{metric_labels(labels)} {value}")
+    if data["histograms"]:
+        name = "wzml_stage_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for stage, hist in data["histograms"].items():
+            for bound, count in zip(data["buckets"], hist["buckets"]):
+                labels = metric_labels({"stage": stage, "le": bound})
+                lines.append(f"{name}_bucket{labels} {count}")
+            labels = metric_labels({"stage": stage, "le": "+Inf"})
+            lines.append(f"{name}_bucket{labels} {hist['count']}")
+            labels = metric_labels({"stage": stage})
+            lines.append(f"{name}_sum{labels} {hist['sum']}")
+            lines.append(f"{name}_count{labels} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+
+@app.route("/metrics")
+def metrics():
+    try:
+        with open(METRICS_FILE) as f:
+            data = load(f)
+    except (OSError, ValueError):
+        return Response("", mimetype="text/plain", status=503)
+    return Response(render_metrics(data), mimetype="text/plain; version=0.0.4")
+
+
 @app.errorhandler(Exception)
 def page_not_found(e):
     return (